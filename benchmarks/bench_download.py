@@ -0,0 +1,53 @@
+"""Single stream vs segmented download throughput
+
+Runs the local stand-in of the Yandex Disk REST API which serves one file with a per-connection bandwidth limit,
+so the benefit of several connections is visible on the loopback interface.
+
+Usage:
+    python benchmarks/bench_download.py --size 64 --bandwidth 20 --workers 1 4 8
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.server import StandInServer, use_server  # noqa: E402
+from pyyadisk import YandexDisk  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=64, help='file size in MB')
+    parser.add_argument('--bandwidth', type=float, default=20, help='per-connection bandwidth in MB/s')
+    parser.add_argument('--segment', type=int, default=4, help='segment size in MB')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    mb = 1024 * 1024
+    server = StandInServer(bandwidth=args.bandwidth * mb).start()
+    server.add_file('/file.bin', os.urandom(args.size * mb))
+    use_server(server.url)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            disk = YandexDisk(token='benchmark').path('/file.bin')
+            started = time.monotonic()
+            if workers == 1:
+                status, _ = disk.download(tmp, resume=False)
+            else:
+                status, _ = disk.download_parallel(tmp, workers=workers, segment_size=args.segment * mb)
+            elapsed = time.monotonic() - started
+            results.append({'mode': 'single' if workers == 1 else 'segmented', 'workers': workers,
+                            'status': status, 'seconds': round(elapsed, 3),
+                            'mb_per_second': round(args.size / elapsed, 2)})
+            print(json.dumps(results[-1]))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""Benchmark suite of pyyadisk against the local Yandex Disk REST API stand-in
+
+Measures listing throughput, small-file and large-file upload/download MB/s and metadata requests per second
+under concurrency. Every result is printed as a JSON line. With --output the whole run is saved as JSON document,
+and with --baseline every result gets the relative change to the same result of a previous run.
+
+Usage:
+    python benchmarks/run.py --latency 0.005 --bandwidth 50 --output results.json
+    python benchmarks/run.py --scenarios listing metadata --baseline results.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.server import StandInServer, use_server  # noqa: E402
+from pyyadisk import MetricsCollector, RetryPolicy, YandexDisk  # noqa: E402
+
+MB = 1024 * 1024
+SCENARIOS = ('listing', 'upload_small', 'upload_large', 'download_small', 'download_large', 'metadata')
+
+
+def make_client(workers: int):
+    metrics = MetricsCollector()
+    disk = YandexDisk(token='benchmark', pool_size=max(10, workers), hooks=[metrics],
+                      retry=RetryPolicy(total=5, backoff=0.05, max_backoff=1.0))
+    return disk, metrics
+
+
+def measure(scenario: str, workers: int, run, **params) -> dict:
+    """
+    Run one benchmark with a fresh client
+
+    Args:
+        scenario: Name of the scenario
+        workers: Number of concurrent requests
+        run: Function run(disk) -> (number of items, number of bytes)
+        params: Extra params of the scenario saved with the result
+
+    Returns:
+        Dictionary with the result
+    """
+    disk, metrics = make_client(workers)
+    started = time.monotonic()
+    items, nbytes = run(disk)
+    seconds = time.monotonic() - started
+    series = metrics.as_dict().values()
+    return {'scenario': scenario, 'workers': workers, **params, 'items': items, 'bytes': nbytes,
+            'seconds': round(seconds, 4), 'items_per_second': round(items / seconds, 2),
+            'mb_per_second': round(nbytes / MB / seconds, 2),
+            'requests': sum(s['requests'] for s in series), 'retries': sum(s['retries'] for s in series),
+            'errors': sum(s['errors'] for s in series)}
+
+
+def bench_listing(server: StandInServer, args) -> list:
+    server.reset()
+    for i in range(args.files):
+        server.add_file(f'/listing/file_{i:06}.txt', b'x')
+        server.add_file(f'/tree/dir_{i % 50:02}/file_{i:06}.txt', b'x')
+    results = []
+    for limit in (100, 1000):
+        results.append(measure('listing', 1, lambda disk: (sum(1 for _ in disk.path('/listing')
+                                                               .iter_dir(limit=limit)), 0), limit=limit))
+    for workers in args.workers:
+        def walk(disk):
+            return sum(len(dirs) + len(files) for _, dirs, files in disk.walk('/tree', workers=workers)), 0
+        results.append(measure('walk', workers, walk))
+    return results
+
+
+def bench_upload_small(server: StandInServer, args) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.small_files):
+            with open(os.path.join(tmp, f'file_{i:05}.bin'), 'wb') as fh:
+                fh.write(os.urandom(args.small_size * 1024))
+        for workers in args.workers:
+            server.reset()
+
+            def upload(disk):
+                report = disk.upload_tree(tmp, '/small', workers=workers)
+                return len(report['results']) - len(report['failed']), report['stats']['bytes']
+            results.append(measure('upload_small', workers, upload, size_kb=args.small_size))
+    return results
+
+
+def bench_upload_large(server: StandInServer, args) -> list:
+    server.reset()
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = os.path.join(tmp, 'large.bin')
+        with open(filepath, 'wb') as fh:
+            fh.write(os.urandom(args.large_size * MB))
+
+        def upload(disk):
+            status, _ = disk.path('/').upload(filepath, overwrite=True)
+            return int(200 <= status <= 299), os.path.getsize(filepath)
+        return [measure('upload_large', 1, upload, size_mb=args.large_size)]
+
+
+def bench_download_small(server: StandInServer, args) -> list:
+    server.reset()
+    paths = [f'/small/file_{i:05}.bin' for i in range(args.small_files)]
+    for path in paths:
+        server.add_file(path, os.urandom(args.small_size * 1024))
+    results = []
+    for workers in args.workers:
+        def download(disk):
+            def fetch(path: str):
+                fh = io.BytesIO()
+                status, _ = disk.path(path).download_to(fh)
+                return fh.tell() if status == 200 else 0
+            disk._ensure_pool_size(workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                sizes = list(executor.map(fetch, paths))
+            return sum(1 for s in sizes if s), sum(sizes)
+        results.append(measure('download_small', workers, download, size_kb=args.small_size))
+    return results
+
+
+def bench_download_large(server: StandInServer, args) -> list:
+    server.reset()
+    server.add_file('/large.bin', os.urandom(args.large_size * MB))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in [1] + [w for w in args.workers if w > 1]:
+            def download(disk):
+                resource = disk.path('/large.bin')
+                if workers == 1:
+                    status, info = resource.download(tmp, resume=False)
+                else:
+                    status, info = resource.download_parallel(tmp, workers=workers, segment_size=args.segment * MB)
+                return int(200 <= status <= 299), info['size'] if info else 0
+            results.append(measure('download_large', workers, download, size_mb=args.large_size,
+                                   mode='single' if workers == 1 else 'segmented'))
+    return results
+
+
+def bench_metadata(server: StandInServer, args) -> list:
+    server.reset()
+    server.add_file('/meta/file.txt', b'x')
+    results = []
+    for workers in args.workers:
+        def get(disk):
+            resource = disk.path('/meta/file.txt')
+            disk._ensure_pool_size(workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                statuses = list(executor.map(lambda _: resource.get()[0], range(args.requests)))
+            return statuses.count(200), 0
+        results.append(measure('metadata', workers, get))
+    return results
+
+
+def compare(results: list, baseline: dict):
+    """
+    Add relative change of items per second to the results of the same benchmark in baseline run
+
+    Args:
+        results: List of results
+        baseline: Saved run with 'results' list
+    """
+    def key(result: dict):
+        return tuple((k, v) for k, v in sorted(result.items()) if k in ('scenario', 'workers', 'limit', 'mode',
+                                                                        'size_kb', 'size_mb'))
+    previous = {key(r): r for r in baseline.get('results', [])}
+    for result in results:
+        old = previous.get(key(result))
+        if old and old['items_per_second']:
+            result['change'] = round(result['items_per_second'] / old['items_per_second'] - 1, 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16], help='concurrency levels')
+    parser.add_argument('--latency', type=float, default=0.002, help='server response delay in seconds')
+    parser.add_argument('--bandwidth', type=float, default=None, help='per-connection bandwidth in MB/s')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='probability of injected 503 responses')
+    parser.add_argument('--files', type=int, default=5000, help='number of files of listing scenario')
+    parser.add_argument('--small-files', type=int, default=200, help='number of files of small-file scenarios')
+    parser.add_argument('--small-size', type=int, default=16, help='size of small files in KB')
+    parser.add_argument('--large-size', type=int, default=64, help='size of large file in MB')
+    parser.add_argument('--segment', type=int, default=8, help='segment size of parallel download in MB')
+    parser.add_argument('--requests', type=int, default=1000, help='number of requests of metadata scenario')
+    parser.add_argument('--output', help='save the run as JSON document')
+    parser.add_argument('--baseline', help='JSON document of a previous run to compare with')
+    args = parser.parse_args()
+
+    server = StandInServer(latency=args.latency, bandwidth=args.bandwidth * MB if args.bandwidth else None,
+                           error_rate=args.error_rate, retry_after='0', seed=0).start()
+    use_server(server.url)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+
+    results = []
+    for scenario in args.scenarios:
+        scenario_results = globals()[f'bench_{scenario}'](server, args)
+        if baseline:
+            compare(scenario_results, baseline)
+        for result in scenario_results:
+            print(json.dumps(result), flush=True)
+        results.extend(scenario_results)
+    server.shutdown()
+
+    if args.output:
+        run = {'started': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'python': platform.python_version(),
+               'platform': platform.platform(),
+               'server': {'latency': args.latency, 'bandwidth': args.bandwidth, 'error_rate': args.error_rate},
+               'results': results}
+        with open(args.output, 'w') as fh:
+            json.dump(run, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
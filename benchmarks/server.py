@@ -0,0 +1,654 @@
+"""Local stand-in of the Yandex Disk REST API for benchmarks
+
+The server keeps files, directories, the Trash and operations in memory and implements endpoints used by pyyadisk:
+resources GET/PUT/DELETE, copy, move, upload and download links, publish, files, last-uploaded, public resources,
+trash and operations.
+Latency, per-connection bandwidth and injected errors are configurable, so client changes can be compared without
+the live API.
+
+Typical usage example:
+    server = StandInServer(latency=0.02, bandwidth=20 * 1024 * 1024, error_rate=0.01).start()
+    server.add_file('/data/file.bin', os.urandom(1024))
+    use_server(server.url)
+    disk = YandexDisk(token='benchmark')
+    ...
+    server.shutdown()
+
+A client may be pointed to the server without use_server() by its transport:
+    disk = YandexDisk(token='benchmark', transport=RequestsTransport(base_url=server.url))
+
+Usage:
+    python benchmarks/server.py --port 8080 --latency 0.02 --bandwidth 20
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BLOCK_SIZE = 64 * 1024
+
+
+def use_server(url: str):
+    """
+    Point pyyadisk clients created after the call to the stand-in server
+
+    Args:
+        url: Base url of the server, for example StandInServer.url
+    """
+    import pyyadisk.config
+    import pyyadisk.public
+    import pyyadisk.resource
+    import pyyadisk.sync
+    import pyyadisk.yandexdisk
+    modules = [pyyadisk.config, pyyadisk.public, pyyadisk.resource, pyyadisk.sync, pyyadisk.yandexdisk]
+    try:
+        import pyyadisk.asyncdisk
+        modules.append(pyyadisk.asyncdisk)
+    except ImportError:  # aiohttp is not installed
+        pass
+    uri = f'{url.rstrip("/")}/v1/disk'
+    paths = {'URI': uri, 'RESOURCES_PATH': f'{uri}/resources', 'TRASH_PATH': f'{uri}/trash/resources',
+             'OPERATIONS_PATH': f'{uri}/operations', 'PUBLIC_PATH': f'{uri}/public/resources'}
+    for module in modules:
+        for name, value in paths.items():
+            if hasattr(module, name):
+                setattr(module, name, value)
+
+
+def normalize(path: str) -> str:
+    path = path or '/'
+    for prefix in ('disk:', 'trash:'):
+        if path.startswith(prefix):
+            path = path[len(prefix):]
+    return '/' + path.strip('/')
+
+
+def parent_of(path: str) -> str:
+    return path.rsplit('/', 1)[0] or '/'
+
+
+def timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat(timespec='seconds')
+
+
+def project(data, fields: list):
+    """
+    Keep only requested fields like Yandex Disk API does for 'fields' param
+
+    Args:
+        data: Response dictionary
+        fields: List of dotted field names, for example ['name', '_embedded.items.path']
+
+    Returns:
+        Projected dictionary
+    """
+    if isinstance(data, list):
+        return [project(item, fields) for item in data]
+    if not isinstance(data, dict):
+        return data
+    result = {}
+    for field in fields:
+        key, _, rest = field.partition('.')
+        if key not in data:
+            continue
+        result[key] = merge(result.get(key), project(data[key], [rest]) if rest else data[key])
+    return result
+
+
+def merge(target, source):
+    if isinstance(target, dict) and isinstance(source, dict):
+        for key, value in source.items():
+            target[key] = merge(target.get(key), value)
+        return target
+    if isinstance(target, list) and isinstance(source, list):
+        return [merge(t, s) for t, s in zip(target, source)]
+    return source
+
+
+class Node:
+    """File or directory of the stand-in server"""
+
+    revisions = itertools.count(1)
+
+    def __init__(self, kind: str, data: bytes = None):
+        self.kind = kind
+        self.data = data
+        self.created = self.modified = time.time()
+        self.revision = next(self.revisions)
+        self.public_key = None
+        self.origin = None
+        self.deleted = None
+        self.md5 = hashlib.md5(data).hexdigest() if data is not None else None
+        self.sha256 = hashlib.sha256(data).hexdigest() if data is not None else None
+
+    def meta(self, path: str, root: str = 'disk:') -> dict:
+        meta = {'name': path.rsplit('/', 1)[-1] or root.rstrip(':'), 'path': f'{root}{path}', 'type': self.kind,
+                'created': timestamp(self.created), 'modified': timestamp(self.modified),
+                'revision': self.revision, 'resource_id': f'{id(self)}:{path}'}
+        if self.kind == 'file':
+            meta.update({'size': len(self.data), 'md5': self.md5, 'sha256': self.sha256,
+                         'mime_type': 'application/octet-stream', 'media_type': 'data',
+                         'file': f'http://downloader.invalid{path}'})
+        if self.public_key:
+            meta.update({'public_key': self.public_key, 'public_url': f'https://yadi.sk/d/{self.public_key}'})
+        return meta
+
+
+class StandInServer:
+    """In-memory Yandex Disk REST API stand-in
+
+    Attributes:
+        latency: Delay of every response in seconds
+        bandwidth: Per-connection bandwidth of upload and download bodies in bytes per second or None for unlimited
+        error_rate: Probability of an injected error response of API requests from 0 to 1
+        error_status: Response code of injected errors
+        retry_after: Value of Retry-After header of injected errors or None
+        operation_delay: Time in seconds until asynchronous operations are finished
+        redirect: Download links answer with 302 redirect to the body like links of the live API
+        url: Base url of the started server
+        requests: Number of handled requests
+        errors: Number of injected errors
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, bandwidth: float = None,
+                 error_rate: float = 0.0, error_status: int = 503, retry_after: str = None,
+                 operation_delay: float = 0.0, seed: int = None, redirect: bool = False):
+        """
+        Args:
+            host: (optional) Host to listen
+            port: (optional) Port to listen. Free port is taken for 0
+            latency: (optional) Delay of every response in seconds
+            bandwidth: (optional) Per-connection bandwidth of bodies in bytes per second
+            error_rate: (optional) Probability of an injected error response of API requests
+            error_status: (optional) Response code of injected errors
+            retry_after: (optional) Value of Retry-After header of injected errors
+            operation_delay: (optional) Time in seconds until asynchronous operations are finished
+            seed: (optional) Seed of the random generator of injected errors
+            redirect: (optional) Answer download links with 302 redirect to the body
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.operation_delay = operation_delay
+        self.redirect = redirect
+        self.requests = 0
+        self.errors = 0
+        self.nodes = {'/': Node('dir')}
+        self.trash = {}
+        self.operations = {}
+        self.links = {}
+        self.lock = threading.RLock()
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.url = f'http://{host}:{self._server.server_port}'
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name='standin-server', daemon=True).start()
+        return self
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def add_dir(self, path: str):
+        """
+        Create directory with its parents
+        """
+        path = normalize(path)
+        with self.lock:
+            for depth in range(1, path.count('/') + 1):
+                parent = '/'.join(path.split('/')[:depth + 1])
+                self.nodes.setdefault(parent, Node('dir'))
+
+    def add_file(self, path: str, data: bytes):
+        """
+        Create file with its parent directories
+        """
+        path = normalize(path)
+        with self.lock:
+            self.add_dir(parent_of(path))
+            self.nodes[path] = Node('file', data)
+
+    def is_dir(self, path: str) -> bool:
+        return path in self.nodes and self.nodes[path].kind == 'dir'
+
+    def reset(self):
+        with self.lock:
+            self.nodes = {'/': Node('dir')}
+            self.trash.clear()
+            self.operations.clear()
+            self.links.clear()
+            self.requests = self.errors = 0
+
+    def _children(self, nodes: dict, path: str) -> list:
+        prefix = path.rstrip('/') + '/'
+        return [p for p in nodes if p.startswith(prefix) and p != path and '/' not in p[len(prefix):]]
+
+    def _subtree(self, nodes: dict, path: str) -> list:
+        return [p for p in nodes if p == path or p.startswith(path.rstrip('/') + '/')]
+
+    def _operation(self) -> str:
+        operation_id = uuid.uuid4().hex
+        self.operations[operation_id] = time.monotonic() + self.operation_delay
+        return operation_id
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._dispatch()
+
+            def do_PUT(self):
+                self._dispatch()
+
+            def do_POST(self):
+                self._dispatch()
+
+            def do_DELETE(self):
+                self._dispatch()
+
+            def _dispatch(self):
+                url = urlparse(self.path)
+                self.query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with server.lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                if url.path.startswith('/redirect/'):
+                    token = url.path.rsplit('/', 1)[-1]
+                    return self._json(302, headers={'Location': f'http://{self.headers["Host"]}/transfer/{token}'})
+                if url.path.startswith('/transfer/'):
+                    return self._transfer(url.path.rsplit('/', 1)[-1])
+                if server.error_rate and server._random.random() < server.error_rate:
+                    with server.lock:
+                        server.errors += 1
+                    self._read_body()
+                    headers = {'Retry-After': server.retry_after} if server.retry_after else {}
+                    return self._json(server.error_status, {'error': 'InjectedError'}, headers)
+                route = (self.command, url.path[len('/v1/disk'):] if url.path.startswith('/v1/disk') else None)
+                handler = ROUTES.get(route)
+                if handler is None and self.command == 'GET' and url.path.startswith('/v1/disk/operations/'):
+                    handler = Handler._get_operation
+                if handler is None:
+                    return self._error(404, 'NotFound')
+                with server.lock:
+                    status, data = handler(self)
+                self._json(status, data)
+
+            def _read_body(self) -> bytes:
+                if self.headers.get('Transfer-Encoding') == 'chunked':
+                    body = bytearray()
+                    while True:
+                        size = int(self.rfile.readline().split(b';')[0].strip(), 16)
+                        if size == 0:
+                            self.rfile.readline()
+                            return bytes(body)
+                        body += self._read(size)
+                        self.rfile.readline()
+                return self._read(int(self.headers.get('Content-Length') or 0))
+
+            def _read(self, size: int) -> bytes:
+                body = bytearray()
+                while len(body) < size:
+                    chunk = self.rfile.read(min(BLOCK_SIZE, size - len(body)))
+                    if not chunk:
+                        break
+                    body += chunk
+                    self._throttle(len(chunk))
+                return bytes(body)
+
+            def _throttle(self, size: int):
+                if server.bandwidth:
+                    time.sleep(size / server.bandwidth)
+
+            def _json(self, status: int, data: dict = None, headers: dict = None):
+                payload = json.dumps(data).encode() if data is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _error(self, status: int, error: str):
+                return self._json(status, {'error': error, 'description': error})
+
+            def _href(self, path: str, method: str = 'GET', templated: bool = False) -> dict:
+                return {'href': f'http://{self.headers["Host"]}{path}', 'method': method, 'templated': templated}
+
+            def _path(self, key: str = 'path') -> str:
+                return normalize(self.query.get(key, '/'))
+
+            def _flag(self, key: str) -> bool:
+                return self.query.get(key, '').lower() == 'true'
+
+            def _respond(self, data: dict) -> dict:
+                fields = self.query.get('fields')
+                return project(data, fields.split(',')) if fields else data
+
+            def _page(self, items: list) -> dict:
+                sort = self.query.get('sort', 'name')
+                key = sort.lstrip('-')
+                items.sort(key=lambda item: (item.get(key) is None, item.get(key) or 0, item['path']),
+                           reverse=sort.startswith('-'))
+                offset, limit = int(self.query.get('offset', 0)), int(self.query.get('limit', 20))
+                return {'items': items[offset:offset + limit], 'limit': limit, 'offset': offset, 'sort': sort,
+                        'total': len(items)}
+
+            def _listing(self, nodes: dict, path: str, root: str) -> tuple:
+                node = nodes.get(path)
+                if node is None:
+                    return 404, {'error': 'DiskNotFoundError'}
+                meta = node.meta(path, root) if root == 'disk:' else self._trash_meta(path)
+                if node.kind == 'dir':
+                    children = server._children(nodes, path)
+                    items = [nodes[p].meta(p, root) if root == 'disk:' else self._trash_meta(p) for p in children]
+                    meta['_embedded'] = {**self._page(items), 'path': meta['path']}
+                return 200, self._respond(meta)
+
+            def _trash_meta(self, path: str) -> dict:
+                node = server.trash[path]
+                meta = node.meta(path, 'trash:')
+                top = '/' + path.strip('/').split('/')[0]
+                meta.update({'origin_path': f'disk:{server.trash[top].origin}{path[len(top):]}',
+                             'deleted': timestamp(server.trash[top].deleted)})
+                return meta
+
+            def _get_disk(self):
+                used = sum(len(n.data) for n in server.nodes.values() if n.kind == 'file')
+                trash = sum(len(n.data) for n in server.trash.values() if n.kind == 'file')
+                return 200, self._respond({'total_space': 10 * 1024 ** 4, 'used_space': used + trash,
+                                           'trash_size': trash, 'is_paid': False})
+
+            def _get_resources(self):
+                return self._listing(server.nodes, self._path(), 'disk:')
+
+            def _put_resources(self):
+                path = self._path()
+                if path in server.nodes:
+                    return 409, {'error': 'DiskPathPointsToExistentDirectoryError'}
+                if not server.is_dir(parent_of(path)):
+                    return 409, {'error': 'DiskPathDoesntExistsError'}
+                server.nodes[path] = Node('dir')
+                return 201, self._href(f'/v1/disk/resources?path=disk:{path}')
+
+            def _delete_resources(self):
+                path = self._path()
+                if path not in server.nodes or path == '/':
+                    return 404, {'error': 'DiskNotFoundError'}
+                subtree = server._subtree(server.nodes, path)
+                if not self._flag('permanently'):
+                    name = path.rsplit('/', 1)[-1]
+                    top = f'/{name}' if f'/{name}' not in server.trash else f'/{name}_{uuid.uuid4().hex[:8]}'
+                    for p in subtree:
+                        server.trash[top + p[len(path):]] = server.nodes[p]
+                    server.trash[top].origin, server.trash[top].deleted = path, time.time()
+                for p in subtree:
+                    del server.nodes[p]
+                if self._flag('force_async'):
+                    return 202, self._href(f'/v1/disk/operations/{server._operation()}')
+                return 204, None
+
+            def _copy_or_move(self, move: bool):
+                source, target = self._path('from'), self._path()
+                if source not in server.nodes:
+                    return 404, {'error': 'DiskNotFoundError'}
+                if target in server.nodes and not self._flag('overwrite'):
+                    return 409, {'error': 'DiskResourceAlreadyExistsError'}
+                if not server.is_dir(parent_of(target)):
+                    return 409, {'error': 'DiskPathDoesntExistsError'}
+                for p in server._subtree(server.nodes, target):
+                    del server.nodes[p]
+                for p in server._subtree(server.nodes, source):
+                    node = server.nodes[p]
+                    if move:
+                        del server.nodes[p]
+                    else:
+                        node = Node(node.kind, node.data)
+                    server.nodes[target + p[len(source):]] = node
+                if self._flag('force_async'):
+                    return 202, self._href(f'/v1/disk/operations/{server._operation()}')
+                return 201, self._href(f'/v1/disk/resources?path=disk:{target}')
+
+            def _post_copy(self):
+                return self._copy_or_move(False)
+
+            def _post_move(self):
+                return self._copy_or_move(True)
+
+            def _get_upload(self):
+                path = self._path()
+                if path in server.nodes and not self._flag('overwrite'):
+                    return 409, {'error': 'DiskResourceAlreadyExistsError'}
+                if not server.is_dir(parent_of(path)):
+                    return 409, {'error': 'DiskPathDoesntExistsError'}
+                token = uuid.uuid4().hex
+                server.links[token] = ('upload', path)
+                return 200, {**self._href(f'/transfer/{token}', 'PUT'), 'operation_id': server._operation()}
+
+            def _post_upload(self):
+                path = self._path()
+                if not server.is_dir(parent_of(path)):
+                    return 409, {'error': 'DiskPathDoesntExistsError'}
+                server.nodes[path] = Node('file', self.query.get('url', '').encode())
+                return 202, self._href(f'/v1/disk/operations/{server._operation()}')
+
+            def _get_download(self):
+                path = self._path()
+                if server.nodes.get(path, Node('dir')).kind != 'file':
+                    return 404, {'error': 'DiskNotFoundError'}
+                return 200, self._href(self._download_link(path))
+
+            def _download_link(self, path: str) -> str:
+                token = uuid.uuid4().hex
+                server.links[token] = ('download', path)
+                return f'/redirect/{token}' if server.redirect else f'/transfer/{token}'
+
+            def _public_target(self) -> tuple:
+                key = self.query.get('public_key', '')
+                roots = [p for p, n in server.nodes.items()
+                         if n.public_key and key in (n.public_key, f'https://yadi.sk/d/{n.public_key}')]
+                if not roots:
+                    return None, None
+                relative = normalize(self.query.get('path', '/'))
+                path = roots[0] if relative == '/' else f'{roots[0].rstrip("/")}{relative}'
+                return (path, relative) if path in server.nodes else (None, None)
+
+            def _public_meta(self, path: str, relative: str) -> dict:
+                node = server.nodes[path]
+                meta = {**node.meta(path), 'path': relative, 'public_key': self.query['public_key']}
+                if node.kind == 'file':
+                    meta['file'] = self._href(self._download_link(path))['href']
+                return meta
+
+            def _get_public(self):
+                path, relative = self._public_target()
+                if path is None:
+                    return 404, {'error': 'DiskNotFoundError'}
+                meta = self._public_meta(path, relative)
+                if server.nodes[path].kind == 'dir':
+                    prefix = relative.rstrip('/')
+                    items = [self._public_meta(p, f'{prefix}/{p.rsplit("/", 1)[-1]}')
+                             for p in server._children(server.nodes, path)]
+                    meta['_embedded'] = {**self._page(items), 'path': relative, 'public_key': meta['public_key']}
+                return 200, self._respond(meta)
+
+            def _get_public_download(self):
+                path, _ = self._public_target()
+                if path is None or server.nodes[path].kind != 'file':
+                    return 404, {'error': 'DiskNotFoundError'}
+                return 200, self._href(self._download_link(path))
+
+            def _transfer(self, token: str):
+                kind, path = server.links.get(token, (None, None))
+                if kind == 'upload' and self.command == 'PUT':
+                    body = self._read_body()
+                    with server.lock:
+                        server.nodes[path] = Node('file', body)
+                    return self._json(201)
+                with server.lock:
+                    node = server.nodes.get(path) if kind == 'download' else None
+                if node is None or node.kind != 'file' or self.command != 'GET':
+                    self._read_body()
+                    return self._error(404, 'NotFound')
+                data, first, last, status = node.data, 0, len(node.data) - 1, 200
+                if self.headers.get('Range'):
+                    start, _, end = self.headers['Range'].split('=', 1)[1].partition('-')
+                    first, last, status = int(start), min(int(end), last) if end else last, 206
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(max(0, last - first + 1)))
+                if status == 206:
+                    self.send_header('Content-Range', f'bytes {first}-{last}/{len(data)}')
+                self.end_headers()
+                for offset in range(first, last + 1, BLOCK_SIZE):
+                    chunk = data[offset:min(offset + BLOCK_SIZE, last + 1)]
+                    self.wfile.write(chunk)
+                    self._throttle(len(chunk))
+
+            def _publish(self, public: bool):
+                path = self._path()
+                if path not in server.nodes:
+                    return 404, {'error': 'DiskNotFoundError'}
+                server.nodes[path].public_key = uuid.uuid4().hex if public else None
+                return 200, self._href(f'/v1/disk/resources?path=disk:{path}')
+
+            def _put_publish(self):
+                return self._publish(True)
+
+            def _put_unpublish(self):
+                return self._publish(False)
+
+            def _get_files(self):
+                items = [n.meta(p) for p, n in server.nodes.items() if n.kind == 'file'
+                         and (not self.query.get('media_type') or self.query['media_type'] == 'data')]
+                self.query.setdefault('sort', 'name')
+                return 200, self._respond(self._page(items))
+
+            def _get_last_uploaded(self):
+                items = [n.meta(p) for p, n in server.nodes.items() if n.kind == 'file']
+                items.sort(key=lambda item: item['created'], reverse=True)
+                limit = int(self.query.get('limit', 20))
+                return 200, self._respond({'items': items[:limit], 'limit': limit})
+
+            def _get_trash(self):
+                path = self._path()
+                if path == '/':
+                    root = Node('dir')
+                    meta = root.meta('/', 'trash:')
+                    items = [self._trash_meta(p) for p in server._children(server.trash, '/')]
+                    meta['_embedded'] = {**self._page(items), 'path': 'trash:/'}
+                    return 200, self._respond(meta)
+                if path not in server.trash:
+                    return 404, {'error': 'DiskNotFoundError'}
+                return self._listing(server.trash, path, 'trash:')
+
+            def _delete_trash(self):
+                path = self._path()
+                if path != '/' and path not in server.trash:
+                    return 404, {'error': 'DiskNotFoundError'}
+                for p in server._subtree(server.trash, path) if path != '/' else list(server.trash):
+                    del server.trash[p]
+                if self._flag('force_async') or path == '/':
+                    return 202, self._href(f'/v1/disk/operations/{server._operation()}')
+                return 204, None
+
+            def _put_restore(self):
+                path = self._path()
+                if path not in server.trash or path.count('/') != 1:
+                    return 404, {'error': 'DiskNotFoundError'}
+                entry = server.trash[path]
+                target = parent_of(entry.origin) + '/' + (self.query.get('name') or entry.origin.rsplit('/', 1)[-1])
+                target = normalize(target)
+                if target in server.nodes and not self._flag('overwrite'):
+                    return 409, {'error': 'DiskResourceAlreadyExistsError'}
+                server.add_dir(parent_of(target))
+                for p in server._subtree(server.nodes, target):
+                    del server.nodes[p]
+                for p in server._subtree(server.trash, path):
+                    server.nodes[target + p[len(path):]] = server.trash.pop(p)
+                if self._flag('force_async'):
+                    return 202, self._href(f'/v1/disk/operations/{server._operation()}')
+                return 201, self._href(f'/v1/disk/resources?path=disk:{target}')
+
+            def _get_operation(self):
+                due = server.operations.get(self.path.split('?')[0].rstrip('/').rsplit('/', 1)[-1])
+                if due is None:
+                    return 404, {'error': 'DiskNotFoundError'}
+                return 200, {'status': 'success' if time.monotonic() >= due else 'in-progress'}
+
+        ROUTES = {
+            ('GET', ''): Handler._get_disk,
+            ('GET', '/resources'): Handler._get_resources,
+            ('PUT', '/resources'): Handler._put_resources,
+            ('DELETE', '/resources'): Handler._delete_resources,
+            ('POST', '/resources/copy'): Handler._post_copy,
+            ('POST', '/resources/move'): Handler._post_move,
+            ('GET', '/resources/upload'): Handler._get_upload,
+            ('POST', '/resources/upload'): Handler._post_upload,
+            ('GET', '/resources/download'): Handler._get_download,
+            ('PUT', '/resources/publish'): Handler._put_publish,
+            ('PUT', '/resources/unpublish'): Handler._put_unpublish,
+            ('GET', '/resources/files'): Handler._get_files,
+            ('GET', '/resources/last-uploaded'): Handler._get_last_uploaded,
+            ('GET', '/public/resources'): Handler._get_public,
+            ('GET', '/public/resources/download'): Handler._get_public_download,
+            ('GET', '/trash/resources'): Handler._get_trash,
+            ('DELETE', '/trash/resources'): Handler._delete_trash,
+            ('PUT', '/trash/resources/restore'): Handler._put_restore,
+        }
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help='delay of every response in seconds')
+    parser.add_argument('--bandwidth', type=float, default=None, help='per-connection bandwidth in MB/s')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='probability of injected errors')
+    parser.add_argument('--error-status', type=int, default=503, help='response code of injected errors')
+    parser.add_argument('--retry-after', default=None, help='Retry-After header of injected errors')
+    parser.add_argument('--redirect', action='store_true', help='answer download links with 302 redirect')
+    args = parser.parse_args()
+
+    server = StandInServer(args.host, args.port, args.latency,
+                           args.bandwidth * 1024 * 1024 if args.bandwidth else None, args.error_rate,
+                           args.error_status, args.retry_after, redirect=args.redirect)
+    print(f'Serving Yandex Disk stand-in at {server.url}/v1/disk')
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,12 @@
+from .changes import ChangeFeed
+from .metrics import MetricsCollector, RequestEvent, RequestHooks
+from .models import ResourceInfo
+from .public import PublicResource
+from .retry import RetryPolicy, TokenBucket
+from .transport import HTTP2Transport, RequestsTransport, Transport
 from .yandexdisk import YandexDisk
+
+try:
+    from .asyncdisk import AsyncYandexDisk
+except ImportError:  # aiohttp is not installed
+    pass
@@ -0,0 +1,500 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import aiohttp
+
+from .config import URI, RESOURCES_PATH, TRASH_PATH, OPERATIONS_PATH, CHUNK_SIZE
+from .helpers import filter_dict_by_key, json_loads
+from .transfer import Checksums, body_size
+from .transport import DEFAULT_TIMEOUT
+
+
+class AsyncYandexDisk:
+    """Asyncio Yandex Disk Rest API V1 wrapper
+
+    Mirrors YandexDisk methods on top of aiohttp. One client is shared by many tasks, so the path of the resource
+    is passed to every method instead of YandexDisk.path() and YandexDisk.trash() modes.
+    All requests go through one connection pool and the number of requests in flight is bounded by a semaphore.
+
+    Typical usage example:
+        async with AsyncYandexDisk(token=token, concurrency=100) as disk:
+            results = await asyncio.gather(*[disk.get(p) for p in paths])
+
+    Attributes:
+        token: Oauth token (get it at https://yandex.ru/dev/disk/poligon/)
+        headers: Dictionary with headers ('Authorization' if the token is set, 'Accept')
+        proxy: (optional) Proxy address for http and https
+        ssl_verify: (optional) Flag of connection ssl verification check
+        pool_size: Number of connections in the pool
+        concurrency: Maximum number of requests in flight
+        timeout: Tuple(connect timeout, read timeout) in seconds. Read timeout limits waiting for every chunk
+            of the response, not the whole transfer
+        json_loads: Function which decodes JSON responses
+    """
+
+    def __init__(self, token: str = None, proxy: str = None, ssl_verify: bool = True, pool_size: int = 100,
+                 concurrency: int = 100, timeout=DEFAULT_TIMEOUT, json_loads=json_loads):
+        """
+        Initialization of asyncio YandexDisk REST API V1 wrapper class
+
+        Args:
+            token: Oauth token (get it at https://yandex.ru/dev/disk/poligon/). Public resources are available
+                without token
+            proxy: (optional) Proxy address for http and https
+            ssl_verify: (optional) Flag of connection ssl verification check
+            pool_size: (optional) Number of connections in the pool
+            concurrency: (optional) Maximum number of requests in flight
+            timeout: (optional) Tuple(connect timeout, read timeout) or one timeout for both in seconds.
+                Requests wait forever for None
+            json_loads: (optional) Function which decodes JSON responses from bytes. Default is orjson.loads
+                if orjson is installed and json.loads otherwise
+        """
+        self.token = token
+        self.headers = {'Accept': 'application/json'}
+        if self.token is not None:
+            self.headers['Authorization'] = 'OAuth {}'.format(self.token)
+        self.proxy = proxy
+        self.ssl_verify = ssl_verify
+        self.pool_size = pool_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.json_loads = json_loads
+        self.uri = URI
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the connection pool
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(self, path: str = None, limit: int = None, offset: int = None, trash: bool = False, **optional):
+        """
+        Get metadata of file or directory from Disk or Trash
+
+        Args:
+            path: The full path of the resource
+            limit: The number of items to return
+            offset: Offset from the beginning
+            trash: Get the resource from Trash
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'path': path, 'limit': limit, 'offset': offset, **optional, }
+        return await self._get(TRASH_PATH if trash else RESOURCES_PATH, params=filter_dict_by_key(params))
+
+    async def create(self, path: str, subdir: str = None, **optional):
+        """
+        Make directory or subdirectory by the path
+
+        Args:
+            path: The full path of the directory
+            subdir: Name of subdirectory. If 'subdir = None' the directory will be created by path
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'path': f'{path}/{subdir}' if subdir else path, **optional}
+        return await self._put(RESOURCES_PATH, params=filter_dict_by_key(params))
+
+    async def delete(self, path: str = None, force_async: bool = None, md5_hash: str = None,
+                     permanently: bool = False, trash: bool = False, **optional):
+        """
+        Delete file or directory from Disk or Trash. Trash is emptied for trash=True and path=None
+
+        Args:
+            path: The full path of the resource
+            force_async: Execute asynchronously (True or False).
+            md5_hash: md5 hash of file
+            permanently: Flag of permanently delete
+            trash: Delete the resource from Trash
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'path': path, 'force_async': force_async, 'md5': md5_hash, 'permanently': permanently,
+                  **optional, }
+        return await self._delete(TRASH_PATH if trash else RESOURCES_PATH, params=filter_dict_by_key(params))
+
+    async def copy_to(self, path: str, destination: str, force_async: bool = None, overwrite: bool = None,
+                      **optional):
+        """
+        Copy file or directory to new destination
+
+        Args:
+            path: The full path of the resource
+            destination: Destination path
+            force_async: Execute asynchronously (True or False).
+            overwrite: Flag of overwrite enable
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'from': path, 'path': destination, 'force_async': force_async, 'overwrite': overwrite,
+                  **optional, }
+        return await self._post(f'{RESOURCES_PATH}/copy', params=filter_dict_by_key(params))
+
+    async def move_to(self, path: str, destination: str, force_async: bool = None, overwrite: bool = None,
+                      **optional):
+        """
+        Move file or directory to new destination
+
+        Args:
+            path: The full path of the resource
+            destination: Destination path
+            force_async: Execute asynchronously (True or False).
+            overwrite: Flag of overwrite enable
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'from': path, 'path': destination, 'force_async': force_async, 'overwrite': overwrite,
+                  **optional, }
+        return await self._post(f'{RESOURCES_PATH}/move', params=filter_dict_by_key(params))
+
+    async def restore(self, path: str, name: str = None, force_async: bool = None, overwrite: bool = False,
+                      **optional):
+        """
+        Restore Trash item
+
+        Args:
+            path: The full path of the resource in Trash
+            name: The name under which the resource will be restored.
+            force_async: Execute asynchronously (True or False).
+            overwrite: Overwrite the existing resource with the restored one  (True or False).
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'path': path, 'name': name, 'force_async': force_async, 'overwrite': overwrite, **optional, }
+        return await self._put(f'{TRASH_PATH}/restore', params=filter_dict_by_key(params))
+
+    async def operations(self, operation_id: str):
+        """
+        Get the status of an asynchronous operation
+
+        Args:
+            operation_id: Operation Id
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        return await self._get(f'{OPERATIONS_PATH}/{operation_id}', params={'operation_id': operation_id})
+
+    async def last_uploaded(self, limit: int = None, media_type: str = None, **optional):
+        """
+        Get list of last uploaded files
+
+        Args:
+            limit: The number of items to return
+            media_type: Filter by media type
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'limit': limit, 'media_type': media_type, **optional, }
+        return await self._get(f'{RESOURCES_PATH}/last-uploaded', params=filter_dict_by_key(params))
+
+    async def list_files(self, limit: int = None, offset: int = None, media_type: str = None, **optional):
+        """
+        Get list of files
+
+        Args:
+            limit: The number of items to return
+            offset: Offset from the beginning
+            media_type: Filter by media type
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'limit': limit, 'offset': offset, 'media_type': media_type, **optional, }
+        return await self._get(f'{RESOURCES_PATH}/files', params=filter_dict_by_key(params))
+
+    async def link(self, path: str, **optional):
+        """
+        Get private download link of file or directory
+
+        Returns:
+            tuple(response code, download link) or tuple(404, None) for any errors cases
+        """
+        status, data = await self._get(f'{RESOURCES_PATH}/download', params={'path': path, **optional})
+        if data and 'href' in data:
+            return 200, data['href']
+        return 404, None
+
+    async def share(self, path: str, **optional):
+        """
+        Share file or directory
+
+        Returns:
+            tuple(response code, public url) or tuple(404, None) for any errors cases
+        """
+        status, _ = await self._put(f'{RESOURCES_PATH}/publish', params={'path': path, **optional})
+        if status == 200:
+            status, data = await self._get(RESOURCES_PATH, params={'path': path, 'fields': 'public_url'})
+            if data and 'public_url' in data:
+                return status, data['public_url']
+        return 404, None
+
+    async def unshare(self, path: str, **optional):
+        """
+        Unshare public file or directory
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        return await self._put(f'{RESOURCES_PATH}/unpublish', params={'path': path, **optional})
+
+    async def public_url(self, path: str, **optional):
+        """
+        Get public url of public file or directory
+
+        Returns:
+            tuple(response code, public url) or tuple(404, None) for any errors cases
+        """
+        return await self._public_field(path, 'public_url', **optional)
+
+    async def public_key(self, path: str, **optional):
+        """
+        Get public key of public file or directory
+
+        Returns:
+            tuple(response code, public key) or tuple(404, None) for any errors cases
+        """
+        return await self._public_field(path, 'public_key', **optional)
+
+    async def upload(self, path: str, filepath, overwrite: bool = False, filename: str = None,
+                     chunk_size: int = CHUNK_SIZE, progress=None, **optional):
+        """
+        File upload method. The body is streamed by chunks of fixed size, file reads run in the default executor
+
+        Typical usage example:
+            async with AsyncYandexDisk(token=token) as disk:
+                response = await disk.upload('path/to/directory', 'path/to/the/file.pdf', overwrite=True)
+
+        Args:
+            path: The full path of the destination directory
+            filepath: Path to the file, file object opened in binary mode, iterable or async iterable of bytes
+            overwrite: Enable overwriting for uploaded item
+            filename: (optional) Name of the uploaded file. Required for file objects without name and iterables
+            chunk_size: (optional) Size of the body chunk in bytes
+            progress: (optional) Function progress(transferred, total, elapsed) called after every chunk
+
+        Returns:
+            tuple(response code, response) or tuple(404, None) for any errors cases
+        """
+        if isinstance(filepath, (str, os.PathLike)):
+            try:
+                with open(filepath, 'rb') as fh:
+                    return await self._upload_body(fh, f'{path}/{filename or Path(filepath).name}', overwrite,
+                                                   chunk_size, progress, **optional)
+            except FileNotFoundError as e:
+                return 404, str(e)
+        filename = filename or Path(getattr(filepath, 'name', None) or '').name
+        if not filename:
+            raise ValueError('filename is required for file objects without name and iterables')
+        return await self._upload_body(filepath, f'{path}/{filename}', overwrite, chunk_size, progress, **optional)
+
+    async def upload_by_url(self, path: str, filename: str, url: str, disable_redirects: bool = False,
+                            **optional):
+        """
+        Upload file from the web by url to the directory
+
+        Args:
+            path: The full path of the destination directory
+            filename: name of the file
+            url: url of the file
+            disable_redirects: Disable redirects
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'path': f'{path}/{filename}', 'url': url, 'disable_redirects': disable_redirects, **optional}
+        return await self._post(f'{RESOURCES_PATH}/upload', params=filter_dict_by_key(params))
+
+    async def download(self, path: str, dest: str, chunk_size: int = CHUNK_SIZE, resume: bool = True,
+                       verify: bool = True, progress=None, **optional):
+        """
+        Download file to the local disk. See YandexDisk.download()
+
+        Args:
+            path: The full path of the file
+            dest: Local path of the file. If dest is a directory, the file is saved with the name of the resource
+            chunk_size: (optional) Size of the body chunk in bytes
+            resume: (optional) Continue interrupted download
+            verify: (optional) Check size, md5 and sha256 of the downloaded file with resource metadata
+            progress: (optional) Function progress(transferred, total, elapsed) called after every chunk
+
+        Returns:
+            Tuple with Response code and dictionary with 'path', 'size', 'md5' and 'sha256' of the downloaded file:
+            (Response code, dict or None for error). Response code is 422 for checksums mismatch
+        """
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, Path(path).name)
+        part = f'{dest}.part'
+        if not resume and os.path.exists(part):
+            os.remove(part)
+        with open(part, 'a+b') as fh:
+            status, info = await self._download_body(path, fh, fh.seek(0, os.SEEK_END), chunk_size, verify,
+                                                     progress, **optional)
+        if info is None:
+            return status, None
+        if status == 422:
+            os.remove(part)
+        else:
+            os.replace(part, dest)
+        return status, {**info, 'path': dest}
+
+    async def download_to(self, path: str, fileobj, chunk_size: int = CHUNK_SIZE, verify: bool = True,
+                          progress=None, **optional):
+        """
+        Download file into file object. See YandexDisk.download_to()
+
+        Returns:
+            Tuple with Response code and dictionary with 'size', 'md5' and 'sha256' of the downloaded body:
+            (Response code, dict or None for error). Response code is 422 for checksums mismatch
+        """
+        return await self._download_body(path, fileobj, 0, chunk_size, verify, progress, **optional)
+
+    async def _public_field(self, path: str, field: str, **optional):
+        status, data = await self._get(RESOURCES_PATH, params={'path': path, **optional})
+        if data and field in data:
+            return status, data[field]
+        return 404, None
+
+    async def _upload_body(self, source, path: str, overwrite: bool, chunk_size: int, progress, **optional):
+        status, data = await self._get(f'{RESOURCES_PATH}/upload',
+                                       params=filter_dict_by_key({'path': path, 'overwrite': overwrite, **optional}))
+        if not data or 'href' not in data:
+            return 404, None
+        total = body_size(source) if hasattr(source, 'read') else None
+        headers = {'Content-Length': str(total)} if total is not None else None
+        return await self._request('put', data['href'], headers=headers,
+                                   data=self._iter_body(source, total, chunk_size, progress))
+
+    @staticmethod
+    async def _iter_body(source, total: int, chunk_size: int, progress):
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        transferred = 0
+        if hasattr(source, 'read'):
+            chunks = iter(lambda: source.read(chunk_size), b'')
+        elif hasattr(source, '__aiter__'):
+            chunks = source
+        else:
+            chunks = iter(source)
+        if hasattr(chunks, '__aiter__'):
+            async for chunk in chunks:
+                transferred += len(chunk)
+                if progress:
+                    progress(transferred, total, time.monotonic() - started)
+                yield chunk
+            return
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, b'')
+            if not chunk:
+                break
+            transferred += len(chunk)
+            if progress:
+                progress(transferred, total, time.monotonic() - started)
+            yield chunk
+
+    async def _download_body(self, path: str, fileobj, offset: int, chunk_size: int, verify: bool, progress,
+                             **optional):
+        status, meta = await self._get(RESOURCES_PATH, params={'path': path, 'fields': 'size,md5,sha256'})
+        if status != 200:
+            return status, None
+        status, href = await self.link(path, **optional)
+        if status != 200:
+            return status, None
+        loop = asyncio.get_running_loop()
+        checksums = Checksums()
+        if offset:
+            fileobj.seek(0)
+            await loop.run_in_executor(None, checksums.update_from, fileobj, chunk_size)
+        total = meta.get('size')
+        if total is None or checksums.size < total:
+            headers = {**self.headers, 'Range': f'bytes={checksums.size}-'} if checksums.size else self.headers
+            async with self._limiter():
+                async with self._client().get(href, headers=headers, proxy=self.proxy,
+                                              ssl=None if self.ssl_verify else False) as response:
+                    status = response.status
+                    if status not in (200, 206):
+                        return status, None
+                    if status == 200 and checksums.size:
+                        fileobj.seek(0)
+                        fileobj.truncate()
+                        checksums = Checksums()
+                    started = time.monotonic()
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        await loop.run_in_executor(None, fileobj.write, chunk)
+                        checksums.update(chunk)
+                        if progress:
+                            progress(checksums.size, total, time.monotonic() - started)
+        info = {'size': checksums.size, 'md5': checksums.md5, 'sha256': checksums.sha256}
+        if verify and checksums.mismatches(meta):
+            return 422, info
+        return status, info
+
+    def _client(self):
+        if self._session is None or self._session.closed:
+            connect, read = self.timeout if isinstance(self.timeout, tuple) else (self.timeout, self.timeout)
+            # The total time is not limited, so long transfers are not cancelled while chunks keep arriving
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.pool_size),
+                                                  timeout=timeout)
+        return self._session
+
+    def _limiter(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def _get(self, uri: str, params: dict = None):
+        return await self._request('get', uri=uri, params=params)
+
+    async def _post(self, uri: str, params: dict = None):
+        return await self._request('post', uri=uri, params=params)
+
+    async def _put(self, uri: str, params: dict = None):
+        return await self._request('put', uri=uri, params=params)
+
+    async def _delete(self, uri: str, params: dict = None):
+        return await self._request('delete', uri=uri, params=params)
+
+    async def _request(self, method: str, uri: str, params: dict = None, headers: dict = None, data=None):
+        json_data = None
+        params = {k: str(v).lower() if isinstance(v, bool) else v for k, v in (params or {}).items()}
+        async with self._limiter():
+            async with self._client().request(method, uri, headers={**self.headers, **(headers or {})},
+                                              params=params, data=data, proxy=self.proxy,
+                                              ssl=None if self.ssl_verify else False) as response:
+                if 200 <= response.status <= 299:
+                    try:
+                        json_data = self.json_loads(await response.read())
+                    except ValueError:
+                        pass
+                return response.status, json_data
@@ -0,0 +1,78 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .helpers import make_report
+
+
+def run_batch(disk, items: list, call, workers: int = 8, timeout: float = None):
+    """
+    Run mutations concurrently and wait for their asynchronous operations. See YandexDisk.batch_move()
+
+    Args:
+        disk: YandexDisk object
+        items: List of result dictionaries. Every item is updated with 'status', 'operation', 'result'
+            and 'error' keys
+        call: Function call(item) -> Operation which sends the request of the item
+        workers: (optional) Number of requests sent at the same time
+        timeout: (optional) Maximum time to wait for all asynchronous operations in seconds
+
+    Returns:
+        Dictionary with ordered results and statistics
+    """
+    started = time.monotonic()
+
+    def submit(item: dict):
+        try:
+            operation = call(item)
+        except requests.exceptions.RequestException as e:
+            item.update({'status': None, 'operation': None, 'result': 'failed', 'error': repr(e)})
+            return None
+        item.update({'status': operation.response[0], 'operation': operation.id, 'result': None, 'error': None})
+        return operation
+
+    disk._ensure_pool_size(workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        operations = list(executor.map(submit, items))
+    deadline = None if timeout is None else time.monotonic() + timeout
+    for item, operation in zip(items, operations):
+        if operation is None:
+            continue
+        operation.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        item['result'] = operation.status
+        if operation.status == 'failed':
+            error = operation.exception()
+            if error is not None:
+                item['error'] = repr(error)
+            else:
+                item['error'] = 'operation failed' if operation.id else f'response code {item["status"]}'
+    report = make_report(items, started)
+    report['stats']['pending'] = sum(1 for item in items if item['result'] == 'in-progress')
+    return report
+
+
+def run_levels(disk, items: list, call, workers: int = 8, timeout: float = None):
+    """
+    Run batch by levels of path depth, so parents are finished before their children
+
+    Args:
+        disk: YandexDisk object
+        items: List of result dictionaries with 'path' key
+        call: Function call(item) -> Operation
+        workers: (optional) Number of requests sent at the same time
+        timeout: (optional) Maximum time to wait for asynchronous operations of every level in seconds
+
+    Returns:
+        Dictionary with results in the order of items and statistics
+    """
+    started = time.monotonic()
+    levels = {}
+    for item in items:
+        levels.setdefault(item['path'].strip('/').count('/'), []).append(item)
+    pending = 0
+    for depth in sorted(levels):
+        pending += run_batch(disk, levels[depth], call, workers, timeout)['stats']['pending']
+    report = make_report(items, started)
+    report['stats']['pending'] = pending
+    return report
@@ -0,0 +1,263 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
+
+from .helpers import normalize_path, parent_paths
+
+
+class MetadataCache:
+    """Thread-safe in-process cache of resource metadata with TTL and LRU bounds
+
+    Entries are keyed by resources uri and request params. Every entry remembers the path and the revision of
+    the resource, so it is evicted when the path or any of its ancestors or descendants is changed by the client,
+    or when a newer revision of the path is seen in any response.
+    Cached dictionaries are shared between callers and must not be mutated.
+
+    Attributes:
+        ttl: Time to live of an entry in seconds
+        maxsize: Maximum number of entries. The least recently used entry is evicted first
+        hits: Number of cache hits
+        misses: Number of cache misses
+        evictions: Number of entries removed by TTL, LRU, revision or invalidation
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 1024):
+        """
+        Args:
+            ttl: (optional) Time to live of an entry in seconds
+            maxsize: (optional) Maximum number of entries
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(uri: str, params: dict):
+        return uri, tuple(sorted((k, str(v)) for k, v in params.items()))
+
+    def get(self, key):
+        """
+        Get cached response
+
+        Args:
+            key: Key made by MetadataCache.key()
+
+        Returns:
+            Tuple (Response code, JSON Response dict) or None for cache miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+    def set(self, key, path: str, response: tuple):
+        """
+        Cache successful response and evict entries with outdated revisions of the resource and its items
+
+        Args:
+            key: Key made by MetadataCache.key()
+            path: The full path of the resource
+            response: Tuple (Response code, JSON Response dict)
+        """
+        data = response[1] or {}
+        revisions = {normalize_path(i['path']): i.get('revision')
+                     for i in (data.get('_embedded') or {}).get('items') or [] if 'path' in i}
+        path = normalize_path(path)
+        revisions[path] = data.get('revision')
+        with self._lock:
+            self._evict(lambda p, r: p in revisions and revisions[p] is not None and r is not None
+                        and r != revisions[p])
+            self._entries[key] = (time.monotonic() + self.ttl, path, revisions[path], response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *paths: str):
+        """
+        Evict entries of the paths, their ancestors and descendants
+
+        Args:
+            paths: The full paths of changed resources
+        """
+        for path in paths:
+            if path is None:
+                continue
+            path = normalize_path(path)
+            ancestors = set(parent_paths(path))
+            prefix = path.rstrip('/') + '/'
+            with self._lock:
+                self._evict(lambda p, r: p == path or p in ancestors or p.startswith(prefix))
+
+    def clear(self):
+        with self._lock:
+            self.evictions += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions}
+
+    def _evict(self, predicate):
+        stale = [k for k, (_, path, revision, _) in self._entries.items() if predicate(path, revision)]
+        for k in stale:
+            del self._entries[k]
+        self.evictions += len(stale)
+
+
+def link_expires(href: str):
+    """
+    Get expiry time of the link from its 'expires' query param
+
+    Args:
+        href: Link
+
+    Returns:
+        Unix time of expiry or None if the link has no expiry
+    """
+    try:
+        return float(parse_qs(urlparse(href).query)['expires'][0])
+    except (KeyError, ValueError):
+        return None
+
+
+class LinkCache:
+    """Thread-safe short-lived cache of resolved links
+
+    Keeps download hrefs, upload hrefs, public urls and download hrefs of public resources by kind and path
+    of the resource. An entry expires after ttl or, if the link has 'expires' query param, margin seconds before
+    the expiry of the link, whichever comes first. Download links and public urls of a path, its ancestors and
+    descendants are evicted by changes of the client. Upload links are kept until the upload succeeds, so retried
+    uploads do not ask for a new link. Links of public resources are keyed by public_key param and are not evicted
+    by changes of the client.
+
+    Attributes:
+        ttl: Time to live of an entry in seconds
+        maxsize: Maximum number of entries. The least recently used entry is evicted first
+        margin: Time in seconds before the expiry of the link when the entry is evicted
+        hits: Number of cache hits
+        misses: Number of cache misses
+        evictions: Number of entries removed by expiry, LRU or invalidation
+    """
+
+    def __init__(self, ttl: float = 300.0, maxsize: int = 4096, margin: float = 30.0):
+        """
+        Args:
+            ttl: (optional) Time to live of an entry in seconds
+            maxsize: (optional) Maximum number of entries
+            margin: (optional) Time in seconds before the expiry of the link when the entry is evicted
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.margin = margin
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, path: str, params: dict = None):
+        return kind, normalize_path(path or '/'), tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+
+    def get(self, kind: str, path: str, params: dict = None):
+        """
+        Get cached link
+
+        Args:
+            kind: 'download', 'upload', 'public_url' or 'public_download'
+            path: The full path of the resource
+            params: (optional) Dictionary of request params which the link depends on
+
+        Returns:
+            Link or None for cache miss
+        """
+        key = self.key(kind, path, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, kind: str, path: str, link: str, params: dict = None):
+        """
+        Cache link
+
+        Args:
+            kind: 'download', 'upload', 'public_url' or 'public_download'
+            path: The full path of the resource
+            link: Resolved link
+            params: (optional) Dictionary of request params which the link depends on
+        """
+        ttl = self.ttl
+        expires = link_expires(link)
+        if expires is not None:
+            ttl = min(ttl, expires - time.time() - self.margin)
+        if ttl <= 0:
+            return
+        key = self.key(kind, path, params)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, link)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, kind: str, path: str, params: dict = None):
+        """
+        Evict the link, for example after it is used or rejected by the server
+        """
+        with self._lock:
+            if self._entries.pop(self.key(kind, path, params), None) is not None:
+                self.evictions += 1
+
+    def invalidate(self, *paths: str):
+        """
+        Evict download links and public urls of the paths, their ancestors and descendants
+
+        Args:
+            paths: The full paths of changed resources
+        """
+        for path in paths:
+            if path is None:
+                continue
+            path = normalize_path(path)
+            ancestors = set(parent_paths(path))
+            prefix = path.rstrip('/') + '/'
+            with self._lock:
+                stale = [k for k in self._entries if k[0] not in ('upload', 'public_download')
+                         and (k[1] == path or k[1] in ancestors or k[1].startswith(prefix))]
+                for k in stale:
+                    del self._entries[k]
+                self.evictions += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self.evictions += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions}
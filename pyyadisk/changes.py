@@ -0,0 +1,138 @@
+import json
+import os
+from datetime import timedelta
+
+from .models import ResourceInfo, fields_for
+from .trash import parse_date
+
+CHANGE_ATTRS = ('name', 'path', 'type', 'size', 'modified', 'revision', 'md5')
+
+
+class ChangeFeed:
+    """Incremental feed of new and modified files of Disk
+
+    Every poll lists files sorted by modification date, newest first, and stops at the first page item older than
+    the watermark minus overlap, so a poll costs about one request per page of changes and does not depend on
+    the number of files. Items modified inside the overlap window of the previous poll are remembered by
+    (path, revision) and are not emitted twice. The watermark is advanced and saved to the state file only when
+    the poll is iterated to the end, so the changes of an interrupted poll are emitted again by the next one.
+    The feed is not thread-safe.
+
+    Typical usage example:
+        feed = ChangeFeed(disk, state='~/.cache/pyyadisk/changes.json')
+        while True:
+            for item in feed.changes():
+                print(item.path, item.revision)
+            time.sleep(60)
+
+    Attributes:
+        disk: YandexDisk object
+        state: Path to JSON state file or None for not persistent feed
+        watermark: Modification date of the newest emitted file in ISO 8601 or None before the first poll
+        seen: Set of (path, revision) of files modified inside the overlap window before the watermark
+        overlap: Seconds before the watermark which are listed again for files with equal or late dates
+        limit: Page size of the listing
+        attrs: Attributes of ResourceInfo to request, 'path', 'modified' and 'revision' are always requested
+        media_type: Filter by media type or None for all files
+        scanned: Number of files listed by the last poll
+        emitted: Number of files emitted by the last poll
+    """
+
+    def __init__(self, disk, state: str = None, overlap: float = 60.0, limit: int = 100, attrs=CHANGE_ATTRS,
+                 media_type: str = None):
+        """
+        Args:
+            disk: YandexDisk object
+            state: (optional) Path to JSON state file with the watermark. It is created by the first poll
+            overlap: (optional) Seconds before the watermark which are listed again by every poll
+            limit: (optional) Page size of the listing
+            attrs: (optional) Attributes of ResourceInfo to request
+            media_type: (optional) Filter by media type, for example 'image'
+        """
+        self.disk = disk
+        self.state = os.path.expanduser(state) if state else None
+        self.overlap = overlap
+        self.limit = limit
+        attrs = tuple(attrs)
+        self.attrs = attrs + tuple(a for a in ('path', 'modified', 'revision') if a not in attrs)
+        self.media_type = media_type
+        self.watermark = None
+        self.seen = set()
+        self.scanned = 0
+        self.emitted = 0
+        if self.state and os.path.exists(self.state):
+            self.load()
+
+    def changes(self, since=None):
+        """
+        Iterate over files created or modified after the watermark
+
+        Args:
+            since: (optional) datetime object or ISO 8601 string which replaces the watermark of the feed.
+                All files are emitted by the first poll without watermark
+
+        Yields:
+            ResourceInfo records of new and modified files, newest first
+
+        Raises:
+            requests.exceptions.HTTPError: for error response code of any page
+        """
+        watermark = since if since is not None else self.watermark
+        boundary = parse_date(watermark) - timedelta(seconds=self.overlap) if watermark is not None else None
+        seen = self.seen if since is None else set()
+        newest, window, emitted = None, set(), set()
+        self.scanned, self.emitted = 0, 0
+        pages = self.disk.iter_files(limit=self.limit, media_type=self.media_type, prefetch=False,
+                                     fields=fields_for(self.attrs, 'items'), sort='-modified')
+        try:
+            for item in map(ResourceInfo.from_dict, pages):
+                modified = parse_date(item.modified)
+                if boundary is not None and modified < boundary:
+                    break
+                self.scanned += 1
+                if newest is None:
+                    newest = modified
+                key = (item.path, item.revision)
+                if modified >= newest - timedelta(seconds=self.overlap):
+                    window.add(key)
+                if key in seen or key in emitted:
+                    continue
+                emitted.add(key)
+                self.emitted += 1
+                yield item
+        finally:
+            pages.close()
+        if newest is not None and (watermark is None or newest >= parse_date(watermark)):
+            self.watermark = newest.isoformat()
+        elif watermark is not None:
+            self.watermark = parse_date(watermark).isoformat()
+        self.seen = window
+        if self.state:
+            self.save()
+
+    def load(self):
+        """
+        Read the watermark from the state file
+        """
+        with open(self.state) as fh:
+            state = json.load(fh)
+        self.watermark = state.get('watermark')
+        self.seen = {tuple(key) for key in state.get('seen', [])}
+
+    def save(self):
+        """
+        Write the watermark to the state file. The file is replaced atomically
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.state)), exist_ok=True)
+        tmp = f'{self.state}.tmp'
+        with open(tmp, 'w') as fh:
+            json.dump({'watermark': self.watermark, 'seen': sorted(self.seen)}, fh)
+        os.replace(tmp, self.state)
+
+    def reset(self):
+        """
+        Forget the watermark, so the next poll emits all files
+        """
+        self.watermark, self.seen = None, set()
+        if self.state and os.path.exists(self.state):
+            os.remove(self.state)
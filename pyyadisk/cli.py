@@ -0,0 +1,262 @@
+"""Command-line interface of pyyadisk
+
+Every command prints one JSON object per line to stdout, so the output may be piped to jq or other tools.
+The token is taken from --token or YANDEX_DISK_TOKEN environment variable.
+
+Usage:
+    pyyadisk ls backup --recursive
+    pyyadisk get backup/photos ./photos --jobs 8
+    pyyadisk put ./build backup/build --jobs 8 --overwrite
+    pyyadisk sync ./build backup/build --delete --stats
+    pyyadisk rm backup/tmp backup/old.log --permanently
+    pyyadisk mv inbox/a.jpg inbox/b.jpg photos
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+
+import requests
+
+from .helpers import is_success, normalize_path, relative_path
+from .metrics import MetricsCollector
+from .yandexdisk import YandexDisk
+
+TOKEN_ENV = 'YANDEX_DISK_TOKEN'
+LS_ATTRS = ('name', 'type', 'path', 'size', 'modified', 'md5')
+
+
+class Output:
+    """Thread-safe JSON lines writer which counts records with 'op' and transferred bytes for --stats"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.items = 0
+        self.failed = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def emit(self, record: dict):
+        with self._lock:
+            if 'op' in record:
+                self.items += 1
+                status = record.get('status')
+                self.failed += 1 if record.get('error') or (status is not None and not is_success(status)) else 0
+            self.bytes += record.get('bytes') or 0
+            self.stream.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            self.stream.flush()
+
+    def emit_report(self, op: str, report: dict):
+        for result in report['results']:
+            self.emit({'op': op, **result})
+
+
+def command_ls(disk: YandexDisk, args, output: Output):
+    if args.recursive:
+        for _, dirs, files in disk.walk(args.path, workers=args.jobs, limit=args.limit, attrs=LS_ATTRS):
+            for item in dirs + files:
+                output.emit({'op': 'ls', **item.as_dict()})
+        return
+    status, info = disk.path(args.path).info(LS_ATTRS)
+    if status != 200:
+        output.emit({'op': 'ls', 'path': args.path, 'status': status, 'error': 'not found'})
+    elif not info.is_dir:
+        output.emit({'op': 'ls', **info.as_dict()})
+    else:
+        for item in disk.path(args.path).iter_dir(limit=args.limit, attrs=LS_ATTRS):
+            output.emit({'op': 'ls', **item.as_dict()})
+
+
+def command_get(disk: YandexDisk, args, output: Output):
+    jobs = []
+    for remote in args.remote:
+        status, info = disk.path(remote).info(('type', 'path'))
+        if status != 200:
+            output.emit({'op': 'get', 'remote': remote, 'status': status, 'error': 'not found'})
+            continue
+        if not info.is_dir:
+            local = os.path.join(args.local, PurePosixPath(remote).name) if os.path.isdir(args.local) else args.local
+            jobs.append((remote, local))
+            continue
+        root = normalize_path(info.path)
+        target = os.path.join(args.local, PurePosixPath(root).name) if len(args.remote) > 1 else args.local
+        for _, _, files in disk.walk(remote, workers=args.jobs, attrs=('path',)):
+            for item in files:
+                relative = relative_path(item.path, root)
+                if relative:
+                    jobs.append((item.path, os.path.join(target, *relative.split('/'))))
+
+    def download(job):
+        remote, local = job
+        started = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(local)), exist_ok=True)
+            status, info = disk.path(remote).download(local, verify=not args.no_verify)
+        except (OSError, requests.exceptions.RequestException) as e:
+            output.emit({'op': 'get', 'remote': remote, 'local': local, 'status': None, 'bytes': 0,
+                         'error': repr(e), 'seconds': time.monotonic() - started})
+            return
+        output.emit({'op': 'get', 'remote': remote, 'local': local, 'status': status,
+                     'bytes': info['size'] if info else 0, 'seconds': time.monotonic() - started})
+
+    disk._ensure_pool_size(args.jobs)
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        list(executor.map(download, jobs))
+
+
+def command_put(disk: YandexDisk, args, output: Output):
+    files = []
+    for local in args.local:
+        if os.path.isdir(local):
+            remote = args.remote if len(args.local) == 1 else f'{args.remote.rstrip("/")}/{Path(local).name}'
+            output.emit_report('put', disk.upload_tree(local, remote, workers=args.jobs, overwrite=args.overwrite,
+                                                       skip_if_identical=args.skip_identical))
+        else:
+            files.append(local)
+
+    def upload(local: str):
+        started = time.monotonic()
+        remote = f'{args.remote.rstrip("/")}/{Path(local).name}'
+        try:
+            status, response = disk.path(args.remote).upload(local, overwrite=args.overwrite,
+                                                             skip_if_identical=args.skip_identical)
+            skipped = isinstance(response, dict) and response.get('skipped', False)
+            # Only bodies which were sent are counted
+            size = os.path.getsize(local) if is_success(status) and not skipped else 0
+        except (OSError, requests.exceptions.RequestException) as e:
+            output.emit({'op': 'put', 'local': local, 'remote': remote, 'status': None, 'bytes': 0,
+                         'error': repr(e), 'seconds': time.monotonic() - started})
+            return
+        record = {'op': 'put', 'local': local, 'remote': remote, 'status': status, 'bytes': size,
+                  'seconds': time.monotonic() - started}
+        output.emit({**record, 'skipped': True} if skipped else record)
+
+    disk._ensure_pool_size(args.jobs)
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        list(executor.map(upload, files))
+
+
+def command_sync(disk: YandexDisk, args, output: Output):
+    report = disk.sync(args.local, args.remote, delete=args.delete, dry_run=args.dry_run, workers=args.jobs)
+    output.emit_report('sync', report)
+
+
+def command_rm(disk: YandexDisk, args, output: Output):
+    output.emit_report('rm', disk.batch_delete(args.path, workers=args.jobs, permanently=args.permanently))
+
+
+def command_mv(disk: YandexDisk, args, output: Output):
+    if len(args.source) > 1 or args.destination.endswith('/'):
+        pairs = [(s, f'{args.destination.rstrip("/")}/{PurePosixPath(s).name}') for s in args.source]
+    else:
+        pairs = [(args.source[0], args.destination)]
+    output.emit_report('mv', disk.batch_move(pairs, workers=args.jobs, overwrite=args.overwrite or None))
+
+
+def common_options(defaults: bool = True):
+    """
+    Make parent parser with the options accepted before and after the command
+
+    Args:
+        defaults: (optional) Set default values. Subcommand parsers have no defaults, so they do not override
+            the options given before the command
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('-j', '--jobs', type=int, default=4 if defaults else argparse.SUPPRESS,
+                        help='number of parallel requests')
+    parser.add_argument('--stats', action='store_true', default=False if defaults else argparse.SUPPRESS,
+                        help='print throughput and request counts to stderr at exit')
+    return parser
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog='pyyadisk', description='Yandex Disk command-line client',
+                                     epilog=f'The token is read from {TOKEN_ENV} environment variable by default',
+                                     parents=[common_options()])
+    parser.add_argument('--token', default=os.environ.get(TOKEN_ENV), help=f'OAuth token, default ${TOKEN_ENV}')
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+    common = common_options(defaults=False)
+
+    ls = commands.add_parser('ls', help='list directory', parents=[common])
+    ls.add_argument('path', nargs='?', default='/')
+    ls.add_argument('-r', '--recursive', action='store_true', help='list subdirectories')
+    ls.add_argument('--limit', type=int, default=1000, help='page size')
+    ls.set_defaults(handler=command_ls)
+
+    get = commands.add_parser('get', help='download files and directories', parents=[common])
+    get.add_argument('remote', nargs='+')
+    get.add_argument('local')
+    get.add_argument('--no-verify', action='store_true', help='do not check checksums')
+    get.set_defaults(handler=command_get)
+
+    put = commands.add_parser('put', help='upload files and directories', parents=[common])
+    put.add_argument('local', nargs='+')
+    put.add_argument('remote')
+    put.add_argument('--overwrite', action='store_true')
+    put.add_argument('--skip-identical', action='store_true', help='skip files with the same checksums on Disk')
+    put.set_defaults(handler=command_put)
+
+    sync = commands.add_parser('sync', help='one-way sync of local directory to Disk', parents=[common])
+    sync.add_argument('local')
+    sync.add_argument('remote')
+    sync.add_argument('--delete', action='store_true', help='delete remote items which are not in local directory')
+    sync.add_argument('--dry-run', action='store_true', help='print planned actions only')
+    sync.set_defaults(handler=command_sync)
+
+    rm = commands.add_parser('rm', help='delete files and directories', parents=[common])
+    rm.add_argument('path', nargs='+')
+    rm.add_argument('--permanently', action='store_true', help='delete without Trash')
+    rm.set_defaults(handler=command_rm)
+
+    mv = commands.add_parser('mv', help='move files and directories', parents=[common])
+    mv.add_argument('source', nargs='+')
+    mv.add_argument('destination', help='new path or directory for several sources')
+    mv.add_argument('--overwrite', action='store_true')
+    mv.set_defaults(handler=command_mv)
+    return parser
+
+
+def main(argv: list = None) -> int:
+    """
+    Run the command
+
+    Args:
+        argv: (optional) Command-line arguments without the program name. Default is sys.argv[1:]
+
+    Returns:
+        Exit code: 0 for success, 1 if any item failed, 2 for usage errors
+    """
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    if not args.token:
+        parser.error(f'the token is required, set {TOKEN_ENV} or pass --token')
+    metrics = MetricsCollector()
+    disk = YandexDisk(token=args.token, pool_size=max(10, args.jobs), hooks=[metrics] if args.stats else None)
+    output = Output()
+    started = time.monotonic()
+    try:
+        args.handler(disk, args, output)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if args.stats:
+            seconds = time.monotonic() - started
+            series = metrics.as_dict()
+            stats = {'items': output.items, 'failed': output.failed, 'bytes': output.bytes, 'seconds': seconds,
+                     'items_per_second': output.items / seconds if seconds else 0.0,
+                     'mb_per_second': output.bytes / 1024 / 1024 / seconds if seconds else 0.0,
+                     'requests': sum(s['requests'] for s in series.values()),
+                     'retries': sum(s['retries'] for s in series.values()),
+                     'errors': sum(s['errors'] for s in series.values()),
+                     'endpoints': {k: s['requests'] for k, s in series.items()}}
+            sys.stderr.write(json.dumps({'stats': stats}) + '\n')
+    return 1 if output.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
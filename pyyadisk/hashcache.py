@@ -0,0 +1,76 @@
+import os
+import sqlite3
+import threading
+
+from .config import CHUNK_SIZE
+from .transfer import Checksums
+
+DEFAULT_PATH = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                            'pyyadisk', 'hashes.sqlite3')
+
+
+class HashCache:
+    """Persistent SQLite index of local file checksums
+
+    Checksums are keyed by (path, device, inode, size, mtime_ns) of the file, so a file is hashed again only
+    when it is changed, replaced or moved. The index is safe to use from several threads.
+
+    Typical usage example:
+        cache = HashCache()
+        md5, sha256 = cache.checksums('/home/user/file.iso')
+
+    Attributes:
+        path: Path to the SQLite database file
+        hits: Number of checksums taken from the index
+        misses: Number of hashed files
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Args:
+            path: (optional) Path to the SQLite database file. Use ':memory:' for not persistent index
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS hashes (path TEXT PRIMARY KEY, device INTEGER, '
+                             'inode INTEGER, size INTEGER, mtime_ns INTEGER, md5 TEXT, sha256 TEXT)')
+
+    def checksums(self, filepath: str, st: os.stat_result = None, chunk_size: int = CHUNK_SIZE):
+        """
+        Get md5 and sha256 of the local file from the index or hash the file and store the result
+
+        Args:
+            filepath: Path to the file
+            st: (optional) Result of os.stat() of the file
+            chunk_size: (optional) Size of the chunk in bytes for hashing
+
+        Returns:
+            Tuple (md5, sha256) with hex digests
+        """
+        filepath = os.path.abspath(filepath)
+        st = st or os.stat(filepath)
+        key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            row = self._db.execute('SELECT device, inode, size, mtime_ns, md5, sha256 FROM hashes WHERE path = ?',
+                                   (filepath,)).fetchone()
+            if row is not None and tuple(row[:4]) == key:
+                self.hits += 1
+                return row[4], row[5]
+            self.misses += 1
+        checksums = Checksums()
+        with open(filepath, 'rb') as fh:
+            checksums.update_from(fh, chunk_size)
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (filepath, *key, checksums.md5, checksums.sha256))
+        return checksums.md5, checksums.sha256
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -1,6 +1,70 @@
+import time
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is not installed
+    from json import loads as json_loads
+
+
 def join_path(uri, resource_path):
     return '{}{}'.format(uri, resource_path) if resource_path else uri
 
 
 def filter_dict_by_key(d: dict):
     return {k: v for k, v in d.items() if v}
+
+
+def is_success(status: int):
+    return status is not None and 200 <= status <= 299
+
+
+def make_report(results: list, started: float, nbytes: int = 0):
+    seconds = time.monotonic() - started
+    failed = [i for i, r in enumerate(results)
+              if r.get('error') or (r['status'] is not None and not is_success(r['status']))]
+    return {
+        'results': results,
+        'failed': failed,
+        'stats': {
+            'items': len(results),
+            'failed': len(failed),
+            'bytes': nbytes,
+            'seconds': seconds,
+            'items_per_second': len(results) / seconds if seconds else 0.0,
+            'bytes_per_second': nbytes / seconds if seconds else 0.0,
+        },
+    }
+
+
+def normalize_path(path: str):
+    if path.startswith('disk:'):
+        path = path[len('disk:'):]
+    if not path.startswith('/') and ':' not in path.split('/')[0]:
+        path = f'/{path}'
+    return path.rstrip('/') or '/'
+
+
+def relative_path(path: str, root: str):
+    """
+    Get path relative to the root directory
+
+    Args:
+        path: Full path of the resource like 'disk:/root/dir/file'
+        root: Full path of the root directory like '/root' or '/' for the Disk root
+
+    Returns:
+        Relative path like 'dir/file' or None for the root itself and paths outside the root
+    """
+    path, root = normalize_path(path), normalize_path(root)
+    prefix = root.rstrip('/') + '/'
+    if path == root or not path.startswith(prefix):
+        return None
+    return path[len(prefix):]
+
+
+def parent_paths(path: str):
+    parents = []
+    while '/' in path.rstrip('/'):
+        path = path.rstrip('/').rsplit('/', 1)[0] or '/'
+        parents.append(path)
+    return parents
@@ -0,0 +1,214 @@
+import bisect
+import threading
+from urllib.parse import urlparse
+
+from .config import URI
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def endpoint_of(method: str, url: str) -> str:
+    """
+    Get endpoint template of the request url
+
+    Args:
+        method: HTTP method
+        url: Request url
+
+    Returns:
+        Endpoint template like 'resources', 'resources/copy', 'trash', 'trash/restore', 'operations'.
+        Requests to upload and download links are 'upload' and 'download'
+    """
+    prefix = urlparse(URI).path
+    path = urlparse(url).path
+    if path == prefix or path.startswith(f'{prefix}/'):
+        parts = path[len(prefix):].strip('/').split('/')
+        if parts[0] == 'operations':
+            return 'operations'
+        if parts[0] == 'trash':
+            return '/'.join(['trash'] + parts[2:])
+        return '/'.join(parts) or 'disk'
+    return 'upload' if method.lower() == 'put' else 'download'
+
+
+def body_length(body) -> int:
+    """
+    Get number of bytes sent with the request body
+
+    Args:
+        body: Body of the prepared request: bytes, str, ProgressReader or None
+
+    Returns:
+        Size of the body in bytes
+    """
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode())
+    return getattr(body, 'transferred', 0)
+
+
+class RequestEvent:
+    """Event of one HTTP request attempt passed to RequestHooks
+
+    Attributes:
+        method: HTTP method
+        url: Request url
+        endpoint: Endpoint template, see endpoint_of()
+        attempt: Number of the attempt of the request, 0 for the first one
+        status: Response code or None before response and for errors
+        duration: Time from the request start to the response in seconds. For streamed bodies it is the time
+            to response headers
+        bytes_sent: Size of the request body
+        bytes_received: Size of the response body. For streamed bodies it is Content-Length of the response
+        error: Exception for failed requests
+    """
+
+    __slots__ = ('method', 'url', 'endpoint', 'attempt', 'status', 'duration', 'bytes_sent', 'bytes_received',
+                 'error')
+
+    def __init__(self, method: str, url: str, attempt: int = 0):
+        self.method = method.upper()
+        self.url = url
+        self.endpoint = endpoint_of(method, url)
+        self.attempt = attempt
+        self.status = None
+        self.duration = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.error = None
+
+    def __repr__(self):
+        return (f'RequestEvent({self.method} {self.endpoint} status={self.status} duration={self.duration:.3f} '
+                f'attempt={self.attempt})')
+
+
+class RequestHooks:
+    """Interface of request instrumentation hooks
+
+    Subclass it and pass the object to YandexDisk(hooks=[...]) or YandexDisk.add_hook().
+    Hooks are called in the thread of the request, so they must be thread-safe.
+    """
+
+    def before_request(self, event: RequestEvent):
+        pass
+
+    def after_response(self, event: RequestEvent):
+        pass
+
+    def on_error(self, event: RequestEvent):
+        pass
+
+
+class MetricsCollector(RequestHooks):
+    """Latency histograms and counters of requests per endpoint and method
+
+    Typical usage example:
+        metrics = MetricsCollector()
+        disk = YandexDisk(token=token, hooks=[metrics])
+        ...
+        print(metrics.to_prometheus())
+
+    Attributes:
+        buckets: Upper bounds of latency histogram buckets in seconds
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: (optional) Upper bounds of latency histogram buckets in seconds
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def after_response(self, event: RequestEvent):
+        with self._lock:
+            series = self._get_series(event)
+            series['requests'] += 1
+            series['retries'] += 1 if event.attempt else 0
+            series['statuses'][event.status] = series['statuses'].get(event.status, 0) + 1
+            series['bytes_sent'] += event.bytes_sent
+            series['bytes_received'] += event.bytes_received
+            series['duration_sum'] += event.duration
+            series['histogram'][bisect.bisect_left(self.buckets, event.duration)] += 1
+
+    def on_error(self, event: RequestEvent):
+        with self._lock:
+            series = self._get_series(event)
+            series['requests'] += 1
+            series['retries'] += 1 if event.attempt else 0
+            series['errors'] += 1
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def as_dict(self) -> dict:
+        """
+        Export metrics
+
+        Returns:
+            Dictionary {'endpoint METHOD': {'requests', 'errors', 'retries', 'statuses', 'bytes_sent',
+            'bytes_received', 'duration_sum', 'duration_avg', 'histogram': {upper bound: cumulative count}}}
+        """
+        with self._lock:
+            result = {}
+            for (endpoint, method), series in sorted(self._series.items()):
+                responses = sum(series['statuses'].values())
+                cumulative, histogram = 0, {}
+                for bound, count in zip(self.buckets + (float('inf'),), series['histogram']):
+                    cumulative += count
+                    histogram[bound] = cumulative
+                result[f'{endpoint} {method}'] = {
+                    **{k: v for k, v in series.items() if k != 'histogram'},
+                    'statuses': dict(series['statuses']),
+                    'duration_avg': series['duration_sum'] / responses if responses else 0.0,
+                    'histogram': histogram,
+                }
+            return result
+
+    def to_prometheus(self, prefix: str = 'pyyadisk') -> str:
+        """
+        Export metrics in Prometheus text exposition format
+
+        Args:
+            prefix: (optional) Prefix of metric names
+
+        Returns:
+            String with metrics
+        """
+        metrics = self.as_dict()
+        lines = []
+        for name, key in (('requests_total', 'requests'), ('request_errors_total', 'errors'),
+                          ('request_retries_total', 'retries'), ('bytes_sent_total', 'bytes_sent'),
+                          ('bytes_received_total', 'bytes_received')):
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for series_key, series in metrics.items():
+                lines.append(f'{prefix}_{name}{{{_labels(series_key)}}} {series[key]}')
+        lines.append(f'# TYPE {prefix}_responses_total counter')
+        for series_key, series in metrics.items():
+            for status, count in sorted(series['statuses'].items()):
+                lines.append(f'{prefix}_responses_total{{{_labels(series_key)},status="{status}"}} {count}')
+        lines.append(f'# TYPE {prefix}_request_duration_seconds histogram')
+        for series_key, series in metrics.items():
+            labels = _labels(series_key)
+            for bound, count in series['histogram'].items():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{{labels}}} {series["duration_sum"]}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{{labels}}} {sum(series["statuses"].values())}')
+        return '\n'.join(lines) + '\n'
+
+    def _get_series(self, event: RequestEvent) -> dict:
+        key = (event.endpoint, event.method)
+        if key not in self._series:
+            self._series[key] = {'requests': 0, 'errors': 0, 'retries': 0, 'statuses': {}, 'bytes_sent': 0,
+                                 'bytes_received': 0, 'duration_sum': 0.0,
+                                 'histogram': [0] * (len(self.buckets) + 1)}
+        return self._series[key]
+
+
+def _labels(series_key: str) -> str:
+    endpoint, method = series_key.rsplit(' ', 1)
+    return f'endpoint="{endpoint}",method="{method}"'
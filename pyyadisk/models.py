@@ -0,0 +1,81 @@
+from .config import FIELDS_NAME
+
+RESOURCE_ATTRS = tuple(FIELDS_NAME) + ('md5', 'sha256')
+TRASH_ATTRS = ('deleted', 'origin_path')
+
+
+def fields_for(attrs, container: str = None) -> str:
+    """
+    Build fields projection from attributes of ResourceInfo
+
+    Typical usage example:
+        fields_for(('name', 'size'), '_embedded.items')  # '_embedded.items.name,_embedded.items.size'
+
+    Args:
+        attrs: Iterable of attribute names from RESOURCE_ATTRS and TRASH_ATTRS
+        container: (optional) Prefix of items like '_embedded.items' or 'items'. Fields of the resource for None
+
+    Returns:
+        String for 'fields' param
+
+    Raises:
+        ValueError: for unknown attribute
+    """
+    attrs = tuple(attrs)
+    unknown = [a for a in attrs if a not in ResourceInfo.__slots__]
+    if unknown:
+        raise ValueError(f'Unknown attributes {unknown}, expected some of {ResourceInfo.__slots__}')
+    prefix = f'{container}.' if container else ''
+    return ','.join(f'{prefix}{a}' for a in attrs)
+
+
+class ResourceInfo:
+    """Compact metadata record of file or directory
+
+    Attributes which are not requested by fields projection are None.
+
+    Attributes:
+        name: Name of the resource
+        type: 'file' or 'dir'
+        path: Full path of the resource like 'disk:/path/to/the/file'
+        size: Size of the file in bytes
+        created: Date of creation in ISO 8601
+        modified: Date of modification in ISO 8601
+        revision: Revision of the resource
+        file: Download link of the file
+        md5: md5 of the file
+        sha256: sha256 of the file
+        deleted: Date of deletion in ISO 8601 for Trash items
+        origin_path: Path of Trash item before deletion like 'disk:/path/to/the/file'
+    """
+
+    __slots__ = RESOURCE_ATTRS + TRASH_ATTRS
+
+    def __init__(self, **attrs):
+        for attr in self.__slots__:
+            setattr(self, attr, attrs.get(attr))
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Make record from the resource dictionary of Yandex Disk API response. Other keys are dropped
+        """
+        info = cls.__new__(cls)
+        for attr in cls.__slots__:
+            setattr(info, attr, data.get(attr))
+        return info
+
+    def as_dict(self) -> dict:
+        return {attr: getattr(self, attr) for attr in self.__slots__ if getattr(self, attr) is not None}
+
+    @property
+    def is_dir(self) -> bool:
+        return self.type == 'dir'
+
+    def __repr__(self):
+        return f'ResourceInfo({", ".join(f"{k}={v!r}" for k, v in self.as_dict().items())})'
+
+    def __eq__(self, other):
+        return isinstance(other, ResourceInfo) and all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    __hash__ = None
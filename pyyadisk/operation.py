@@ -0,0 +1,172 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from urllib.parse import urlparse
+
+import requests
+
+
+class Operation(Future):
+    """Handle of an asynchronous operation of Yandex Disk
+
+    Future which is resolved with the final status of the operation ('success' or 'failed').
+    Operations which are finished synchronously by the server are resolved at once. If the status cannot be
+    checked several times in a row, the Future is failed with the exception of the last check.
+
+    Typical usage example:
+        disk = YandexDisk()
+        operation = disk.path('path/to/the/directory').move_to('path/to/new/directory', as_operation=True)
+        if operation.wait(timeout=60):
+            print(operation.result())
+
+    Attributes:
+        id: Operation Id or None for operations finished synchronously
+        response: Tuple (Response code, JSON Response dict) of the request which started the operation
+    """
+
+    def __init__(self, operation_id: str = None, response: tuple = None):
+        super().__init__()
+        self.id = operation_id
+        self.response = response
+
+    @classmethod
+    def from_response(cls, poller, response: tuple):
+        """
+        Make handle from the response of copy, move, delete, restore or upload by url request
+
+        Args:
+            poller: OperationPoller object which tracks the operation
+            response: Tuple (Response code, JSON Response dict)
+
+        Returns:
+            Operation object
+        """
+        status, data = response
+        href = (data or {}).get('href')
+        if status == 202 and href:
+            operation = cls(urlparse(href).path.rstrip('/').rsplit('/', 1)[-1], response)
+            poller.track(operation)
+        else:
+            operation = cls(response=response)
+            operation.set_result('success' if status is not None and 200 <= status <= 299 else 'failed')
+        return operation
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait for the end of the operation
+
+        Args:
+            timeout: (optional) Maximum time to wait in seconds
+
+        Returns:
+            True if the operation is finished
+        """
+        try:
+            self.exception(timeout)
+        except TimeoutError:
+            pass
+        return self.done()
+
+    @property
+    def status(self) -> str:
+        if not self.done():
+            return 'in-progress'
+        return 'failed' if self.exception() is not None else self.result()
+
+
+class OperationPoller:
+    """Background poller of many asynchronous operations
+
+    One daemon thread checks the status of every pending operation with exponential backoff and jitter,
+    so hundreds of operations are tracked with a small number of requests. The thread is started by the first
+    tracked operation and stops when nothing is pending.
+
+    Attributes:
+        initial_delay: Delay before the first status check in seconds
+        max_delay: Maximum delay between status checks of one operation in seconds
+        multiplier: Multiplier of the delay after every check
+        jitter: Random part of the delay from 0 to 1
+        max_failures: Number of failed status checks in a row after which the operation is failed
+    """
+
+    def __init__(self, disk, initial_delay: float = 0.5, max_delay: float = 30.0, multiplier: float = 2.0,
+                 jitter: float = 0.2, max_failures: int = 5):
+        """
+        Args:
+            disk: YandexDisk object
+            initial_delay: (optional) Delay before the first status check in seconds
+            max_delay: (optional) Maximum delay between status checks of one operation in seconds
+            multiplier: (optional) Multiplier of the delay after every check
+            jitter: (optional) Random part of the delay from 0 to 1
+            max_failures: (optional) Number of failed status checks in a row after which the Future of
+                the operation is failed with requests.exceptions.HTTPError or the exception of the last check
+        """
+        self.disk = disk
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_failures = max_failures
+        self.requests = 0
+        self._queue = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def track(self, operation: Operation):
+        """
+        Add the operation to the pending ones
+
+        Args:
+            operation: Operation object with Id
+        """
+        with self._condition:
+            self._schedule(operation, self.initial_delay)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='pyyadisk-operations', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    def _schedule(self, operation: Operation, delay: float, failures: int = 0):
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        heapq.heappush(self._queue, (time.monotonic() + delay, next(self._counter), operation, delay, failures))
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._queue:
+                    self._thread = None
+                    return
+                due, _, operation, delay, failures = self._queue[0]
+                now = time.monotonic()
+                if due > now:
+                    self._condition.wait(due - now)
+                    continue
+                heapq.heappop(self._queue)
+            if operation.cancelled():
+                continue
+            try:
+                status, data = self.disk.operations(operation.id)
+                error = None
+            except Exception as e:
+                status, data, error = None, None, e
+            self.requests += 1
+            result = (data or {}).get('status')
+            if status == 200 and result in ('success', 'failed'):
+                operation.set_result(result)
+            elif status == 404:
+                operation.set_result('failed')
+            elif status != 200 and failures + 1 >= self.max_failures:
+                operation.set_exception(error or requests.exceptions.HTTPError(
+                    f'{status} Error for operation {operation.id}'))
+            else:
+                with self._condition:
+                    self._schedule(operation, min(delay * self.multiplier, self.max_delay),
+                                   failures + 1 if status != 200 else 0)
@@ -0,0 +1,237 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+from types import MappingProxyType
+
+import requests
+
+from .config import PUBLIC_PATH, CHUNK_SIZE, FIELDS
+from .helpers import filter_dict_by_key, make_report, normalize_path
+from .models import RESOURCE_ATTRS, ResourceInfo, fields_for
+from .resource import DownloadMethods
+
+TREE_FIELDS = fields_for(('type', 'path', 'size', 'md5', 'sha256', 'file'), '_embedded.items')
+
+
+class PublicResource(DownloadMethods):
+    """Immutable handle of public file or directory published by anyone
+
+    Returned by YandexDisk.public(). The resource is addressed by its public key or public url and by the path
+    inside the public directory, so links shared by other users are listed and downloaded without access to their
+    Disk. Download links are kept in YandexDisk.link_cache if the cache is enabled, and links of files from
+    the listing are used by download_tree() directly, so bulk downloads do not ask for a link per file.
+
+    Typical usage example:
+        disk = YandexDisk()
+        shared = disk.public('https://yadi.sk/d/abcdef')
+        for item in shared.iter_dir(attrs=('name', 'size')):
+            print(item.name, item.size)
+        report = shared.download_tree('/home/user/shared', workers=8)
+
+    Attributes:
+        resources: Yandex Disk Rest API public resources uri
+        params: Read-only dictionary with 'public_key' and 'path' inside the public directory
+    """
+
+    __slots__ = ('_client', 'resources', 'params')
+
+    def __init__(self, client, public_key: str, path: str = None):
+        """
+        Args:
+            client: YandexDisk object
+            public_key: Public key or public url of the resource
+            path: (optional) Path of the file or directory inside the public directory. The resource itself for None
+        """
+        object.__setattr__(self, '_client', client)
+        object.__setattr__(self, 'resources', PUBLIC_PATH)
+        object.__setattr__(self, 'params', MappingProxyType({'public_key': public_key, 'path': path}))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.params["public_key"]!r}, {self.params["path"]!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, PublicResource) and self._client is other._client and self.params == other.params
+
+    def __hash__(self):
+        return hash((id(self._client), self.params['public_key'], self.params['path']))
+
+    def _locator(self) -> dict:
+        return filter_dict_by_key(dict(self.params))
+
+    def _link_cache(self):
+        return self._client.link_cache
+
+    def _link_key(self, optional: dict) -> tuple:
+        return 'public_download', self.params['path'], {'public_key': self.params['public_key'], **optional}
+
+    def _name(self) -> str:
+        if self.params['path']:
+            return PurePosixPath(self.params['path']).name
+        return self.get(fields='name')[1]['name']
+
+    def child(self, path: str):
+        """
+        Get the handle of the file or directory inside the public directory
+
+        Args:
+            path: Path relative to the handle
+
+        Returns:
+            New PublicResource object
+        """
+        base = (self.params['path'] or '/').rstrip('/')
+        return PublicResource(self._client, self.params['public_key'], normalize_path(f'{base}/{path.lstrip("/")}'))
+
+    def get(self, fields: str = None, limit: int = None, offset: int = None, sort: str = None, **optional):
+        """
+        Get metadata of public file or directory. Directory items are returned in '_embedded'
+
+        Args:
+            fields: (optional) Fields projection
+            limit: (optional) The number of directory items to return
+            offset: (optional) Offset of directory items from the beginning
+            sort: (optional) The attribute by which to sort directory items (name, path, created, modified, size)
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {**self.params, 'fields': fields, 'limit': limit, 'offset': offset, 'sort': sort, **optional}
+        return self._client._get(self.resources, params=filter_dict_by_key(params))
+
+    def info(self, attrs=RESOURCE_ATTRS):
+        """
+        Get metadata of public file or directory as compact record
+
+        Args:
+            attrs: (optional) Attributes of ResourceInfo to request
+
+        Returns:
+            Tuple with Response code and ResourceInfo or None for error
+        """
+        status, data = self.get(fields=fields_for(attrs))
+        return status, ResourceInfo.from_dict(data) if status == 200 and data is not None else None
+
+    def iter_dir(self, limit: int = 100, fields: str = FIELDS, prefetch: bool = True, attrs=None, sort: str = None,
+                 **optional):
+        """
+        Iterate over items of public directory page by page. See Resource.iter_dir()
+
+        Args:
+            limit: (optional) Page size
+            fields: (optional) Fields projection of items. All fields are returned for fields=None
+            prefetch: (optional) Request the next page in the background
+            attrs: (optional) Attributes of ResourceInfo to request. Items are yielded as ResourceInfo records
+            sort: (optional) The attribute by which to sort items
+
+        Yields:
+            Dictionaries of directory items or ResourceInfo records if attrs is set
+
+        Raises:
+            requests.exceptions.HTTPError: for error response code of any page
+        """
+        if attrs:
+            fields = fields_for(attrs, '_embedded.items')
+        params = {**self.params, 'fields': fields, 'sort': sort, **optional}
+        items = self._client._iter_pages(self.resources, filter_dict_by_key(params), '_embedded', limit, prefetch)
+        return map(ResourceInfo.from_dict, items) if attrs else items
+
+    def walk(self, workers: int = 4, max_depth: int = None, limit: int = 1000, fields: str = FIELDS, attrs=None):
+        """
+        Walk public directory tree concurrently. See YandexDisk.walk()
+
+        Yields:
+            Tuples (dirpath, dirs, files) with paths inside the public directory
+
+        Raises:
+            requests.exceptions.HTTPError: for error response code of any listing
+        """
+        return self._client._walk(self.resources, {'public_key': self.params['public_key']},
+                                  self.params['path'] or '/', workers, max_depth, limit, fields, attrs)
+
+    def download_tree(self, local_dir: str, workers: int = 4, chunk_size: int = CHUNK_SIZE, verify: bool = True):
+        """
+        Download public directory tree. Directories are listed concurrently and files are downloaded
+        on a thread pool as soon as they are listed. Size, checksums and download links of files are taken
+        from the listing, so a file costs one request of its body
+
+        Typical usage example:
+            disk = YandexDisk()
+            report = disk.public('https://yadi.sk/d/abcdef').download_tree('/home/user/shared', workers=8)
+
+        Args:
+            local_dir: Path to the local directory. It is created if it does not exist
+            workers: (optional) Number of concurrent downloads and directory listings
+            chunk_size: (optional) Size of the body chunk in bytes
+            verify: (optional) Check size, md5 and sha256 of downloaded files
+
+        Returns:
+            Dictionary with results and statistics:
+                {
+                  "results": [{"remote": "string", "local": "string", "status": int, "bytes": int,
+                               "seconds": float, "error": "string or None"}, ...],
+                  "failed": [indexes of failed results],
+                  "stats": {"items": int, "failed": int, "bytes": int, "seconds": float,
+                            "items_per_second": float, "bytes_per_second": float}
+                }
+
+        Raises:
+            requests.exceptions.HTTPError: for error response code of any listing
+        """
+        started = time.monotonic()
+        public_key = self.params['public_key']
+
+        def download(job: tuple):
+            handle, local, item = job
+            file_started = time.monotonic()
+            result = {'remote': handle.params['path'] or '/', 'local': local, 'status': None, 'bytes': 0,
+                      'error': None}
+            try:
+                os.makedirs(os.path.dirname(local), exist_ok=True)
+                part = f'{local}.part'
+                with open(part, 'wb') as fh:
+                    status, info = handle._download_body(fh, 0, chunk_size, verify, None, meta=item,
+                                                         href=item.get('file'))
+                if status in (200, 206):
+                    os.replace(part, local)
+                else:
+                    os.remove(part)
+                result.update({'status': status, 'bytes': info['size'] if info else 0})
+            except (requests.exceptions.RequestException, OSError) as e:
+                result['error'] = repr(e)
+            result['seconds'] = time.monotonic() - file_started
+            return result
+
+        def jobs():
+            root = (self.params['path'] or '/').rstrip('/')
+            for _, _, items in self.walk(workers=workers, fields=TREE_FIELDS):
+                for item in items:
+                    remote = normalize_path(item['path'])
+                    local = os.path.join(local_dir, *remote[len(root):].strip('/').split('/'))
+                    yield PublicResource(self._client, public_key, remote), local, item
+
+        status, meta = self.get(fields='name,type,size,md5,sha256,file')
+        if status != 200:
+            raise requests.exceptions.HTTPError(f'{status} Error for url: {self.resources} key: {public_key}')
+        os.makedirs(local_dir, exist_ok=True)
+        if meta.get('type') != 'dir':
+            queue = iter([(self, os.path.join(local_dir, meta['name']), meta)])
+        else:
+            queue = jobs()
+        self._client._ensure_pool_size(2 * workers)
+        # Directories are listed ahead of downloads, at most 2 * workers files are queued
+        window = threading.BoundedSemaphore(2 * workers)
+        futures = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for job in queue:
+                window.acquire()
+                future = executor.submit(download, job)
+                future.add_done_callback(lambda _: window.release())
+                futures.append(future)
+            results = [f.result() for f in futures]
+        return make_report(results, started, sum(r['bytes'] for r in results))
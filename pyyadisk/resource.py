@@ -0,0 +1,785 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from .config import RESOURCES_PATH, TRASH_PATH, CHUNK_SIZE, FIELDS
+from .helpers import filter_dict_by_key
+from .models import RESOURCE_ATTRS, ResourceInfo, fields_for
+from .retry import RetryPolicy
+from .transfer import Checksums, segment_ranges
+
+LINK_REJECTED_STATUSES = (403, 404, 410)
+
+
+class DownloadMethods:
+    """Download of the file of Disk or public resource
+
+    Shared by ResourceMethods and PublicResource. Subclasses provide the attributes:
+        resources: Yandex Disk Rest API resources uri with '/download' endpoint
+        params: Dictionary to send in the query string for the Request, 'path' is the path of the resource
+        _client: YandexDisk object which sends requests
+    """
+
+    __slots__ = ()
+
+    def _locator(self) -> dict:
+        """
+        Get params which identify the resource in the requests of metadata and download link
+        """
+        return {'path': self.params.get('path')}
+
+    def _link_cache(self):
+        return self._client.link_cache if self.resources == RESOURCES_PATH else None
+
+    def _link_key(self, optional: dict) -> tuple:
+        """
+        Get (kind, path, params) of the download link in YandexDisk.link_cache
+        """
+        return 'download', self.params.get('path'), optional
+
+    def _name(self) -> str:
+        return Path(self.params['path']).name
+
+    def link(self, **optional):
+        """
+        Get private link of file or directory which set by YandexDisk.path('path/to/the/file').
+        The link is taken from YandexDisk.link_cache if the cache is enabled
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        link_cache = self._link_cache()
+        kind, path, params = self._link_key(optional)
+        if link_cache is not None:
+            href = link_cache.get(kind, path, params)
+            if href is not None:
+                return 200, href
+        try:
+            href = self._client._get(f'{self.resources}/download', {**self._locator(), **optional})[1]['href']
+        except TypeError:
+            return 404, None
+        if link_cache is not None:
+            link_cache.set(kind, path, href, params)
+        return 200, href
+
+    def _stream_link(self, headers: dict = None, href: str = None, **optional):
+        """
+        Open streamed GET request of the download link. A cached or passed link rejected by the server is evicted
+        and the request is repeated once with a new link
+
+        Args:
+            headers: (optional) Dictionary with headers
+            href: (optional) Download link which is already known, for example from the listing
+
+        Returns:
+            Tuple with Response code and requests.Response or None for error
+        """
+        link_cache = self._link_cache()
+        attempts = 2 if link_cache is not None or href is not None else 1
+        for attempt in range(attempts):
+            if href is None:
+                status, href = self.link(**optional)
+                if status != 200:
+                    return status, None
+            response = self._client._stream('get', href, headers=headers)
+            if response.status_code not in LINK_REJECTED_STATUSES or attempt == attempts - 1:
+                break
+            response.close()
+            href = None
+            if link_cache is not None:
+                link_cache.pop(*self._link_key(optional))
+        return response.status_code, response
+
+    def download(self, dest: str, chunk_size: int = CHUNK_SIZE, resume: bool = True, verify: bool = True,
+                 progress=None, **optional):
+        """
+        Download file which set by YandexDisk.path('path/to/the/file') to the local disk.
+        The body is streamed by chunks to the '<dest>.part' file which is renamed to dest after successful download.
+        Interrupted downloads are resumed from the size of '.part' file by HTTP Range request
+
+        Typical usage example:
+            disk = YandexDisk()
+            status, info = disk.path('path/to/the/file.iso').download('/home/user/file.iso')
+
+        Args:
+            dest: Local path of the file. If dest is a directory, the file is saved with the name of the resource
+            chunk_size: (optional) Size of the body chunk in bytes
+            resume: (optional) Continue interrupted download
+            verify: (optional) Check size, md5 and sha256 of the downloaded file with resource metadata
+            progress: (optional) Function progress(transferred, total, elapsed) called after every chunk
+
+        Returns:
+            Tuple with Response code and dictionary with 'path', 'size', 'md5' and 'sha256' of the downloaded file:
+            (Response code, dict or None for error). Response code is 422 for checksums mismatch
+        """
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, self._name())
+        part = f'{dest}.part'
+        if not resume and os.path.exists(part):
+            os.remove(part)
+        with open(part, 'a+b') as fh:
+            status, info = self._download_body(fh, fh.seek(0, os.SEEK_END), chunk_size, verify, progress,
+                                               **optional)
+        if info is None:
+            return status, None
+        if status == 422:
+            os.remove(part)
+        else:
+            os.replace(part, dest)
+        return status, {**info, 'path': dest}
+
+    def download_to(self, fileobj, chunk_size: int = CHUNK_SIZE, verify: bool = True, progress=None, **optional):
+        """
+        Download file which set by YandexDisk.path('path/to/the/file') into file object
+
+        Typical usage example:
+            disk = YandexDisk()
+            with open('file.iso', 'wb') as fh:
+                status, info = disk.path('path/to/the/file.iso').download_to(fh)
+
+        Args:
+            fileobj: File object opened for writing in binary mode
+            chunk_size: (optional) Size of the body chunk in bytes
+            verify: (optional) Check size, md5 and sha256 of the downloaded body with resource metadata
+            progress: (optional) Function progress(transferred, total, elapsed) called after every chunk
+
+        Returns:
+            Tuple with Response code and dictionary with 'size', 'md5' and 'sha256' of the downloaded body:
+            (Response code, dict or None for error). Response code is 422 for checksums mismatch
+        """
+        return self._download_body(fileobj, 0, chunk_size, verify, progress, **optional)
+
+    def download_parallel(self, dest: str, workers: int = 4, segment_size: int = 16 * CHUNK_SIZE,
+                          retries: int = 3, chunk_size: int = CHUNK_SIZE, verify: bool = True, progress=None,
+                          **optional):
+        """
+        Download file which set by YandexDisk.path('path/to/the/file') by several connections at the same time.
+        The file is split into segments which are fetched by HTTP Range requests on a thread pool and written
+        into the preallocated '<dest>.part' file. Segments are retried from the last written byte for connection
+        errors and retry statuses of YandexDisk.retry with its backoff, and a link rejected by the server
+        is requested again. Files smaller than two segments and servers which ignore Range are downloaded
+        by YandexDisk.download()
+
+        Typical usage example:
+            disk = YandexDisk()
+            status, info = disk.path('path/to/the/file.iso').download_parallel('/home/user/file.iso', workers=8)
+
+        Args:
+            dest: Local path of the file. If dest is a directory, the file is saved with the name of the resource
+            workers: (optional) Number of connections
+            segment_size: (optional) Size of one segment in bytes
+            retries: (optional) Number of retries of one segment, including requests of a new link
+            chunk_size: (optional) Size of the body chunk in bytes
+            verify: (optional) Check size, md5 and sha256 of the downloaded file with resource metadata.
+                Checksums are computed after download because segments arrive out of order
+            progress: (optional) Function progress(transferred, total, elapsed) called after every chunk
+
+        Returns:
+            Tuple with Response code and dictionary with 'path', 'size', 'md5' and 'sha256' of the downloaded file:
+            (Response code, dict or None for error). Response code is 422 for checksums mismatch
+        """
+        status, meta = self._client._get(self.resources, params={**self._locator(), 'fields': 'size,md5,sha256'})
+        if status != 200:
+            return status, None
+        size = meta.get('size') or 0
+        if workers <= 1 or size < 2 * segment_size:
+            return self.download(dest, chunk_size=chunk_size, resume=False, verify=verify, progress=progress,
+                                 **optional)
+        status, href = self.link(**optional)
+        if status != 200:
+            return status, None
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, self._name())
+        part = f'{dest}.part'
+        with open(part, 'wb') as fh:
+            fh.truncate(size)
+
+        lock = threading.Lock()
+        transferred = [0]
+        link = [href]
+        ranges_ignored = threading.Event()
+        policy = self._client.retry or RetryPolicy()
+        started = time.monotonic()
+
+        def refresh(rejected: str):
+            # One new link is requested for all segments which were rejected with the same link
+            with lock:
+                if link[0] == rejected:
+                    link_cache = self._link_cache()
+                    if link_cache is not None:
+                        link_cache.pop(*self._link_key(optional))
+                    link[0] = self.link(**optional)[1]
+                return link[0]
+
+        def fetch(first: int, last: int):
+            position, status = first, 502
+            for attempt in range(retries + 1):
+                if ranges_ignored.is_set():
+                    return 200
+                href, delay = link[0], None
+                try:
+                    response = self._client._stream('get', href, headers={'Range': f'bytes={position}-{last}'})
+                    with response:
+                        status = response.status_code
+                        if status == 200:
+                            ranges_ignored.set()
+                            return status
+                        if status in LINK_REJECTED_STATUSES:
+                            if refresh(href) is None:
+                                return status
+                            continue
+                        if status != 206:
+                            if status not in policy.statuses:
+                                return status
+                            delay = policy.delay(attempt, response.headers.get('Retry-After'))
+                        else:
+                            with open(part, 'r+b') as fh:
+                                fh.seek(position)
+                                for chunk in response.iter_content(chunk_size):
+                                    fh.write(chunk)
+                                    position += len(chunk)
+                                    if progress:
+                                        with lock:
+                                            transferred[0] += len(chunk)
+                                            progress(transferred[0], size, time.monotonic() - started)
+                            if position > last:
+                                return 206
+                            status = 502
+                except requests.exceptions.RequestException:
+                    if attempt == retries:
+                        raise
+                    delay = policy.delay(attempt)
+                if delay is not None and attempt < retries:
+                    time.sleep(delay)
+            return status
+
+        self._client._ensure_pool_size(workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            statuses = list(executor.map(lambda r: fetch(*r), segment_ranges(size, segment_size)))
+        if ranges_ignored.is_set():
+            os.remove(part)
+            return self.download(dest, chunk_size=chunk_size, resume=False, verify=verify, progress=progress,
+                                 **optional)
+        failed = [s for s in statuses if s != 206]
+        if failed:
+            os.remove(part)
+            return failed[0], None
+        checksums = Checksums()
+        with open(part, 'rb') as fh:
+            checksums.update_from(fh, chunk_size)
+        info = {'path': dest, 'size': checksums.size, 'md5': checksums.md5, 'sha256': checksums.sha256}
+        if verify and checksums.mismatches(meta):
+            os.remove(part)
+            return 422, info
+        os.replace(part, dest)
+        return 206, info
+
+    def _download_body(self, fileobj, offset: int, chunk_size: int, verify: bool, progress, meta: dict = None,
+                       href: str = None, **optional):
+        """
+        Stream the file body into file object and compute checksums on the fly
+
+        Args:
+            fileobj: File object. It must be readable and positioned at the end of the file for offset > 0
+            offset: Number of bytes which are already in the file object
+            chunk_size: Size of the body chunk in bytes
+            verify: Check size, md5 and sha256 of the body with resource metadata
+            progress: Function progress(transferred, total, elapsed) or None
+            meta: (optional) Dictionary with 'size', 'md5' and 'sha256' of the resource which is already known,
+                for example from the listing. Metadata is requested for None
+            href: (optional) Download link which is already known. The link is resolved for None
+
+        Returns:
+            Tuple with Response code and dictionary with 'size', 'md5' and 'sha256' of the body:
+            (Response code, dict or None for error)
+        """
+        status = 200
+        if meta is None:
+            status, meta = self._client._get(self.resources, params={**self._locator(), 'fields': 'size,md5,sha256'})
+            if status != 200:
+                return status, None
+        checksums = Checksums()
+        if offset:
+            fileobj.seek(0)
+            checksums.update_from(fileobj, chunk_size)
+        total = meta.get('size')
+        if total is None or checksums.size < total:
+            headers = {'Range': f'bytes={checksums.size}-'} if checksums.size else None
+            status, response = self._stream_link(headers, href, **optional)
+            if response is None:
+                return status, None
+            with response:
+                if status not in (200, 206):
+                    return status, None
+                if status == 200 and checksums.size:
+                    fileobj.seek(0)
+                    fileobj.truncate()
+                    checksums = Checksums()
+                started = time.monotonic()
+                for chunk in response.iter_content(chunk_size):
+                    fileobj.write(chunk)
+                    checksums.update(chunk)
+                    if progress:
+                        progress(checksums.size, total, time.monotonic() - started)
+        info = {'size': checksums.size, 'md5': checksums.md5, 'sha256': checksums.sha256}
+        if verify and checksums.mismatches(meta):
+            return 422, info
+        return status, info
+
+
+class ResourceMethods(DownloadMethods):
+    """Operations with the file or directory of Disk or Trash
+
+    Shared by YandexDisk and Resource. Download methods are inherited from DownloadMethods.
+    Subclasses provide the attributes:
+        resources: Yandex Disk Rest API resources uri (RESOURCES_PATH or TRASH_PATH)
+        params: Dictionary to send in the query string for the Request, 'path' is the path of the resource
+        _client: YandexDisk object which sends requests
+    """
+
+    __slots__ = ()
+
+    def restore(self, name: str = None, force_async: bool = None, overwrite: bool = False, as_operation: bool = False,
+                **optional):
+        """
+        Restore trash items
+
+        Typical usage example:
+            disk = YandexDisk()
+            trash_ = disk.trash('path/to/the/file.pdf')
+            response = trash_.restore()
+
+        Args:
+            name: The name under which the resource will be restored.
+            force_async: Execute asynchronously (True or False).
+            overwrite: Overwrite the existing resource with the restored one  (True or False).
+            as_operation: (optional) Return Operation handle instead of the response tuple
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+
+            JSON Response dict:
+                {
+                  "href": "string",
+                  "method": "string",
+                  "templated": true
+                }
+        """
+        params = {**self.params, 'name': name, 'force_async': force_async, 'overwrite': overwrite, **optional, }
+        response = self._client._put(f'{self.resources}/restore', params=filter_dict_by_key(params))
+        restored = parse_qs(urlparse((response[1] or {}).get('href', '')).query).get('path')
+        paths = (self.params['path'], restored[0]) if restored and response[0] == 201 else ('/', )
+        self._client._invalidate(*paths)
+        return self._client._operation(response, *paths) if as_operation else response
+
+    def get(self, limit: int = None, offset: int = None, **optional):
+        """
+        Get metadata of file or directory from Disk or Trash mode. For objects sorting use YandexDisk.sort() method
+
+        Typical usage example:
+            disk = YandexDisk()
+            info = disk.path('path/to/the/file').get()
+
+        Args:
+            limit: The number of items to return
+            offset: Offset from the beginning
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {**self.params, 'limit': limit, 'offset': offset, **optional, }
+        return self._client._get_cached(self.resources, params=filter_dict_by_key(params))
+
+    def info(self, attrs=RESOURCE_ATTRS, **optional):
+        """
+        Get metadata of file or directory from Disk or Trash mode as compact ResourceInfo record.
+        Only requested attributes are asked from the server by fields projection
+
+        Typical usage example:
+            disk = YandexDisk()
+            status, info = disk.path('path/to/the/file').info(('size', 'md5'))
+            print(info.size, info.md5)
+
+        Args:
+            attrs: (optional) Attributes of ResourceInfo to request. See models.RESOURCE_ATTRS
+
+        Returns:
+            Tuple with Response code and ResourceInfo: (Response code, ResourceInfo or None for error)
+        """
+        params = {**self.params, 'fields': fields_for(attrs), **optional, }
+        status, data = self._client._get_cached(self.resources, params=filter_dict_by_key(params))
+        return status, ResourceInfo.from_dict(data) if data is not None else None
+
+    def create(self, subdir: str = None, **optional):
+        """
+        Make directory or subdirectory by the path
+
+        Typical usage example:
+            disk = YandexDisk()
+            dir_ = disk.path('path/to/the/directory').create()  # create the directory by the path
+            dir_ = disk.path('path/to/the/directory').create('subdirectory')  # create the subdirectory in the directory
+
+        or
+
+            disk = YandexDisk()
+            directory = disk.path('path/to/the/directory')
+            subdir_list = ['sub_1', 'sub_2', 'sub_3', 'sub_4', ]
+            for s in subdir_list:
+                directory.create(s)
+
+        Args:
+            subdir: Name of subdirectory. If 'subdir = None' the directory will be created by path-data
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {**self.params, 'path': f'{self.params["path"]}/{subdir}' if subdir else self.params["path"],
+                  **optional}
+        response = self._client._put(self.resources, params=filter_dict_by_key(params))
+        self._client._invalidate(params['path'])
+        return response
+
+    def delete(self, force_async: bool = None, md5_hash: str = None, permanently: bool = False,
+               as_operation: bool = False, **optional):
+        """
+        Delete file or directory by path from Disk or Trash mode
+
+        Typical usage example:
+            disk = YandexDisk()
+            directory = disk.path('path/to/the/directory').delete()
+
+        Args:
+            force_async: Execute asynchronously (True or False).
+            md5_hash: md5 hash of file
+            permanently: Flag of permanently delete
+            as_operation: (optional) Return Operation handle instead of the response tuple
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {**self.params, 'force_async': force_async, 'md5': md5_hash, 'permanently': permanently, **optional, }
+        response = self._client._delete(self.resources, params=filter_dict_by_key(params))
+        self._client._invalidate(self.params['path'])
+        return self._client._operation(response, self.params['path']) if as_operation else response
+
+    def copy_to(self, destination: str, force_async: bool = None, overwrite: bool = None, as_operation: bool = False,
+                **optional):
+        """
+        Copy file or directory to new destination
+
+        Typical usage example:
+            disk = YandexDisk()
+            directory = disk.path('path/to/the/old_directory')
+            directory.copy_to('path/to/the/new_directory_1')
+            directory.copy_to('path/to/the/new_directory_2')  # Nice way to make multiple copies
+
+        Args:
+            destination: Destination path
+            force_async: Execute asynchronously (True or False).
+            overwrite: Flag of overwrite enable
+            as_operation: (optional) Return Operation handle instead of the response tuple
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'from': self.params['path'], 'path': destination, 'fields': self.params['fields'],
+                  'force_async': force_async, 'overwrite': overwrite, **optional, }
+        response = self._client._post(f'{self.resources}/copy', params=filter_dict_by_key(params))
+        self._client._invalidate(destination)
+        return self._client._operation(response, destination) if as_operation else response
+
+    def move_to(self, destination: str, force_async: bool = None, overwrite: bool = None, as_operation: bool = False,
+                **optional):
+        """
+        Move file or directory to new destination
+
+        Typical usage example:
+            disk = YandexDisk()
+            directory = disk.path('path/to/the/old_directory')
+            directory.move_to('path/to/the/new_directory_1')
+
+        Args:
+            destination: Destination path
+            force_async: Execute asynchronously (True or False).
+            overwrite: Flag of overwrite enable
+            as_operation: (optional) Return Operation handle instead of the response tuple
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'from': self.params['path'], 'path': destination, 'fields': self.params['fields'],
+                  'force_async': force_async, 'overwrite': overwrite, **optional, }
+        response = self._client._post(f'{self.resources}/move', params=filter_dict_by_key(params))
+        self._client._invalidate(self.params['path'], destination)
+        return self._client._operation(response, self.params['path'], destination) if as_operation else response
+
+    def iter_dir(self, limit: int = 100, fields: str = FIELDS, prefetch: bool = True, attrs=None, **optional):
+        """
+        Iterate over items of directory from Disk or Trash mode page by page.
+        The next page is requested in the background while the current one is consumed, so only two pages are kept
+        in memory. For objects sorting use YandexDisk.sort() method
+
+        Typical usage example:
+            disk = YandexDisk()
+            for item in disk.path('path/to/the/directory').iter_dir(limit=1000):
+                print(item['path'], item['size'])
+
+        Args:
+            limit: (optional) Page size
+            fields: (optional) Fields projection of items. All fields are returned for fields=None
+            prefetch: (optional) Request the next page in the background
+            attrs: (optional) Attributes of ResourceInfo to request. Fields projection is built from them
+                and items are yielded as ResourceInfo records
+
+        Yields:
+            Dictionaries of directory items or ResourceInfo records if attrs is set
+
+        Raises:
+            requests.exceptions.HTTPError: for error response code of any page
+        """
+        if attrs:
+            fields = fields_for(attrs, '_embedded.items')
+        params = {**self.params, 'fields': fields, **optional}
+        items = self._client._iter_pages(self.resources, filter_dict_by_key(params), '_embedded', limit, prefetch)
+        return map(ResourceInfo.from_dict, items) if attrs else items
+
+    def share(self, **optional):
+        """
+        Share file or directory which set by YandexDisk.path('path/to/the/file')
+
+        Returns:
+            tuple(response code, public url) or tuple(404, None) for any errors cases
+        """
+        response = self._client._put(f'{self.resources}/publish', {'path': self.params.get('path'), **optional, })
+        self._client._invalidate(self.params['path'])
+        if response[0] == 200:
+            public_url = self.get()[1]["public_url"]
+            if self._client.link_cache is not None:
+                self._client.link_cache.set('public_url', self.params.get('path'), public_url)
+            return response[0], public_url
+        return 404, None
+
+    def unshare(self, **optional):
+        """
+        Unshare public file of directory which set by YandexDisk.path('path/to/the/file')
+
+        Returns:
+            tuple(404, None) for any errors cases
+        """
+        params = {'path': self.params.get('path'), **optional, }
+        response = self._client._put(f'{self.resources}/unpublish', params)
+        self._client._invalidate(self.params['path'])
+        try:
+            return response[1]['href']
+        except TypeError:
+            return 404, None
+
+    def public_url(self, **optional):
+        """
+        Get public url of public file of directory which set by YandexDisk.path('path/to/the/file')
+
+        Returns:
+            tuple(response code, public url)  or tuple(404, None) for any errors cases
+        """
+        link_cache = self._client.link_cache if not optional else None
+        if link_cache is not None:
+            public_url = link_cache.get('public_url', self.params.get('path'))
+            if public_url is not None:
+                return public_url
+        try:
+            params = {**self.params, **optional, }
+            public_url = self._client._get_cached(self.resources, filter_dict_by_key(params))[1]['public_url']
+        except KeyError:
+            return 404, None
+        if link_cache is not None:
+            link_cache.set('public_url', self.params.get('path'), public_url)
+        return public_url
+
+    def public_key(self, **optional):
+        """
+        Get public key of public file of directory which set by YandexDisk.path('path/to/the/file')
+
+        Returns:
+            tuple(response code, public key) or tuple(404, None) for any errors cases
+        """
+        try:
+            params = {**self.params, **optional, }
+            return self._client._get_cached(self.resources, filter_dict_by_key(params))[1]['public_key']
+        except KeyError:
+            return 404, None
+
+    def upload(self, filepath, overwrite: bool = False, filename: str = None, chunk_size: int = CHUNK_SIZE,
+               progress=None, skip_if_identical: bool = False, hash_cache=None, **optional):
+        """
+        File upload method. The body is streamed to the upload link by chunks of fixed size, so memory usage
+        does not depend on the file size
+
+        Typical usage example:
+            disk = YandexDisk()
+            response = disk.path('path/to/directory').upload('path/to/the/file.pdf', overwrite=True)
+
+        or from the pipe
+
+            tar = subprocess.Popen(['tar', '-c', 'build'], stdout=subprocess.PIPE)
+            response = disk.path('path/to/directory').upload(tar.stdout, filename='build.tar')
+
+        Args:
+            filepath: Path to the file, file object opened in binary mode or iterable of bytes
+            overwrite: Enable overwriting for uploaded item
+            filename: (optional) Name of the uploaded file. Required for file objects without name and iterables
+            chunk_size: (optional) Size of the body chunk in bytes
+            progress: (optional) Function progress(transferred, total, elapsed) called after every chunk.
+                total is None for the bodies of unknown size
+            skip_if_identical: (optional) Skip the transfer if the remote file has the same size, md5 and sha256.
+                Only for paths to the file
+            hash_cache: (optional) HashCache object with local checksums. Default is YandexDisk.hash_cache
+
+        Returns:
+            tuple(response code, response) or tuple(404, None) for any errors cases.
+            For skipped transfer response is dictionary {'skipped': True, 'path', 'size', 'md5', 'sha256'}
+        """
+        if isinstance(filepath, (str, os.PathLike)):
+            path = f'{self.params["path"]}/{filename or Path(filepath).name}'
+            try:
+                if skip_if_identical:
+                    identical = self._client._identical(filepath, path, hash_cache)
+                    if identical:
+                        return 200, identical
+                with open(filepath, 'rb') as fh:
+                    return self._client._upload_body(fh, path, overwrite, chunk_size, progress, **optional)
+            except FileNotFoundError as e:
+                return 404, str(e)
+        filename = filename or Path(getattr(filepath, 'name', None) or '').name
+        if not filename:
+            raise ValueError('filename is required for file objects without name and iterables')
+        return self._client._upload_body(filepath, f'{self.params["path"]}/{filename}', overwrite, chunk_size,
+                                         progress, **optional)
+
+    def upload_by_url(self, filename: str, url: str, disable_redirects: bool = False, as_operation: bool = False,
+                      **optional):
+        """
+        Upload file from the web by url to the path which set by YandexDisk.path('path/to/the/file')
+
+        Args:
+            filename: name of the file
+            url: url of the file
+            disable_redirects: Disable redirects
+            as_operation: (optional) Return Operation handle instead of the response tuple
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {**self.params, 'path': f'{self.params["path"]}/{filename}', 'url': url,
+                  'disable_redirects': disable_redirects, **optional}
+        response = self._client._post(f'{self.resources}/upload', params=filter_dict_by_key(params))
+        self._client._invalidate(params['path'])
+        return self._client._operation(response, params['path']) if as_operation else response
+
+
+class Resource(ResourceMethods):
+    """Immutable handle of the file or directory of Disk or Trash
+
+    Returned by YandexDisk.path() and YandexDisk.trash(). The handle keeps its own params and sends requests
+    through the transport of the client, so one client may be used by many threads at the same time.
+    Methods fields(), sort(), add_param() and add_params() return new handles.
+
+    Typical usage example:
+        disk = YandexDisk()
+        directory = disk.path('path/to/the/directory').sort('-size')
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda name: directory.create(name), names))
+
+    Attributes:
+        resources: Yandex Disk Rest API resources uri
+        params: Read-only dictionary to send in the query string for the Request
+    """
+
+    __slots__ = ('_client', 'resources', 'params')
+
+    def __init__(self, client, resources: str = RESOURCES_PATH, params: dict = None):
+        """
+        Args:
+            client: YandexDisk object
+            resources: (optional) Yandex Disk Rest API resources uri
+            params: (optional) Dictionary to send in the query string for the Request
+        """
+        object.__setattr__(self, '_client', client)
+        object.__setattr__(self, 'resources', resources)
+        object.__setattr__(self, 'params', MappingProxyType(dict(params or {})))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __repr__(self):
+        mode = 'trash' if self.resources == TRASH_PATH else 'disk'
+        return f'{type(self).__name__}({mode}, {self.params.get("path")!r})'
+
+    def __eq__(self, other):
+        return (isinstance(other, Resource) and self._client is other._client and self.resources == other.resources
+                and self.params == other.params)
+
+    def __hash__(self):
+        return hash((id(self._client), self.resources, tuple(sorted(self.params.items()))))
+
+    def fields(self, fields: str = None):
+        """
+        Get the handle with filter fields of JSON elements
+
+        Args:
+            fields: string with fields names. For example fields = '_embedded.items.name,_embedded.items.size'
+
+        Returns:
+            New Resource object
+        """
+        return self.add_param('fields', fields)
+
+    def sort(self, sort: str = None):
+        """
+        Get the handle with an attribute by which to sort the list of resources
+
+        Args:
+            sort: The attribute by which to sort the list of resources (name, path, created, modified, size)
+
+        Returns:
+            New Resource object
+        """
+        return self.add_param('sort', sort)
+
+    def add_param(self, key, value):
+        """
+        Get the handle with added parameter
+
+        Args:
+            key: The key of parameter
+            value: The value of parameter
+
+        Returns:
+            New Resource object
+        """
+        return self.add_params({key: value})
+
+    def add_params(self, params: dict):
+        """
+        Get the handle with added dictionary of parameters
+
+        Args:
+            params: Dictionary with parameters
+
+        Returns:
+            New Resource object
+        """
+        return Resource(self._client, self.resources, {**self.params, **params})
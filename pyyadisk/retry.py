@@ -0,0 +1,185 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# PUT of Disk is not idempotent: a repeated mkdir, publish or restore fails with 409 or 404
+IDEMPOTENT_METHODS = frozenset(['get', 'head', 'options', 'delete'])
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class RetryPolicy:
+    """Retry policy of idempotent requests
+
+    Requests are retried for connection errors and retry statuses with exponential backoff and jitter.
+    The delay of the server Retry-After header is used when it is longer than the backoff.
+
+    Typical usage example:
+        disk = YandexDisk(token=token, retry=RetryPolicy(total=8, budget={429: 6, 503: 2}))
+
+    Attributes:
+        total: Maximum number of retries of one request
+        backoff: Delay before the first retry in seconds. The delay is doubled for every next retry
+        max_backoff: Maximum delay between retries in seconds
+        jitter: Random part of the delay from 0 to 1
+        statuses: Response codes which are retried
+        methods: HTTP methods which are retried
+        budget: Dictionary {response code: maximum number of retries of one request for this code}
+        respect_retry_after: Wait for Retry-After header delay
+    """
+
+    def __init__(self, total: int = 3, backoff: float = 0.5, max_backoff: float = 60.0, jitter: float = 0.5,
+                 statuses=RETRY_STATUSES, methods=IDEMPOTENT_METHODS, budget: dict = None,
+                 respect_retry_after: bool = True):
+        """
+        Args:
+            total: (optional) Maximum number of retries of one request
+            backoff: (optional) Delay before the first retry in seconds
+            max_backoff: (optional) Maximum delay between retries in seconds
+            jitter: (optional) Random part of the delay from 0 to 1
+            statuses: (optional) Response codes which are retried
+            methods: (optional) HTTP methods which are retried
+            budget: (optional) Dictionary {response code: maximum number of retries of one request for this code}
+            respect_retry_after: (optional) Wait for Retry-After header delay
+        """
+        self.total = total
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.lower() for m in methods)
+        self.budget = budget or {}
+        self.respect_retry_after = respect_retry_after
+
+    def is_retryable(self, method: str) -> bool:
+        return method.lower() in self.methods
+
+    def can_retry(self, attempt: int, status: int = None, counts: dict = None) -> bool:
+        """
+        Check if the request should be retried and count the retry
+
+        Args:
+            attempt: Number of retries already made
+            status: Response code or None for connection error
+            counts: Dictionary {response code: number of retries} of the request. It is updated by the method
+
+        Returns:
+            True if the request should be retried
+        """
+        if attempt >= self.total or (status is not None and status not in self.statuses):
+            return False
+        if counts is not None:
+            if counts.get(status, 0) >= self.budget.get(status, self.total):
+                return False
+            counts[status] = counts.get(status, 0) + 1
+        return True
+
+    def delay(self, attempt: int, retry_after: str = None) -> float:
+        """
+        Get the delay before the retry
+
+        Args:
+            attempt: Number of retries already made
+            retry_after: (optional) Value of Retry-After header
+
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        if self.respect_retry_after:
+            delay = max(delay, parse_retry_after(retry_after) or 0.0)
+        return delay
+
+
+def parse_retry_after(value: str):
+    """
+    Parse Retry-After header with delay in seconds or HTTP date
+
+    Returns:
+        Delay in seconds or None
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter
+
+    Every request takes one token. Tokens are refilled with constant rate up to capacity, so bursts are
+    bounded by capacity and the long-term request rate by rate. One bucket may be shared by many threads
+    and clients, use TokenBucket.shared() to get the bucket by name for all clients of the process.
+
+    Typical usage example:
+        bucket = TokenBucket.shared('yandex-disk', rate=20)
+        disk_1 = YandexDisk(token=token_1, rate_limiter=bucket)
+        disk_2 = YandexDisk(token=token_2, rate_limiter=bucket)
+
+    Attributes:
+        rate: Number of tokens per second
+        capacity: Maximum number of tokens
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Args:
+            rate: Number of tokens per second
+            capacity: (optional) Maximum number of tokens. Default capacity is rate
+        """
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, name: str = 'default', rate: float = 10.0, capacity: float = None):
+        """
+        Get the bucket of the process by name. The bucket is created by the first call
+
+        Args:
+            name: (optional) Name of the bucket
+            rate: (optional) Number of tokens per second for the new bucket
+            capacity: (optional) Maximum number of tokens for the new bucket
+
+        Returns:
+            TokenBucket object
+        """
+        with cls._shared_lock:
+            if name not in cls._shared:
+                cls._shared[name] = cls(rate, capacity)
+            return cls._shared[name]
+
+    def acquire(self, tokens: float = 1.0):
+        """
+        Take tokens and wait until they are available
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = max(self._paused_until - now, (tokens - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """
+        Stop issuing tokens for all users of the bucket, for example after 429 response with Retry-After
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
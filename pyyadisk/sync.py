@@ -0,0 +1,132 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from .config import RESOURCES_PATH, CHUNK_SIZE
+from .hashcache import HashCache
+from .helpers import make_report, normalize_path, relative_path
+
+SYNC_FIELDS = ','.join(f'_embedded.items.{f}' for f in ('name', 'type', 'path', 'size', 'md5', 'sha256'))
+
+
+def sync(disk, local_dir: str, remote_dir: str, delete: bool = False, dry_run: bool = False, workers: int = 4,
+         index: HashCache = None, chunk_size: int = CHUNK_SIZE):
+    """
+    Incremental one-way sync of local directory to Yandex Disk. See YandexDisk.sync()
+
+    Args:
+        disk: YandexDisk object
+        local_dir: Path to the local directory
+        remote_dir: Full path of the destination directory on Yandex Disk
+        delete: (optional) Delete remote files and directories which are not in the local directory
+        dry_run: (optional) Only plan actions without transfers
+        workers: (optional) Number of concurrent transfers and directory listings
+        index: (optional) HashCache object with local checksums. Default index is HashCache()
+        chunk_size: (optional) Size of the body chunk in bytes
+
+    Returns:
+        Dictionary with results and statistics as YandexDisk.upload_tree(). Items which cannot be read,
+        sent or deleted have 'error'. Remote copies of local files which cannot be read are not deleted
+    """
+    started = time.monotonic()
+    remote_dir = normalize_path(remote_dir)
+    base = remote_dir.rstrip('/')
+    index = index or HashCache()
+
+    local_dirs, local_files, errors = [], {}, {}
+    for root, dirs, names in os.walk(local_dir):
+        dirs.sort()
+        relative = Path(root).relative_to(local_dir).as_posix()
+        prefix = '' if relative == '.' else f'{relative}/'
+        local_dirs.extend(f'{prefix}{d}' for d in dirs)
+        for name in names:
+            filepath = os.path.join(root, name)
+            try:
+                local_files[f'{prefix}{name}'] = (filepath, os.stat(filepath))
+            except OSError as e:
+                errors[f'{prefix}{name}'] = (filepath, repr(e))
+
+    remote_dirs, remote_files = set(), {}
+    status, _ = disk._get(RESOURCES_PATH, params={'path': remote_dir, 'fields': 'type'})
+    if status == 200:
+        for _, dirs, files in disk.walk(remote_dir, workers=workers, fields=SYNC_FIELDS):
+            remote_dirs.update(relative_path(d['path'], remote_dir) for d in dirs)
+            remote_files.update((relative_path(f['path'], remote_dir), f) for f in files)
+        # The root itself and items outside of it are never compared or deleted
+        remote_dirs.discard(None)
+        remote_files.pop(None, None)
+
+    def compare(relative: str):
+        filepath, st = local_files[relative]
+        remote = remote_files.get(relative)
+        if remote is None:
+            return 'new'
+        # A file without checksums on Disk is uploaded again, sha256 is compared when Disk has it
+        if remote.get('size') != st.st_size or not (remote.get('sha256') or remote.get('md5')):
+            return 'changed'
+        try:
+            md5, sha256 = index.checksums(filepath, st, chunk_size)
+        except OSError as e:
+            errors[relative] = (filepath, repr(e))
+            return None
+        if remote.get('sha256'):
+            return 'changed' if remote['sha256'] != sha256 else None
+        return 'changed' if remote['md5'] != md5 else None
+
+    disk._ensure_pool_size(workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        reasons = dict(zip(local_files, executor.map(compare, local_files)))
+    plan = [{'action': 'create', 'remote': remote_dir, 'reason': 'new', 'status': None}] if status == 404 else []
+    plan.extend({'action': 'create', 'remote': f'{base}/{d}', 'reason': 'new', 'status': None}
+                for d in local_dirs if d not in remote_dirs)
+    plan.extend({'action': 'upload', 'local': local_files[r][0], 'remote': f'{base}/{r}', 'reason': reason,
+                 'status': None, 'bytes': local_files[r][1].st_size}
+                for r, reason in sorted(reasons.items()) if reason)
+    plan.extend({'action': 'upload', 'local': filepath, 'remote': f'{base}/{r}', 'reason': 'unreadable',
+                 'status': None, 'bytes': 0, 'error': error}
+                for r, (filepath, error) in sorted(errors.items()))
+    if delete:
+        orphans = sorted(d for d in remote_dirs if d not in local_dirs)
+        orphans = [d for d in orphans if not any(d.startswith(f'{o}/') for o in orphans)]
+        orphans.extend(f for f in remote_files if f not in local_files and f not in errors
+                       and not any(f.startswith(f'{o}/') for o in orphans))
+        plan.extend({'action': 'delete', 'remote': f'{base}/{r}', 'reason': 'orphan', 'status': None}
+                    for r in sorted(orphans))
+    skipped = sum(1 for r, reason in reasons.items() if not reason and r not in errors)
+    if dry_run:
+        report = make_report(plan, started)
+        report['stats']['skipped'] = skipped
+        return report
+
+    def execute(item: dict):
+        item_started = time.monotonic()
+        try:
+            if item['action'] == 'upload':
+                with open(item['local'], 'rb') as fh:
+                    item['status'], _ = disk._upload_body(fh, item['remote'], True, chunk_size, None)
+            elif item['action'] == 'create':
+                if item['remote'] == remote_dir:
+                    item['status'], _ = disk._make_dirs(item['remote'])
+                else:
+                    item['status'], _ = disk._put(RESOURCES_PATH, params={'path': item['remote']})
+                disk._invalidate(item['remote'])
+            else:
+                item['status'], _ = disk._delete(RESOURCES_PATH, params={'path': item['remote']})
+                disk._invalidate(item['remote'])
+        except (requests.exceptions.RequestException, OSError) as e:
+            item['error'] = repr(e)
+        item['seconds'] = time.monotonic() - item_started
+        return item
+
+    # Directories are created one by one in parent-first order before the transfers
+    for item in plan:
+        if item['action'] == 'create':
+            execute(item)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(execute, [item for item in plan if item['action'] != 'create' and 'error' not in item]))
+    report = make_report(plan, started, sum(i.get('bytes', 0) for i in plan if i['action'] == 'upload'))
+    report['stats']['skipped'] = skipped
+    return report
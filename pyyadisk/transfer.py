@@ -0,0 +1,162 @@
+import hashlib
+import os
+import stat
+import time
+
+from .config import CHUNK_SIZE
+
+
+class ProgressReader:
+    """File-like body for streaming uploads
+
+    Wraps a file object or an iterable of bytes and hands the body out in chunks of fixed size, so only one chunk
+    is kept in memory at a time. requests sends the body with Content-Length when the size is known and with
+    chunked transfer encoding otherwise.
+
+    Attributes:
+        len: Total size of the body in bytes or None for unknown size (pipes, generators)
+        chunk_size: Size of one chunk in bytes
+        transferred: Number of bytes handed out so far
+        callback: (optional) Function callback(transferred, total, elapsed) called after every chunk
+    """
+
+    def __init__(self, source, total: int = None, chunk_size: int = CHUNK_SIZE, callback=None):
+        """
+        Args:
+            source: File object opened in binary mode or iterable of bytes
+            total: (optional) Total size of the body in bytes
+            chunk_size: (optional) Size of one chunk in bytes
+            callback: (optional) Function callback(transferred, total, elapsed) called after every chunk
+        """
+        self.len = total
+        self.chunk_size = chunk_size
+        self.transferred = 0
+        self.callback = callback
+        self._started = time.monotonic()
+        if hasattr(source, 'read'):
+            self._fileobj = source
+            self._iterator = None
+        else:
+            self._fileobj = None
+            self._iterator = iter(source)
+        self._buffer = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read next chunk of the body. Chunks are always served by chunk_size blocks
+
+        Returns:
+            Bytes of the chunk or b'' at the end of the body
+        """
+        if self._fileobj is not None:
+            chunk = self._fileobj.read(self.chunk_size)
+        else:
+            chunk = self._read_iterator()
+        if chunk:
+            self.transferred += len(chunk)
+            if self.callback:
+                self.callback(self.transferred, self.len, time.monotonic() - self._started)
+        return chunk
+
+    def __iter__(self):
+        while True:
+            chunk = self.read()
+            if not chunk:
+                break
+            yield chunk
+
+    def _read_iterator(self) -> bytes:
+        while len(self._buffer) < self.chunk_size:
+            try:
+                self._buffer += next(self._iterator)
+            except StopIteration:
+                break
+        chunk = bytes(self._buffer[:self.chunk_size])
+        del self._buffer[:self.chunk_size]
+        return chunk
+
+
+def body_size(fileobj):
+    """
+    Get the number of bytes left in a regular file object
+
+    Args:
+        fileobj: File object
+
+    Returns:
+        Size in bytes or None for pipes, sockets and objects without file descriptor
+    """
+    try:
+        st = os.fstat(fileobj.fileno())
+    except (AttributeError, OSError, ValueError):
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    try:
+        return max(0, st.st_size - fileobj.tell())
+    except (AttributeError, OSError, ValueError):
+        return st.st_size
+
+
+class Checksums:
+    """md5 and sha256 of a body computed on the fly while it is transferred
+
+    Attributes:
+        size: Number of hashed bytes
+    """
+
+    def __init__(self):
+        self.size = 0
+        self._md5 = hashlib.md5()
+        self._sha256 = hashlib.sha256()
+
+    def update(self, chunk: bytes):
+        self.size += len(chunk)
+        self._md5.update(chunk)
+        self._sha256.update(chunk)
+
+    def update_from(self, fileobj, chunk_size: int = CHUNK_SIZE):
+        """
+        Hash the rest of file object by chunks
+
+        Args:
+            fileobj: File object opened for reading in binary mode
+            chunk_size: (optional) Size of the chunk in bytes
+        """
+        for chunk in iter(lambda: fileobj.read(chunk_size), b''):
+            self.update(chunk)
+
+    @property
+    def md5(self) -> str:
+        return self._md5.hexdigest()
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+    def mismatches(self, meta: dict) -> list:
+        """
+        Compare checksums with resource metadata
+
+        Args:
+            meta: Resource metadata with optional 'size', 'md5' and 'sha256' keys
+
+        Returns:
+            List of names of mismatched keys, empty list when everything is matched
+        """
+        actual = {'size': self.size, 'md5': self.md5, 'sha256': self.sha256}
+        return [k for k, v in actual.items() if meta.get(k) is not None and meta[k] != v]
+
+
+def segment_ranges(size: int, segment_size: int) -> list:
+    """
+    Split the body into inclusive byte ranges for HTTP Range requests
+
+    Args:
+        size: Size of the body in bytes
+        segment_size: Size of one segment in bytes
+
+    Returns:
+        List of tuples (first byte, last byte)
+    """
+    return [(start, min(start + segment_size, size) - 1) for start in range(0, size, segment_size)]
@@ -0,0 +1,294 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import API_ORIGIN
+
+try:
+    import httpx
+except ImportError:  # httpx is an optional dependency
+    httpx = None
+
+DEFAULT_TIMEOUT = (10.0, 60.0)
+
+
+class Transport:
+    """Interface of HTTP transport of YandexDisk client
+
+    Transport sends requests and returns responses with the subset of requests.Response interface used by the client:
+    status_code, headers, content, iter_content(), close(), request.body and context manager protocol.
+    Connection errors and timeouts are raised as requests.exceptions.RequestException, so retries and reports
+    of the client work for any transport. Transport is shared by all threads of the client.
+
+    Attributes:
+        pool_size: Number of connections kept open to one host
+        base_url: (optional) Origin like 'http://127.0.0.1:8080' which replaces https://cloud-api.yandex.net
+            in urls of API requests. Download and upload links are not changed
+    """
+
+    pool_size = 0
+    base_url = None
+
+    def request(self, method: str, url: str, headers: dict = None, params: dict = None, data=None,
+                files: dict = None, stream: bool = False):
+        """
+        Send request
+
+        Args:
+            method: HTTP method in lower case
+            url: Url of the request
+            headers: (optional) Dictionary with headers
+            params: (optional) Dictionary with query params
+            data: (optional) Body of the request: bytes, str, dictionary of form fields or ProgressReader
+            files: (optional) Dictionary with files of multipart body
+            stream: (optional) Do not read the body of the response before returning
+
+        Returns:
+            Response object
+        """
+        raise NotImplementedError
+
+    def ensure_pool_size(self, size: int):
+        """
+        Grow the connection pool so that every worker of a thread pool gets its own connection
+
+        Args:
+            size: Number of connections
+        """
+
+    def close(self):
+        """
+        Close all connections
+        """
+
+    def _url(self, url: str) -> str:
+        if self.base_url and url.startswith(API_ORIGIN):
+            return self.base_url.rstrip('/') + url[len(API_ORIGIN):]
+        return url
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RequestsTransport(Transport):
+    """Default transport over requests.Session with HTTP/1.1 keep-alive connection pools
+
+    Typical usage example:
+        transport = RequestsTransport(pool_size=32, timeout=(5, 120))
+        disk = YandexDisk(token=token, transport=transport)
+
+    Attributes:
+        session: Object of requests.Session()
+        adapter: HTTPAdapter mounted for http and https
+        pool_size: Number of connections kept open to one host
+        max_retries: Number of connection retries of urllib3. Read errors and response codes are not retried
+        timeout: Tuple(connect timeout, read timeout) in seconds. Read timeout limits waiting for every chunk
+            of the response, not the whole transfer
+        verify: Flag of connection ssl verification check
+        proxies: Dictionary with proxy addresses for http and https or None
+        base_url: Origin which replaces https://cloud-api.yandex.net in urls of API requests or None
+    """
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 5, timeout=DEFAULT_TIMEOUT, keep_alive: bool = True,
+                 verify: bool = True, proxies: dict = None, base_url: str = None):
+        """
+        Args:
+            pool_size: (optional) Number of connections kept open to one host
+            max_retries: (optional) Number of connection retries of urllib3
+            timeout: (optional) Tuple(connect timeout, read timeout) or one timeout for both in seconds.
+                Requests wait forever for None
+            keep_alive: (optional) Keep connections open between requests. 'Connection: close' is sent for False
+            verify: (optional) Flag of connection ssl verification check
+            proxies: (optional) Dictionary with proxy addresses for http and https
+            base_url: (optional) Origin like 'http://127.0.0.1:8080' which replaces https://cloud-api.yandex.net
+        """
+        self.session = requests.Session()
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.verify = verify
+        self.proxies = proxies
+        self.base_url = base_url
+        self.adapter = None
+        self._lock = threading.Lock()
+        self._mount_adapter(pool_size)
+
+    def _mount_adapter(self, pool_size: int):
+        previous = self.adapter
+        self.pool_size = pool_size
+        # Only connection errors are retried by urllib3. Read errors may come after the body is sent and
+        # response codes are retried by YandexDisk.retry
+        max_retries = Retry(total=self.max_retries, read=False, status=0, respect_retry_after_header=False)
+        self.adapter = HTTPAdapter(max_retries=max_retries, pool_maxsize=pool_size)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        if previous is not None:
+            # Idle connections are closed now, connections of requests in progress are closed when released
+            previous.close()
+
+    def request(self, method: str, url: str, headers: dict = None, params: dict = None, data=None,
+                files: dict = None, stream: bool = False):
+        return self.session.request(method, self._url(url), headers=headers, params=params, data=data, files=files,
+                                    stream=stream, timeout=self.timeout, verify=self.verify, proxies=self.proxies)
+
+    def ensure_pool_size(self, size: int):
+        with self._lock:
+            if size > self.pool_size:
+                self._mount_adapter(size)
+
+    def close(self):
+        self.session.close()
+
+
+class HTTP2Transport(Transport):
+    """Transport over httpx.Client with HTTP/2
+
+    Concurrent requests of all threads to one host are multiplexed as streams of one connection, so metadata calls
+    do not wait for free connections and do not pay TCP and TLS handshakes. Hosts without HTTP/2 support are served
+    over HTTP/1.1 connections of the same pool. Requires httpx with HTTP/2 support: pip install pyyadisk[http2]
+
+    Typical usage example:
+        disk = YandexDisk(token=token, transport=HTTP2Transport())
+        for _, dirs, files in disk.walk('photos', workers=32):
+            ...
+
+    Attributes:
+        client: Object of httpx.Client()
+        pool_size: Maximum number of connections, HTTP/2 connection to one host is shared by all requests
+        max_retries: Number of connection retries of httpx
+        timeout: Tuple(connect timeout, read timeout) in seconds
+        verify: Flag of connection ssl verification check
+        proxy: Proxy address or None
+        base_url: Origin which replaces https://cloud-api.yandex.net in urls of API requests or None
+    """
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 5, timeout=DEFAULT_TIMEOUT, keep_alive: bool = True,
+                 verify: bool = True, proxy: str = None, base_url: str = None):
+        """
+        Args:
+            pool_size: (optional) Maximum number of connections
+            max_retries: (optional) Number of connection retries of httpx
+            timeout: (optional) Tuple(connect timeout, read timeout) or one timeout for both in seconds.
+                Requests wait forever for None
+            keep_alive: (optional) Keep connections open between requests
+            verify: (optional) Flag of connection ssl verification check
+            proxy: (optional) Proxy address for http and https
+            base_url: (optional) Origin like 'http://127.0.0.1:8080' which replaces https://cloud-api.yandex.net
+
+        Raises:
+            ImportError: if httpx is not installed
+        """
+        if httpx is None:
+            raise ImportError('HTTP2Transport requires httpx with HTTP/2 support: pip install pyyadisk[http2]')
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.verify = verify
+        self.proxy = proxy
+        self.base_url = base_url
+        self.client = None
+        self._make_client(pool_size)
+
+    def _make_client(self, pool_size: int):
+        self.pool_size = pool_size
+        if isinstance(self.timeout, tuple):
+            timeout = httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+        else:
+            timeout = httpx.Timeout(self.timeout)
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size if self.keep_alive else 0)
+        optional = {'proxy': httpx.Proxy(self.proxy)} if self.proxy else {}
+        transport = httpx.HTTPTransport(verify=self.verify, http2=True, limits=limits, retries=self.max_retries,
+                                        **optional)
+        # Download links of Disk answer with 302 redirect, requests follows redirects by default and httpx does not
+        self.client = httpx.Client(transport=transport, timeout=timeout, follow_redirects=True)
+
+    def request(self, method: str, url: str, headers: dict = None, params: dict = None, data=None,
+                files: dict = None, stream: bool = False):
+        headers = dict(headers or {})
+        body = {}
+        if isinstance(data, dict):
+            body['data'] = data
+        elif isinstance(data, (bytes, str)):
+            body['content'] = data
+        elif data is not None:
+            if getattr(data, 'len', None) is not None:
+                headers['Content-Length'] = str(data.len)
+            body['content'] = iter(data)
+        if files is not None:
+            body['files'] = files
+        if params:
+            # requests drops params with None value, httpx sends them empty
+            params = {k: v for k, v in params.items() if v is not None}
+        client = self.client
+        try:
+            request = client.build_request(method.upper(), self._url(url), headers=headers, params=params, **body)
+            response = client.send(request, stream=stream)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        return HTTP2Response(response, data)
+
+    def ensure_pool_size(self, size: int):
+        # Requests of all threads are multiplexed over one HTTP/2 connection, the pool is sized at construction
+        pass
+
+    def close(self):
+        self.client.close()
+
+
+class HTTP2Response:
+    """Adapter of httpx.Response to the subset of requests.Response interface used by YandexDisk client
+
+    Attributes:
+        status_code: Response code
+        headers: Case-insensitive dictionary with headers
+        request: Object with body attribute of the sent request
+        http_version: 'HTTP/2' or 'HTTP/1.1'
+    """
+
+    def __init__(self, response, body=None):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.http_version = response.http_version
+        self.request = _SentRequest(body)
+
+    @property
+    def content(self) -> bytes:
+        try:
+            return self._response.read()
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def iter_content(self, chunk_size: int = 1):
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class _SentRequest:
+    __slots__ = ('body', )
+
+    def __init__(self, body):
+        self.body = body
@@ -0,0 +1,94 @@
+import time
+from datetime import datetime, timezone
+
+from .batch import run_batch
+from .helpers import normalize_path
+
+SCAN_ATTRS = ('name', 'path', 'type', 'size', 'deleted', 'origin_path')
+
+
+def parse_date(value) -> datetime:
+    """
+    Parse ISO 8601 date of Yandex Disk API. Naive dates are taken as UTC
+
+    Args:
+        value: datetime object or ISO 8601 string
+
+    Returns:
+        Timezone aware datetime object
+    """
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def deleted_before(when):
+    """
+    Make predicate of Trash items deleted before the date
+
+    Typical usage example:
+        disk.purge_where(deleted_before(datetime.now(timezone.utc) - timedelta(days=30)))
+
+    Args:
+        when: datetime object or ISO 8601 string
+
+    Returns:
+        Function predicate(ResourceInfo) -> bool
+    """
+    when = parse_date(when)
+    return lambda item: item.deleted is not None and parse_date(item.deleted) < when
+
+
+def origin_under(path: str):
+    """
+    Make predicate of Trash items deleted from the directory or its subdirectories
+
+    Typical usage example:
+        disk.restore_where(origin_under('photos/2021'))
+
+    Args:
+        path: Path of the directory on Disk
+
+    Returns:
+        Function predicate(ResourceInfo) -> bool
+    """
+    path = normalize_path(path)
+    prefix = '/' if path == '/' else f'{path}/'
+
+    def predicate(item) -> bool:
+        origin = normalize_path(item.origin_path or '')
+        return origin == path or origin.startswith(prefix)
+    return predicate
+
+
+def run_where(disk, predicate, call, workers: int = 8, timeout: float = None, limit: int = 1000):
+    """
+    Scan Trash and run the mutation for every matching item concurrently. See YandexDisk.restore_where()
+
+    The whole Trash is scanned before the first mutation, because restored and deleted items shift offsets
+    of the following pages.
+
+    Args:
+        disk: YandexDisk object
+        predicate: Function predicate(ResourceInfo) -> bool
+        call: Function call(item) -> Operation for result dictionary with 'path' and 'origin_path' keys
+        workers: (optional) Number of requests sent at the same time
+        timeout: (optional) Maximum time to wait for asynchronous operations in seconds
+        limit: (optional) Page size of the scan
+
+    Returns:
+        Dictionary with results and statistics as YandexDisk.batch_move() and 'scanned', 'matched',
+        'scan_seconds' statistics
+    """
+    started = time.monotonic()
+    scanned, items = 0, []
+    for info in disk.scan_trash(limit=limit):
+        scanned += 1
+        if predicate(info):
+            items.append({'path': info.path, 'origin_path': info.origin_path, 'size': info.size})
+    scan_seconds = time.monotonic() - started
+    report = run_batch(disk, items, call, workers, timeout)
+    seconds = time.monotonic() - started
+    report['stats'].update({'scanned': scanned, 'matched': len(items), 'scan_seconds': scan_seconds,
+                            'seconds': seconds, 'items_per_second': len(items) / seconds if seconds else 0.0})
+    return report
@@ -1,13 +1,33 @@
-import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 import requests
 
-from .config import URI, RESOURCES_PATH, TRASH_PATH, OPERATIONS_PATH
-from .helpers import filter_dict_by_key
+from .batch import run_batch, run_levels
+from .cache import LinkCache, MetadataCache
+from .changes import CHANGE_ATTRS, ChangeFeed
+from .config import URI, RESOURCES_PATH, TRASH_PATH, OPERATIONS_PATH, CHUNK_SIZE, FIELDS, FIELDS_FILES
+from .hashcache import HashCache
+from .helpers import filter_dict_by_key, is_success, json_loads, make_report, normalize_path, parent_paths
+from .metrics import RequestEvent, RequestHooks, body_length
+from .models import ResourceInfo, fields_for
+from .operation import Operation, OperationPoller
+from .public import PublicResource
+from .resource import Resource, ResourceMethods
+from .retry import RetryPolicy, TokenBucket, parse_retry_after
+from .sync import sync
+from .transport import DEFAULT_TIMEOUT, RequestsTransport, Transport
+from .trash import SCAN_ATTRS, run_where
+from .transfer import ProgressReader, body_size
 
 
-class YandexDisk:
+DEFAULT_RETRY = RetryPolicy()
+
+
+class YandexDisk(ResourceMethods):
     """Yandex Disk Rest API V1 wrapper
 
     Python realisation of Yandex Disk Rest API V1 wrapper:
@@ -25,6 +45,9 @@ class YandexDisk:
     - Get last uploaded files
     - Upload file
     - Upload file by url
+    Public resources:
+    - Get metadata and list public directory
+    - Download public file or directory tree
     Trash:
     - Empty
     - Delete files
@@ -33,46 +56,97 @@ class YandexDisk:
 
     Attributes:
         token: Oauth token (get it at https://yandex.ru/dev/disk/poligon/)
-        headers: Dictionary with headers ('Authorization', 'Accept')
+        headers: Dictionary with headers ('Authorization' if the token is set, 'Accept')
         proxies: (optional) Dictionary with proxy addresses for http and https
-        session: Object of requests.Session()
+        transport: Transport object which sends all requests of the client
+        session: Object of requests.Session() of the default transport or None for other transports
+        pool_size: Number of connections kept open to one host
+        cache: MetadataCache object or None for disabled cache
+        link_cache: LinkCache object of download links, upload links and public urls or None for disabled cache
+        poller: OperationPoller object which tracks Operation handles
+        retry: RetryPolicy object or None
+        rate_limiter: TokenBucket object or None
+        hooks: List of RequestHooks objects called for every request attempt
+        json_loads: Function which decodes JSON responses
+        hash_cache: HashCache object with local checksums for skip_if_identical uploads.
+            Default HashCache() is created by the first use
         ssl_verify: (optional) Flag of connection ssl verification check
         uri: Yandex Disk Rest API endpoint uri
         resources: Yandex Disk Rest API resources uri
-        params: Dictionary to send in the query string for the Request
+        params: Dictionary with default params of the client and handles made by path() and trash()
     """
 
-    def __init__(self, token: str = None, proxy: str = None, ssl_verify: bool = True, max_retries: int = 5):
+    def __init__(self, token: str = None, proxy: str = None, ssl_verify: bool = True, max_retries: int = 5,
+                 pool_size: int = 10, cache_ttl: float = None, cache_size: int = 1024,
+                 retry: RetryPolicy = DEFAULT_RETRY, rate_limiter: TokenBucket = None, hooks: list = None,
+                 json_loads=json_loads, link_ttl: float = None, timeout=DEFAULT_TIMEOUT, transport: Transport = None):
         """
         Initialization of YandexDisk REST API V1 wrapper class
 
         Args:
-            token: Oauth token (get it at https://yandex.ru/dev/disk/poligon/)
+            token: Oauth token (get it at https://yandex.ru/dev/disk/poligon/). Public resources are available
+                without token
             proxy: (optional) Proxy address for http and https
             ssl_verify: (optional) Flag of connection ssl verification check
             max_retries: (optional) Number of maximum connection retries
+            pool_size: (optional) Number of connections kept open to one host
+            cache_ttl: (optional) Time to live of metadata cache entries in seconds. Cache is disabled for None
+            cache_size: (optional) Maximum number of metadata cache entries
+            retry: (optional) RetryPolicy of idempotent requests for connection errors, 429 and 5xx responses.
+                Requests are not retried for None
+            rate_limiter: (optional) TokenBucket shared by all requests of the client
+            hooks: (optional) List of RequestHooks objects, for example MetricsCollector
+            json_loads: (optional) Function which decodes JSON responses from bytes. Default is orjson.loads
+                if orjson is installed and json.loads otherwise
+            link_ttl: (optional) Time to live of cached download links, upload links and public urls in seconds.
+                Links are not cached for None
+            timeout: (optional) Tuple(connect timeout, read timeout) or one timeout for both in seconds.
+                Requests wait forever for None
+            transport: (optional) Transport object, for example HTTP2Transport(). Default is RequestsTransport
+                with pool_size, max_retries, timeout, proxy and ssl_verify of the client. These params are not
+                used for the passed transport
         """
         self.token = token
-        self.headers = {'Authorization': 'OAuth {}'.format(self.token), 'Accept': 'application/json'}
+        self.headers = {'Accept': 'application/json'}
+        if self.token is not None:
+            self.headers['Authorization'] = 'OAuth {}'.format(self.token)
 
         if proxy:
             self.proxies = {'http': proxy, 'https': proxy, }
         else:
             self.proxies = None
-        self.session = requests.Session()
-        self.session_adapter = requests.adapters.HTTPAdapter(max_retries=max_retries)
-        self.session.mount('http://', self.session_adapter)
-        self.session.mount('https://', self.session_adapter)
+        self.max_retries = max_retries
         self.ssl_verify = ssl_verify
+        if transport is None:
+            transport = RequestsTransport(pool_size=pool_size, max_retries=max_retries, timeout=timeout,
+                                          verify=ssl_verify, proxies=self.proxies)
+        self.transport = transport
+        self.session = getattr(transport, 'session', None)
+        self.cache = MetadataCache(ttl=cache_ttl, maxsize=cache_size) if cache_ttl else None
+        self.link_cache = LinkCache(ttl=link_ttl) if link_ttl else None
+        self.poller = OperationPoller(self)
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.hooks = list(hooks or [])
+        self.json_loads = json_loads
+        self.hash_cache = None
 
         self.uri = URI
         self.resources = RESOURCES_PATH
 
         self.params = {'path': None, 'fields': None, 'sort': None, 'limit': None, 'offset': None}
 
+    @property
+    def _client(self):
+        return self
+
+    @property
+    def pool_size(self) -> int:
+        return self.transport.pool_size
+
     def trash(self, path: str = None):
         """
-        Enter to the Trash mode.
+        Get the handle of Trash resource. The client is not changed, so it may be shared by many threads
 
         Typical usage example:
             disk = YandexDisk()
@@ -82,39 +156,27 @@ class YandexDisk:
             path: The full path to the resource in the Trash (file or directory). Get the root with path = '/' or None
 
         Returns:
-            Self YandexDisk object
+            Resource object
         """
-        self.resources = TRASH_PATH
-        self.params['path'] = path
-        return self
+        return Resource(self, TRASH_PATH, {**self.params, 'path': path})
 
-    def restore(self, name: str = None, force_async: bool = None, overwrite: bool = False, **optional):
+    def public(self, public_key: str, path: str = None):
         """
-        Restore trash items
+        Get the handle of public file or directory published by anyone
 
         Typical usage example:
             disk = YandexDisk()
-            trash_ = disk.trash('path/to/the/file.pdf')
-            response = trash_.restore()
+            shared = disk.public('https://yadi.sk/d/abcdef')
+            status, info = shared.child('docs/report.pdf').download('/home/user/report.pdf')
 
         Args:
-            name: The name under which the resource will be restored.
-            force_async: Execute asynchronously (True or False).
-            overwrite: Overwrite the existing resource with the restored one  (True or False).
+            public_key: Public key or public url of the resource
+            path: (optional) Path of the file or directory inside the public directory
 
         Returns:
-            Tuple with Response code and dictionary from JSON:
-            (Response code, JSON Response dict or None for error)
-
-            JSON Response dict:
-                {
-                  "href": "string",
-                  "method": "string",
-                  "templated": true
-                }
+            PublicResource object
         """
-        params = {**self.params, 'name': name, 'force_async': force_async, 'overwrite': overwrite, **optional, }
-        return self._put(f'{self.resources}/restore', params=filter_dict_by_key(params))
+        return PublicResource(self, public_key, path)
 
     def operations(self, operation_id: str):
         """
@@ -141,7 +203,7 @@ class YandexDisk:
 
     def path(self, path: str = None):
         """
-        Enter to the Disk mode
+        Get the handle of Disk resource. The client is not changed, so it may be shared by many threads
 
         Typical usage example:
             disk = YandexDisk()
@@ -151,20 +213,19 @@ class YandexDisk:
             path: The full path of the Disk resource (file or directory)
 
         Returns:
-            Self YandexDisk object
+            Resource object
         """
-        self.resources = RESOURCES_PATH
-        self.params['path'] = path
-        return self
+        return Resource(self, RESOURCES_PATH, {**self.params, 'path': path})
 
     def fields(self, fields: str = None):
         """
-        Add filter fields of JSON elements.
+        Add default filter fields of JSON elements for the client and handles made after the call.
+        Use Resource.fields() to set fields of one handle
 
         Typical usage example:
             disk = YandexDisk()
-            path_ = disk.path('path/to/the/file.pdf')
-            path_.fields(fields='_embedded.items.name,_embedded.items.size')
+            disk.fields(fields='_embedded.items.name,_embedded.items.size')
+            path_ = disk.path('path/to/the/directory')
 
         Args:
             fields: string with fields names. For example fields = '_embedded.items.name,_embedded.items.size'
@@ -177,7 +238,8 @@ class YandexDisk:
 
     def sort(self, sort: str = None):
         """
-        Set an attribute by which to sort the list of resources:
+        Set default attribute by which to sort the list of resources for the client and handles made after
+        the call. Use Resource.sort() to set sorting of one handle:
         - name
         - path
         - created
@@ -186,8 +248,7 @@ class YandexDisk:
 
         Typical usage example:
             disk = YandexDisk()
-            path_ = disk.path('path/to/the/file.pdf')
-            path_.sort(sort='name')
+            files = disk.sort(sort='name').list_files()
 
         Args:
             sort: The attribute by which to sort the list of resources
@@ -233,260 +294,659 @@ class YandexDisk:
         self.params.update(params)
         return self
 
-    def get(self, limit: int = None, offset: int = None, **optional):
+    def last_uploaded(self, limit: int = None, media_type: str = None, preview_crop: bool = None,
+                      preview_size: str = None):
         """
-        Get metadata of file or directory from Disk or Trash mode. For objects sorting use YandexDisk.sort() method
+        Get list of last uploaded files
 
-        Typical usage example:
-            disk = YandexDisk()
-            info = disk.path('path/to/the/file').get()
+        Args:
+            limit: The number of items to return
+            media_type: Filter by media type
+            preview_crop: Enable crop preview
+            preview_size: Size of preview
+
+        Returns:
+            Tuple with Response code and dictionary from JSON:
+            (Response code, JSON Response dict or None for error)
+        """
+        params = {'limit': limit, 'media_type': media_type, 'preview_crop': preview_crop,
+                  'preview_size': preview_size, }
+        return self._get(f'{RESOURCES_PATH}/last-uploaded', params=filter_dict_by_key(params))
+
+    def list_files(self, limit: int = None, offset: int = None, media_type: str = None, preview_crop: bool = None,
+                   preview_size: str = None):
+        """
+        Get list of files. For objects sorting use YandexDisk.sort() method
 
         Args:
             limit: The number of items to return
             offset: Offset from the beginning
+            media_type: Filter by media type
+            preview_crop: Enable crop preview
+            preview_size: Size of preview
 
         Returns:
             Tuple with Response code and dictionary from JSON:
             (Response code, JSON Response dict or None for error)
         """
-        params = {**self.params, 'limit': limit, 'offset': offset, **optional, }
-        return self._get(self.resources, params=filter_dict_by_key(params))
+        params = {'limit': limit, 'offset': offset, 'media_type': media_type, 'preview_crop': preview_crop,
+                  'preview_size': preview_size, 'sort': self.params['sort'], 'fields': self.params['fields'], }
+        return self._get(f'{RESOURCES_PATH}/files', params=filter_dict_by_key(params))
 
-    def create(self, subdir: str = None, **optional):
+    def iter_files(self, limit: int = 100, media_type: str = None, fields: str = FIELDS_FILES, prefetch: bool = True,
+                   attrs=None, **optional):
         """
-        Make directory or subdirectory by the path
+        Iterate over all files of Disk page by page. See YandexDisk.iter_dir()
 
         Typical usage example:
             disk = YandexDisk()
-            dir_ = disk.path('path/to/the/directory').create()  # create the directory by the path
-            dir_ = disk.path('path/to/the/directory').create('subdirectory')  # create the subdirectory in the directory
+            for item in disk.sort('-modified').iter_files(media_type='image'):
+                print(item['path'])
+
+        Args:
+            limit: (optional) Page size
+            media_type: (optional) Filter by media type
+            fields: (optional) Fields projection of items. All fields are returned for fields=None
+            prefetch: (optional) Request the next page in the background
+            attrs: (optional) Attributes of ResourceInfo to request. Items are yielded as ResourceInfo records
+
+        Yields:
+            Dictionaries of files or ResourceInfo records if attrs is set
+
+        Raises:
+            requests.exceptions.HTTPError: for error response code of any page
+        """
+        if attrs:
+            fields = fields_for(attrs, 'items')
+        params = {'media_type': media_type, 'sort': self.params['sort'], 'fields': fields, **optional}
+        items = self._iter_pages(f'{RESOURCES_PATH}/files', filter_dict_by_key(params), None, limit, prefetch)
+        return map(ResourceInfo.from_dict, items) if attrs else items
+
+    def iter_trash(self, path: str = '/', limit: int = 100, fields: str = FIELDS, prefetch: bool = True,
+                   attrs=None, **optional):
+        """
+        Iterate over items of Trash page by page. See YandexDisk.iter_dir()
 
-        or
+        Args:
+            path: (optional) The full path of the directory in Trash
+            limit: (optional) Page size
+            fields: (optional) Fields projection of items. All fields are returned for fields=None
+            prefetch: (optional) Request the next page in the background
+            attrs: (optional) Attributes of ResourceInfo to request. Items are yielded as ResourceInfo records
 
+        Yields:
+            Dictionaries of Trash items or ResourceInfo records if attrs is set
+
+        Raises:
+            requests.exceptions.HTTPError: for error response code of any page
+        """
+        if attrs:
+            fields = fields_for(attrs, '_embedded.items')
+        params = {'path': path, 'sort': self.params['sort'], 'fields': fields, **optional}
+        items = self._iter_pages(TRASH_PATH, filter_dict_by_key(params), '_embedded', limit, prefetch)
+        return map(ResourceInfo.from_dict, items) if attrs else items
+
+    def scan_trash(self, path: str = '/', limit: int = 1000, attrs=SCAN_ATTRS, prefetch: bool = True):
+        """
+        Stream items of Trash page by page with minimal fields projection
+
+        Typical usage example:
             disk = YandexDisk()
-            directory = disk.path('path/to/the/directory')
-            subdir_list = ['sub_1', 'sub_2', 'sub_3', 'sub_4', ]
-            for s in subdir_list:
-                directory.create(s)
+            for item in disk.scan_trash():
+                print(item.origin_path, item.deleted)
 
         Args:
-            subdir: Name of subdirectory. If 'subdir = None' the directory will be created by path-data
+            path: (optional) The full path of the directory in Trash
+            limit: (optional) Page size
+            attrs: (optional) Attributes of ResourceInfo to request
+            prefetch: (optional) Request the next page in the background
 
-        Returns:
-            Tuple with Response code and dictionary from JSON:
-            (Response code, JSON Response dict or None for error)
+        Yields:
+            ResourceInfo records with 'deleted' and 'origin_path' of Trash items
+
+        Raises:
+            requests.exceptions.HTTPError: for error response code of any page
         """
-        params = {**self.params, 'path': f'{self.params["path"]}/{subdir}' if subdir else self.params["path"],
-                  **optional}
-        return self._put(self.resources, params=filter_dict_by_key(params))
+        return self.iter_trash(path, limit=limit, prefetch=prefetch, attrs=attrs)
 
-    def delete(self, force_async: bool = None, md5_hash: str = None, permanently: bool = False, **optional):
+    def changes(self, since=None, state: str = None, overlap: float = 60.0, limit: int = 100, attrs=CHANGE_ATTRS,
+                media_type: str = None):
         """
-        Delete file or directory by path from Disk or Trash mode
+        Iterate over files created or modified after the watermark. See ChangeFeed
 
         Typical usage example:
             disk = YandexDisk()
-            directory = disk.path('path/to/the/directory').delete()
+            for item in disk.changes(state='~/.cache/pyyadisk/changes.json'):
+                print(item.path, item.modified)
 
         Args:
-            force_async: Execute asynchronously (True or False).
-            md5_hash: md5 hash of file
-            permanently: Flag of permanently delete
+            since: (optional) datetime object or ISO 8601 string. Default is the watermark saved in the state file
+            state: (optional) Path to JSON state file. The watermark is saved to it when the iteration is finished.
+                Without state file all files are emitted unless since is set
+            overlap: (optional) Seconds before the watermark which are listed again by every poll
+            limit: (optional) Page size of the listing
+            attrs: (optional) Attributes of ResourceInfo to request
+            media_type: (optional) Filter by media type, for example 'image'
+
+        Yields:
+            ResourceInfo records of new and modified files, newest first
+
+        Raises:
+            requests.exceptions.HTTPError: for error response code of any page
+        """
+        feed = ChangeFeed(self, state=state, overlap=overlap, limit=limit, attrs=attrs, media_type=media_type)
+        return feed.changes(since)
 
-        Returns:
-            Tuple with Response code and dictionary from JSON:
-            (Response code, JSON Response dict or None for error)
+    def walk(self, root: str = '/', workers: int = 4, max_depth: int = None, limit: int = 1000,
+             fields: str = FIELDS, attrs=None):
+        """
+        Walk remote directory tree like os.walk(). Directories are listed breadth-first on a thread pool
+        and results are yielded as they arrive, so the order of directories is not defined
+
+        Typical usage example:
+            disk = YandexDisk()
+            for dirpath, dirs, files in disk.walk('path/to/the/directory', workers=8):
+                print(dirpath, [f['name'] for f in files])
+
+        Args:
+            root: (optional) The full path of the top directory
+            workers: (optional) Number of directories listed at the same time
+            max_depth: (optional) Maximum depth of listed directories. The top directory has depth 0
+            limit: (optional) Page size of directory listing
+            fields: (optional) Fields projection of items. It must contain 'type' and 'path'
+            attrs: (optional) Attributes of ResourceInfo to request. 'type' and 'path' are always requested
+                and items are ResourceInfo records
+
+        Yields:
+            Tuples (dirpath, dirs, files) where dirpath is normalized path like '/path/to/the/directory'
+            and dirs and files are lists of dictionaries of items or ResourceInfo records if attrs is set
+
+        Raises:
+            requests.exceptions.HTTPError: for error response code of any listing
+        """
+        return self._walk(RESOURCES_PATH, {}, root, workers, max_depth, limit, fields, attrs)
+
+    def _walk(self, uri: str, params: dict, root: str, workers: int, max_depth: int, limit: int, fields: str,
+              attrs):
+        """
+        Walk directory tree of the listing uri. See YandexDisk.walk()
+
+        Args:
+            uri: Listing uri, RESOURCES_PATH or PUBLIC_PATH
+            params: Params of every listing request besides 'path' and 'fields', for example 'public_key'
         """
-        params = {**self.params, 'force_async': force_async, 'md5': md5_hash, 'permanently': permanently, **optional, }
-        return self._delete(self.resources, params=filter_dict_by_key(params))
+        if attrs:
+            fields = fields_for(dict.fromkeys(('type', 'path') + tuple(attrs)), '_embedded.items')
 
-    def copy_to(self, destination: str, force_async: bool = None, overwrite: bool = None, **optional):
+        def listing(path: str):
+            page_params = filter_dict_by_key({**params, 'path': path, 'fields': fields})
+            return list(self._iter_pages(uri, page_params, '_embedded', limit, prefetch=False))
+
+        self._ensure_pool_size(workers)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending = {executor.submit(listing, root): (normalize_path(root), 0)}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    dirpath, depth = pending.pop(future)
+                    items = future.result()
+                    dirs = [i for i in items if i.get('type') == 'dir']
+                    files = [i for i in items if i.get('type') != 'dir']
+                    if max_depth is None or depth < max_depth:
+                        for d in dirs:
+                            pending[executor.submit(listing, d['path'])] = (normalize_path(d['path']), depth + 1)
+                    if attrs:
+                        dirs = [ResourceInfo.from_dict(d) for d in dirs]
+                        files = [ResourceInfo.from_dict(f) for f in files]
+                    yield dirpath, dirs, files
+        finally:
+            # Listings queued when the caller stops the walk or a listing fails are not sent
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def du(self, root: str = '/', workers: int = 4, max_depth: int = None):
         """
-        Copy file or directory to new destination
+        Get total size and number of files of every directory subtree in one concurrent walk
 
         Typical usage example:
             disk = YandexDisk()
-            directory = disk.path('path/to/the/old_directory')
-            directory.copy_to('path/to/the/new_directory_1')
-            directory.copy_to('path/to/the/new_directory_2')  # Nice way to make multiple copies
+            usage = disk.du('path/to/the/directory', workers=8)
+            print(usage['/path/to/the/directory']['size'])
 
         Args:
-            destination: Destination path
-            force_async: Execute asynchronously (True or False).
-            overwrite: Flag of overwrite enable
+            root: (optional) The full path of the top directory
+            workers: (optional) Number of directories listed at the same time
+            max_depth: (optional) Maximum depth of listed directories. The top directory has depth 0
 
         Returns:
-            Tuple with Response code and dictionary from JSON:
-            (Response code, JSON Response dict or None for error)
+            Dictionary {dirpath: {'size': int, 'files': int, 'dirs': int}} with totals of subtrees.
+            Keys are normalized paths like '/path/to/the/directory'
         """
-        params = {'from': self.params['path'], 'path': destination, 'fields': self.params['fields'],
-                  'force_async': force_async, 'overwrite': overwrite, **optional, }
-        return self._post(f'{self.resources}/copy', params=filter_dict_by_key(params))
+        usage, parents = {}, {}
+        for dirpath, dirs, files in self.walk(root, workers=workers, max_depth=max_depth,
+                                              fields=','.join(f'_embedded.items.{f}' for f in
+                                                              ('type', 'path', 'size'))):
+            usage[dirpath] = {'size': sum(f.get('size') or 0 for f in files), 'files': len(files), 'dirs': len(dirs)}
+            for d in dirs:
+                parents[normalize_path(d['path'])] = dirpath
+        for dirpath in sorted(usage, key=lambda p: -p.count('/')):
+            parent = parents.get(dirpath)
+            if parent is not None and dirpath in usage:
+                for key in ('size', 'files', 'dirs'):
+                    usage[parent][key] += usage[dirpath][key]
+        return usage
+
+    def _iter_pages(self, uri: str, params: dict, container: str = None, limit: int = 100, prefetch: bool = True):
+        """
+        Iterate over items of paginated listing
 
-    def move_to(self, destination: str, force_async: bool = None, overwrite: bool = None, **optional):
+        Args:
+            uri: Listing uri
+            params: Request params without 'limit' and 'offset'
+            container: Key of the object with 'items' list or None for 'items' at the top level
+            limit: Page size
+            prefetch: Request the next page in the background
+
+        Yields:
+            Dictionaries of items
         """
-        Move file or directory to new destination
+        def fetch(offset: int):
+            return self._get(uri, params={**params, 'limit': limit, 'offset': offset})
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            offset = 0
+            page = fetch(offset)
+            while True:
+                status, data = page
+                if status != 200:
+                    raise requests.exceptions.HTTPError(f'{status} Error for url: {uri} offset: {offset}')
+                items = ((data.get(container) or {}) if container else data).get('items') or []
+                last = len(items) < limit
+                if not last:
+                    offset += limit
+                    page = executor.submit(fetch, offset) if executor else None
+                yield from items
+                if last:
+                    return
+                page = page.result() if executor else fetch(offset)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def _upload_body(self, source, path: str, overwrite: bool, chunk_size: int, progress, link: str = None,
+                     **optional):
+        """
+        Get upload link and stream the body to it. The link is kept in YandexDisk.link_cache
+        until the upload succeeds, so a retried upload reuses it
+
+        Args:
+            source: File object opened in binary mode or iterable of bytes
+            path: Full path of the uploaded file on Yandex Disk
+            overwrite: Enable overwriting for uploaded item
+            chunk_size: Size of the body chunk in bytes
+            progress: Function progress(transferred, total, elapsed) or None
+            link: (optional) Upload link which is already resolved, for example prefetched by upload_tree()
+
+        Returns:
+            tuple(response code, response) or tuple(404, None) for any errors cases
+        """
+        link = link or self._get_upload_link(path=path, overwrite=overwrite, **optional)
+        if not link:
+            return 404, None
+        total = body_size(source) if hasattr(source, 'read') else None
+        body = ProgressReader(source, total=total, chunk_size=chunk_size, callback=progress)
+        response = self._put(link, data=body)
+        self._invalidate(path)
+        if self.link_cache is not None and response[0] < 500:
+            self.link_cache.pop('upload', path, {'overwrite': overwrite, **optional})
+        return response
+
+    def upload_tree(self, local_dir: str, remote_dir: str, workers: int = 4, overwrite: bool = False,
+                    chunk_size: int = CHUNK_SIZE, skip_if_identical: bool = False, **optional):
+        """
+        Upload local directory tree. Remote directories are created once in parent-first order and files are
+        uploaded concurrently on a thread pool. Upload links of queued files are prefetched on a separate pool,
+        so link round trips overlap with body transfers. The connection pool is grown to twice the number of workers
 
         Typical usage example:
             disk = YandexDisk()
-            directory = disk.path('path/to/the/old_directory')
-            directory.move_to('path/to/the/new_directory_1')
+            report = disk.upload_tree('/home/user/build', 'backup/build', workers=8, overwrite=True)
+            failed = [report['results'][i] for i in report['failed']]
 
         Args:
-            destination: Destination path
-            force_async: Execute asynchronously (True or False).
-            overwrite: Flag of overwrite enable
+            local_dir: Path to the local directory
+            remote_dir: Full path of the destination directory on Yandex Disk
+            workers: (optional) Number of concurrent uploads
+            overwrite: (optional) Enable overwriting for uploaded items
+            chunk_size: (optional) Size of the body chunk in bytes
+            skip_if_identical: (optional) Skip files with the same size, md5 and sha256 on Disk.
+                Skipped files have 'skipped': True and 0 bytes in results
 
         Returns:
-            Tuple with Response code and dictionary from JSON:
-            (Response code, JSON Response dict or None for error)
+            Dictionary with results and statistics:
+                {
+                  "results": [{"local": "string", "remote": "string", "status": int, "bytes": int,
+                               "seconds": float, "error": "string"}, ...],
+                  "failed": [indexes of failed results],
+                  "stats": {"items": int, "failed": int, "bytes": int, "seconds": float,
+                            "items_per_second": float, "bytes_per_second": float}
+                }
+            Files which cannot be read or sent have status None and 'error'. Directories which cannot be created
+            are reported before files, and files inside them are not uploaded. If remote_dir cannot be created,
+            the only result is the failed creation of remote_dir
         """
-        params = {'from': self.params['path'], 'path': destination, 'fields': self.params['fields'],
-                  'force_async': force_async, 'overwrite': overwrite, **optional, }
-        return self._post(f'{self.resources}/move', params=filter_dict_by_key(params))
-
-    def last_uploaded(self, limit: int = None, media_type: str = None, preview_crop: bool = None,
-                      preview_size: str = None):
+        started = time.monotonic()
+        remote_dir = remote_dir.rstrip('/')
+        directories, files = [], []
+        for root, dirs, names in os.walk(local_dir):
+            dirs.sort()
+            relative = Path(root).relative_to(local_dir).as_posix()
+            remote_root = remote_dir if relative == '.' else f'{remote_dir}/{relative}'
+            directories.extend((os.path.join(root, d), f'{remote_root}/{d}') for d in dirs)
+            files.extend((os.path.join(root, name), f'{remote_root}/{name}') for name in sorted(names))
+        status, _ = self._make_dirs(remote_dir)
+        if not is_success(status):
+            result = {'local': local_dir, 'remote': remote_dir, 'status': status, 'bytes': 0,
+                      'error': 'remote directory cannot be created', 'seconds': time.monotonic() - started}
+            return make_report([result], started)
+
+        failed_dirs, dir_results = set(), []
+        for local, directory in directories:
+            dir_started = time.monotonic()
+            if directory.rsplit('/', 1)[0] in failed_dirs:
+                failed_dirs.add(directory)
+                continue
+            try:
+                status, error = self._make_dirs(directory)[0], None
+            except requests.exceptions.RequestException as e:
+                status, error = None, repr(e)
+            if not is_success(status):
+                failed_dirs.add(directory)
+                dir_results.append({'local': local, 'remote': directory, 'status': status, 'bytes': 0,
+                                    'error': error or 'directory cannot be created',
+                                    'seconds': time.monotonic() - dir_started})
+        if failed_dirs:
+            files = [(local, remote) for local, remote in files if remote.rsplit('/', 1)[0] not in failed_dirs]
+
+        def prepare(item):
+            local, remote = item
+            if skip_if_identical and self._identical(local, remote):
+                return True, None
+            return False, self._get_upload_link(remote, overwrite, **optional)
+
+        def upload_file(item, prepared):
+            local, remote = item
+            file_started = time.monotonic()
+            try:
+                skipped, link = prepared.result()
+                if skipped:
+                    return {'local': local, 'remote': remote, 'status': 200, 'bytes': 0, 'skipped': True,
+                            'seconds': time.monotonic() - file_started}
+                with open(local, 'rb') as fh:
+                    status, _ = self._upload_body(fh, remote, overwrite, chunk_size, None, link=link, **optional)
+                    size = fh.tell()
+            except (requests.exceptions.RequestException, OSError) as e:
+                return {'local': local, 'remote': remote, 'status': None, 'bytes': 0, 'error': repr(e),
+                        'seconds': time.monotonic() - file_started}
+            return {'local': local, 'remote': remote, 'status': status, 'bytes': size,
+                    'seconds': time.monotonic() - file_started}
+
+        if skip_if_identical and self.hash_cache is None:
+            self.hash_cache = HashCache()
+        self._ensure_pool_size(2 * workers)
+        # Upload links of the next files are resolved while bodies are sent. At most 2 * workers files are
+        # in flight: 'workers' files are sent and up to 'workers' more wait with resolved links
+        window = threading.BoundedSemaphore(2 * workers)
+        futures = []
+        with ThreadPoolExecutor(max_workers=workers) as links, ThreadPoolExecutor(max_workers=workers) as executor:
+            for item in files:
+                window.acquire()
+                future = executor.submit(upload_file, item, links.submit(prepare, item))
+                future.add_done_callback(lambda _: window.release())
+                futures.append(future)
+            results = dir_results + [f.result() for f in futures]
+        return make_report(results, started, sum(r['bytes'] for r in results))
+
+    def sync(self, local_dir: str, remote_dir: str, delete: bool = False, dry_run: bool = False, workers: int = 4,
+             index: HashCache = None, chunk_size: int = CHUNK_SIZE):
         """
-        Get list of last uploaded files
+        Incremental one-way sync of local directory to Yandex Disk. Only new files and files with changed size
+        or checksum are uploaded. sha256 is compared if Disk returns it and md5 otherwise, files without
+        checksums on Disk are uploaded again. Local checksums are taken from the persistent HashCache index,
+        so unchanged files are not hashed again
+
+        Typical usage example:
+            disk = YandexDisk()
+            report = disk.sync('/home/user/build', 'backup/build', delete=True, workers=8)
+            plan = disk.sync('/home/user/build', 'backup/build', dry_run=True)['results']
 
         Args:
-            limit: The number of items to return
-            media_type: Filter by media type
-            preview_crop: Enable crop preview
-            preview_size: Size of preview
+            local_dir: Path to the local directory
+            remote_dir: Full path of the destination directory on Yandex Disk
+            delete: (optional) Delete remote files and directories which are not in the local directory
+            dry_run: (optional) Only plan actions without transfers. Planned results have status None
+            workers: (optional) Number of concurrent transfers and directory listings
+            index: (optional) HashCache object with local checksums. Default index is HashCache()
+            chunk_size: (optional) Size of the body chunk in bytes
 
         Returns:
-            Tuple with Response code and dictionary from JSON:
-            (Response code, JSON Response dict or None for error)
+            Dictionary with results and statistics:
+                {
+                  "results": [{"action": "create|upload|delete", "remote": "string", "local": "string",
+                               "reason": "new|changed|unreadable|orphan", "status": int, "bytes": int}, ...],
+                  "failed": [indexes of failed results],
+                  "stats": {"items": int, "failed": int, "skipped": int, "bytes": int, "seconds": float,
+                            "items_per_second": float, "bytes_per_second": float}
+                }
         """
-        params = {'limit': limit, 'media_type': media_type, 'preview_crop': preview_crop,
-                  'preview_size': preview_size, }
-        return self._get(self.resources, params=filter_dict_by_key(params))
+        return sync(self, local_dir, remote_dir, delete=delete, dry_run=dry_run, workers=workers, index=index,
+                    chunk_size=chunk_size)
 
-    def list_files(self, limit: int = None, offset: int = None, media_type: str = None, preview_crop: bool = None,
-                   preview_size: str = None):
+    def batch_move(self, pairs, workers: int = 8, overwrite: bool = None, force_async: bool = None,
+                   timeout: float = None):
         """
-        Get list of files. For objects sorting use YandexDisk.sort() method
+        Move many files or directories concurrently. Requests are sent by a bounded thread pool, asynchronous
+        operations are tracked by the shared OperationPoller, and failed items do not stop the batch
+
+        Typical usage example:
+            disk = YandexDisk()
+            report = disk.batch_move([('inbox/a.jpg', 'photos/a.jpg'), ('inbox/b.jpg', 'photos/b.jpg')], workers=16)
+            for i in report['failed']:
+                print(report['results'][i])
 
         Args:
-            limit: The number of items to return
-            offset: Offset from the beginning
-            media_type: Filter by media type
-            preview_crop: Enable crop preview
-            preview_size: Size of preview
+            pairs: Iterable of (source, destination) paths
+            workers: (optional) Number of requests sent at the same time
+            overwrite: (optional) Flag of overwrite enable
+            force_async: (optional) Execute asynchronously. Large directories are moved asynchronously anyway
+            timeout: (optional) Maximum time to wait for asynchronous operations in seconds. Operations which are
+                not finished have result 'in-progress'
 
         Returns:
-            Tuple with Response code and dictionary from JSON:
-            (Response code, JSON Response dict or None for error)
+            Dictionary with results in the order of pairs and statistics:
+                {
+                  "results": [{"from": "string", "path": "string", "status": int, "operation": "string",
+                               "result": "success|failed|in-progress", "error": "string"}, ...],
+                  "failed": [indexes of failed results],
+                  "stats": {"items": int, "failed": int, "pending": int, "bytes": 0, "seconds": float,
+                            "items_per_second": float, "bytes_per_second": float}
+                }
         """
-        params = {'limit': limit, 'offset': offset, 'media_type': media_type, 'preview_crop': preview_crop,
-                  'preview_size': preview_size, }
-        return self._get(self.resources, params=filter_dict_by_key(params))
+        items = [{'from': source, 'path': destination} for source, destination in pairs]
+        return run_batch(self, items, lambda item: self.path(item['from']).move_to(
+            item['path'], force_async=force_async, overwrite=overwrite, as_operation=True), workers, timeout)
 
-    def link(self, **optional):
+    def batch_copy(self, pairs, workers: int = 8, overwrite: bool = None, force_async: bool = None,
+                   timeout: float = None):
         """
-        Get private link of file or directory which set by YandexDisk.path('path/to/the/file')
+        Copy many files or directories concurrently. See YandexDisk.batch_move()
+
+        Typical usage example:
+            disk = YandexDisk()
+            report = disk.batch_copy([('photos/a.jpg', 'backup/a.jpg'), ('photos/b.jpg', 'backup/b.jpg')])
+
+        Args:
+            pairs: Iterable of (source, destination) paths
+            workers: (optional) Number of requests sent at the same time
+            overwrite: (optional) Flag of overwrite enable
+            force_async: (optional) Execute asynchronously
+            timeout: (optional) Maximum time to wait for asynchronous operations in seconds
 
         Returns:
-            Tuple with Response code and dictionary from JSON:
-            (Response code, JSON Response dict or None for error)
+            Dictionary with results and statistics as YandexDisk.batch_move()
         """
-        try:
-            return 200, self._get(f'{self.resources}/download', {'path': self.params.get('path'), **optional})[1]['href']
-        except TypeError:
-            return 404, None
+        items = [{'from': source, 'path': destination} for source, destination in pairs]
+        return run_batch(self, items, lambda item: self.path(item['from']).copy_to(
+            item['path'], force_async=force_async, overwrite=overwrite, as_operation=True), workers, timeout)
 
-    def share(self, **optional):
+    def batch_delete(self, paths, workers: int = 8, permanently: bool = False, force_async: bool = None,
+                     timeout: float = None):
         """
-        Share file or directory which set by YandexDisk.path('path/to/the/file')
+        Delete many files or directories concurrently. See YandexDisk.batch_move()
+
+        Typical usage example:
+            disk = YandexDisk()
+            report = disk.batch_delete(['tmp/a.log', 'tmp/b.log', 'tmp/cache'], permanently=True)
+
+        Args:
+            paths: Iterable of paths
+            workers: (optional) Number of requests sent at the same time
+            permanently: (optional) Flag of permanently delete
+            force_async: (optional) Execute asynchronously
+            timeout: (optional) Maximum time to wait for asynchronous operations in seconds
 
         Returns:
-            tuple(response code, public url) or tuple(404, None) for any errors cases
+            Dictionary with results {"path", "status", "operation", "result", "error"} and statistics
+            as YandexDisk.batch_move()
         """
-        response = self._put(f'{self.resources}/publish', {'path': self.params.get('path'), **optional, })
-        if response[0] == 200:
-            return response[0], self.get()[1]["public_url"]
-        return 404, None
+        items = [{'path': path} for path in paths]
+        return run_batch(self, items, lambda item: self.path(item['path']).delete(
+            force_async=force_async, permanently=permanently, as_operation=True), workers, timeout)
 
-    def unshare(self, **optional):
+    def batch_create(self, paths, workers: int = 8):
         """
-        Unshare public file of directory which set by YandexDisk.path('path/to/the/file')
+        Create many directories concurrently. Directories are created level by level of depth,
+        so parents in the same batch are created before their children
+
+        Typical usage example:
+            disk = YandexDisk()
+            report = disk.batch_create(['photos/2020', 'photos/2021', 'photos/2021/summer'])
+
+        Args:
+            paths: Iterable of directory paths
+            workers: (optional) Number of requests sent at the same time
 
         Returns:
-            tuple(404, None) for any errors cases
+            Dictionary with results {"path", "status", "operation", "result", "error"} in the order of paths
+            and statistics as YandexDisk.batch_move()
         """
-        try:
-            return self._put(f'{self.resources}/unpublish', {'path': self.params.get('path'), **optional, })[1]['href']
-        except TypeError:
-            return 404, None
+        items = [{'path': path} for path in paths]
+        return run_levels(self, items, lambda item: self._operation(self.path(item['path']).create()), workers)
 
-    def public_url(self, **optional):
+    def restore_where(self, predicate, workers: int = 8, overwrite: bool = False, force_async: bool = None,
+                      timeout: float = None):
         """
-        Get public url of public file of directory which set by YandexDisk.path('path/to/the/file')
+        Restore all Trash items matching the predicate concurrently. Trash is scanned by YandexDisk.scan_trash()
+        before restores, then items are restored as YandexDisk.batch_move() does
+
+        Typical usage example:
+            from pyyadisk.trash import deleted_before, origin_under
+
+            disk = YandexDisk()
+            report = disk.restore_where(origin_under('photos/2021'), workers=16)
+            report = disk.restore_where(lambda item: item.name.endswith('.pdf'))
+
+        Args:
+            predicate: Function predicate(ResourceInfo) -> bool
+            workers: (optional) Number of requests sent at the same time
+            overwrite: (optional) Overwrite the existing resource with the restored one
+            force_async: (optional) Execute asynchronously
+            timeout: (optional) Maximum time to wait for asynchronous operations in seconds
 
         Returns:
-            tuple(response code, public url)  or tuple(404, None) for any errors cases
+            Dictionary with results {"path", "origin_path", "size", "status", "operation", "result", "error"}
+            and statistics as YandexDisk.batch_move() plus "scanned", "matched" and "scan_seconds"
         """
-        try:
-            params = {**self.params, **optional, }
-            return self._get(self.resources, filter_dict_by_key(params))[1]['public_url']
-        except KeyError:
-            return 404, None
+        return run_where(self, predicate, lambda item: self.trash(item['path']).restore(
+            force_async=force_async, overwrite=overwrite, as_operation=True), workers, timeout)
 
-    def public_key(self, **optional):
+    def purge_where(self, predicate, workers: int = 8, force_async: bool = None, timeout: float = None):
         """
-        Get public key of public file of directory which set by YandexDisk.path('path/to/the/file')
+        Permanently delete all Trash items matching the predicate concurrently. See YandexDisk.restore_where()
+
+        Typical usage example:
+            from pyyadisk.trash import deleted_before
+
+            disk = YandexDisk()
+            report = disk.purge_where(deleted_before(datetime.now(timezone.utc) - timedelta(days=30)))
+            print(report['stats']['matched'], report['stats']['failed'])
+
+        Args:
+            predicate: Function predicate(ResourceInfo) -> bool
+            workers: (optional) Number of requests sent at the same time
+            force_async: (optional) Execute asynchronously
+            timeout: (optional) Maximum time to wait for asynchronous operations in seconds
 
         Returns:
-            tuple(response code, public key) or tuple(404, None) for any errors cases
+            Dictionary with results and statistics as YandexDisk.restore_where()
         """
-        try:
-            params = {**self.params, **optional, }
-            return self._get(self.resources, filter_dict_by_key(params))[1]['public_key']
-        except KeyError:
-            return 404, None
+        return run_where(self, predicate, lambda item: self.trash(item['path']).delete(
+            force_async=force_async, as_operation=True), workers, timeout)
 
-    def upload(self, filepath: str, overwrite: bool = False, **optional):
+    def _identical(self, filepath: str, path: str, hash_cache: HashCache = None):
         """
-        File upload method
+        Compare local file with the file on Disk by size, md5 and sha256
 
         Args:
-            filepath: Path to the file
-            overwrite: Enable overwriting for uploaded item
+            filepath: Path to the local file
+            path: Full path of the file on Yandex Disk
+            hash_cache: (optional) HashCache object. Default is YandexDisk.hash_cache
 
         Returns:
-            tuple(response code, response) or tuple(404, None) for any errors cases
+            Dictionary {'skipped': True, 'path', 'size', 'md5', 'sha256'} for identical files or None
         """
-        filename = Path(filepath).name
-        path = f'{self.params["path"]}/{filename}'
-        try:
-            link = self._get_upload_link(path=path, overwrite=overwrite, **optional)
-            if link:
-                files = {'file': open(filepath, 'rb')}
-                params = {**self.params, 'path': path, **optional}
-                return self._put(link, files=files, params=params)
-            else:
-                return 404, None
-        except FileNotFoundError as e:
-            return 404, str(e)
+        st = os.stat(filepath)
+        status, meta = self._get(RESOURCES_PATH, params={'path': path, 'fields': 'type,size,md5,sha256'})
+        if status != 200 or meta.get('type') != 'file' or meta.get('size') != st.st_size:
+            return None
+        if hash_cache is None:
+            if self.hash_cache is None:
+                self.hash_cache = HashCache()
+            hash_cache = self.hash_cache
+        md5, sha256 = hash_cache.checksums(filepath, st)
+        local = {'md5': md5, 'sha256': sha256}
+        # A file without checksums on Disk is not identical, every checksum on Disk must match
+        if not any(meta.get(k) for k in local) or any(meta.get(k) and meta[k] != v for k, v in local.items()):
+            return None
+        return {'skipped': True, 'path': path, 'size': st.st_size, 'md5': md5, 'sha256': sha256}
 
-    def upload_by_url(self, filename: str, url: str, disable_redirects: bool = False, **optional):
+    def _make_dirs(self, path: str):
         """
-        Upload file from the web by url to the path which set by YandexDisk.path('path/to/the/file')
+        Create directory with missing parents like os.makedirs(exist_ok=True). Parents are created only
+        if the directory does not exist and cannot be created, so an existing parent costs no extra requests
 
         Args:
-            filename: name of the file
-            url: url of the file
-            disable_redirects: Disable redirects
+            path: Full path of the directory on Yandex Disk
 
         Returns:
             Tuple with Response code and dictionary from JSON:
-            (Response code, JSON Response dict or None for error)
+            (201 for created directory, 200 for existing directory or error code, JSON Response dict or None)
         """
-        params = {**self.params, 'path': f'{self.params["path"]}/{filename}', 'url': url,
-                  'disable_redirects': disable_redirects, **optional}
-        return self._post(f'{self.resources}/upload', params=filter_dict_by_key(params))
+        status, data = self.path(path).create()
+        if status != 409:
+            return status, data
+        # 409 is returned both for existing path and for missing parent
+        found, meta = self._get(RESOURCES_PATH, params={'path': path, 'fields': 'type'})
+        if found == 200 and meta.get('type') == 'dir':
+            return found, meta
+        if found != 404:
+            return status, data
+        for parent in reversed(parent_paths(normalize_path(path))[:-1]):
+            self._put(RESOURCES_PATH, params={'path': parent})
+        return self.path(path).create()
 
     def _get_upload_link(self, path: str, overwrite: bool = False, **optional):
         """
@@ -497,13 +957,63 @@ class YandexDisk:
             overwrite: Enable overwriting for uploaded item
 
         Returns:
-
+            Upload link or None for error
         """
+        if self.link_cache is not None:
+            link = self.link_cache.get('upload', path, {'overwrite': overwrite, **optional})
+            if link is not None:
+                return link
         params = {**self.params, 'path': path, 'overwrite': overwrite, **optional}
         try:
-            return self._get(f'{self.resources}/upload', params=filter_dict_by_key(params))[1]['href']
+            link = self._get(f'{self.resources}/upload', params=filter_dict_by_key(params))[1]['href']
         except (KeyError, TypeError):
             return None
+        if self.link_cache is not None:
+            self.link_cache.set('upload', path, link, {'overwrite': overwrite, **optional})
+        return link
+
+    def _ensure_pool_size(self, workers: int):
+        """
+        Grow the connection pool so that every worker of a thread pool gets its own connection
+
+        Args:
+            workers: Number of workers
+        """
+        self.transport.ensure_pool_size(workers)
+
+    def _operation(self, response: tuple, *paths: str):
+        """
+        Make Operation handle from the response and track it by the client poller. Cached metadata and links
+        of the paths are invalidated once more when the operation is finished
+
+        Args:
+            response: Tuple (Response code, JSON Response dict)
+            paths: Full paths of resources changed by the operation
+        """
+        operation = Operation.from_response(self.poller, response)
+        if paths and not operation.done():
+            operation.add_done_callback(lambda _: self._invalidate(*paths))
+        return operation
+
+    def _get_cached(self, uri: str, params: dict = None):
+        """
+        Get metadata through the metadata cache. Only successful responses are cached
+        """
+        if self.cache is None:
+            return self._get(uri, params=params)
+        key = MetadataCache.key(uri, params or {})
+        response = self.cache.get(key)
+        if response is None:
+            response = self._get(uri, params=params)
+            if response[0] == 200 and (params or {}).get('path'):
+                self.cache.set(key, params['path'], response)
+        return response
+
+    def _invalidate(self, *paths: str):
+        if self.cache is not None:
+            self.cache.invalidate(*paths)
+        if self.link_cache is not None:
+            self.link_cache.invalidate(*paths)
 
     def _get(self, uri: str, params: dict = None):
         return self._request('get', uri=uri, params=params)
@@ -511,25 +1021,91 @@ class YandexDisk:
     def _post(self, uri: str, params: dict = None, data: dict = None):
         return self._request('post', uri=uri, params=params, data=data)
 
-    def _put(self, uri: str, params: dict = None, files: dict = None):
-        return self._request('put', uri=uri, params=params, files=files)
+    def _put(self, uri: str, params: dict = None, files: dict = None, data=None):
+        return self._request('put', uri=uri, params=params, files=files, data=data)
 
     def _delete(self, uri: str, params: dict = None):
         return self._request('delete', uri=uri, params=params)
 
-    def _request(self, method: str, uri: str, params: dict = None, files: dict = None, data: dict = None):
-        json_data = None
+    def close(self):
+        """
+        Close connections of the transport
+        """
+        self.transport.close()
+
+    def add_hook(self, hook: RequestHooks):
+        """
+        Add request instrumentation hook
+
+        Typical usage example:
+            metrics = MetricsCollector()
+            disk = YandexDisk(token=token)
+            disk.add_hook(metrics)
+
+        Args:
+            hook: RequestHooks object
+        """
+        self.hooks.append(hook)
+
+    def _emit(self, name: str, event: RequestEvent):
+        for hook in self.hooks:
+            getattr(hook, name)(event)
+
+    def _stream(self, method: str, uri: str, headers: dict = None, params: dict = None, data=None):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        event = RequestEvent(method, uri)
+        self._emit('before_request', event)
+        started = time.monotonic()
         try:
-            response = getattr(self.session, method)(uri, headers=self.headers, verify=self.ssl_verify,
-                                                     proxies=self.proxies, params=params, files=files, data=data)
-            if 200 <= response.status_code <= 299:
-                try:
-                    json_data = response.json()
-                except json.decoder.JSONDecodeError:
-                    pass
-                return response.status_code, json_data
-            else:
-                pass
-            return response.status_code, json_data
+            response = self.transport.request(method, uri, headers={**self.headers, **(headers or {})}, params=params,
+                                              data=data, stream=True)
         except requests.exceptions.RequestException as e:
-            raise SystemExit(e)
+            event.duration, event.error = time.monotonic() - started, e
+            self._emit('on_error', event)
+            raise
+        event.duration, event.status = time.monotonic() - started, response.status_code
+        event.bytes_sent = body_length(response.request.body)
+        event.bytes_received = int(response.headers.get('Content-Length') or 0)
+        self._emit('after_response', event)
+        return response
+
+    def _request(self, method: str, uri: str, params: dict = None, files: dict = None, data=None):
+        json_data = None
+        retryable = (self.retry is not None and self.retry.is_retryable(method) and files is None
+                     and (data is None or isinstance(data, (bytes, str, dict))))
+        attempt, counts = 0, {}
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            event = RequestEvent(method, uri, attempt)
+            self._emit('before_request', event)
+            started = time.monotonic()
+            try:
+                response = self.transport.request(method, uri, headers=self.headers, params=params, files=files,
+                                                  data=data)
+            except requests.exceptions.RequestException as e:
+                event.duration, event.error = time.monotonic() - started, e
+                self._emit('on_error', event)
+                if not retryable or not self.retry.can_retry(attempt, None, counts):
+                    raise
+                time.sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+            event.duration, event.status = time.monotonic() - started, response.status_code
+            event.bytes_sent = body_length(response.request.body)
+            event.bytes_received = len(response.content)
+            self._emit('after_response', event)
+            if response.status_code == 429 and self.rate_limiter is not None:
+                self.rate_limiter.pause(parse_retry_after(response.headers.get('Retry-After')) or 0.0)
+            if retryable and self.retry.can_retry(attempt, response.status_code, counts):
+                time.sleep(self.retry.delay(attempt, response.headers.get('Retry-After')))
+                attempt += 1
+                continue
+            break
+        if 200 <= response.status_code <= 299:
+            try:
+                json_data = self.json_loads(response.content)
+            except ValueError:
+                pass
+        return response.status_code, json_data
@@ -20,7 +20,6 @@ setup(
     keywords=['Yandex', 'Yandex Disk', 'Yandex Disk REST API'],
 
     classifiers=[
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
@@ -28,5 +27,8 @@ setup(
         'License :: OSI Approved :: MIT License',
     ],
 
+    python_requires='>=3.7',
     install_requires=['requests == 2.26.0', ],
+    extras_require={'async': ['aiohttp >= 3.7', ], 'fast': ['orjson >= 3.0', ], 'http2': ['httpx[http2] >= 0.23', ], },
+    entry_points={'console_scripts': ['pyyadisk = pyyadisk.cli:main', ], },
 )
@@ -0,0 +1,44 @@
+import importlib
+
+import pytest
+
+from benchmarks.server import StandInServer
+from pyyadisk import YandexDisk
+from pyyadisk.retry import RetryPolicy
+from pyyadisk.transport import HTTP2Transport, RequestsTransport, httpx
+
+TRANSPORTS = [
+    pytest.param(RequestsTransport, id='requests'),
+    pytest.param(HTTP2Transport, id='http2', marks=pytest.mark.skipif(httpx is None, reason='httpx is not installed')),
+]
+
+
+@pytest.fixture
+def server():
+    with StandInServer(redirect=True) as server:
+        yield server
+
+
+@pytest.fixture(params=TRANSPORTS)
+def transport(request, server):
+    with request.param(base_url=server.url, timeout=(5, 10)) as transport:
+        yield transport
+
+
+@pytest.fixture
+def disk(transport):
+    return YandexDisk(token='test', transport=transport, retry=RetryPolicy(backoff=0.01, jitter=0))
+
+
+@pytest.fixture
+def default_api(server, monkeypatch):
+    """Point clients created with the default transport, like the CLI client, to the stand-in server"""
+    uri = f'{server.url}/v1/disk'
+    paths = {'URI': uri, 'RESOURCES_PATH': f'{uri}/resources', 'TRASH_PATH': f'{uri}/trash/resources',
+             'OPERATIONS_PATH': f'{uri}/operations', 'PUBLIC_PATH': f'{uri}/public/resources'}
+    for name in ('config', 'public', 'resource', 'sync', 'yandexdisk'):
+        module = importlib.import_module(f'pyyadisk.{name}')
+        for key, value in paths.items():
+            if hasattr(module, key):
+                monkeypatch.setattr(module, key, value)
+    return server
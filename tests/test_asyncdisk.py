@@ -0,0 +1,46 @@
+import asyncio
+import os
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from pyyadisk import asyncdisk  # noqa: E402
+
+
+@pytest.fixture
+def async_disk(server, monkeypatch):
+    uri = f'{server.url}/v1/disk'
+    monkeypatch.setattr(asyncdisk, 'RESOURCES_PATH', f'{uri}/resources')
+    monkeypatch.setattr(asyncdisk, 'TRASH_PATH', f'{uri}/trash/resources')
+    monkeypatch.setattr(asyncdisk, 'OPERATIONS_PATH', f'{uri}/operations')
+    return asyncdisk.AsyncYandexDisk(token='test', timeout=(5, 10))
+
+
+def test_client_timeout_does_not_limit_total_time(async_disk):
+    async def session_timeout():
+        async with async_disk:
+            return async_disk._client().timeout
+
+    timeout = asyncio.run(session_timeout())
+
+    assert timeout.total is None
+    assert (timeout.sock_connect, timeout.sock_read) == (5, 10)
+
+
+def test_upload_list_of_chunks_and_download(server, async_disk, tmp_path):
+    chunks = [os.urandom(64 * 1024) for _ in range(4)]
+
+    async def transfer():
+        async with async_disk:
+            await async_disk.create('/data')
+            upload = await async_disk.upload('/data', chunks, filename='file.bin')
+            download = await async_disk.download('/data/file.bin', str(tmp_path / 'file.bin'))
+            return upload, download
+
+    (upload_status, _), (download_status, info) = asyncio.run(transfer())
+
+    assert upload_status == 201
+    assert download_status == 200
+    assert (tmp_path / 'file.bin').read_bytes() == b''.join(chunks)
+    assert info['size'] == sum(map(len, chunks))
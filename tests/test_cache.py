@@ -0,0 +1,32 @@
+from pyyadisk import YandexDisk
+
+
+def cached_disk(transport) -> YandexDisk:
+    disk = YandexDisk(token='test', transport=transport, cache_ttl=60)
+    disk.poller.initial_delay = 0.05
+    return disk
+
+
+def test_mutation_invalidates_after_response(server, transport):
+    disk = cached_disk(transport)
+    server.add_dir('/data')
+    assert disk.path('/data').info(attrs=('name', ))[0] == 200
+
+    assert disk.path('/data').delete(permanently=True)[0] == 204
+
+    assert disk.path('/data').info(attrs=('name', ))[0] == 404
+
+
+def test_operation_invalidates_when_finished(server, transport):
+    disk = cached_disk(transport)
+    server.add_file('/data/file.txt', b'data')
+    server.operation_delay = 0.2
+
+    operation = disk.path('/data/file.txt').delete(force_async=True, permanently=True, as_operation=True)
+    # Metadata read while the operation is running is cached again
+    server.add_file('/data/file.txt', b'data')
+    assert disk.path('/data/file.txt').info(attrs=('name', ))[0] == 200
+    server.nodes.pop('/data/file.txt')
+
+    assert operation.wait(5) and operation.status == 'success'
+    assert disk.path('/data/file.txt').info(attrs=('name', ))[0] == 404
@@ -0,0 +1,55 @@
+import json
+
+from pyyadisk import cli
+
+
+def run(capsys, *argv) -> tuple:
+    code = cli.main(['--token', 'test', *argv])
+    captured = capsys.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines()]
+    stats = json.loads(captured.err.splitlines()[-1])['stats'] if '--stats' in argv else None
+    return code, records, stats
+
+
+def test_get_root_keeps_relative_paths(default_api, capsys, tmp_path):
+    default_api.add_file('/a/x.txt', b'hello')
+    default_api.add_file('/a/sub/y.txt', b'world')
+
+    code, records, _ = run(capsys, 'get', '/', str(tmp_path), '--jobs', '2')
+
+    assert code == 0 and len(records) == 2
+    assert (tmp_path / 'a' / 'sub' / 'y.txt').read_bytes() == b'world'
+
+
+def test_ls_records_are_counted(default_api, capsys):
+    default_api.add_file('/a/x.txt', b'hello')
+    default_api.add_file('/a/y.txt', b'world')
+
+    code, records, stats = run(capsys, 'ls', '/a', '--stats')
+
+    assert code == 0
+    assert [r['op'] for r in records] == ['ls', 'ls']
+    assert stats['items'] == 2 and stats['bytes'] == 0
+
+
+def test_put_skipped_file_is_not_counted(default_api, capsys, tmp_path):
+    (tmp_path / 'x.txt').write_bytes(b'hello')
+    default_api.add_dir('/backup')
+
+    _, _, stats = run(capsys, '--stats', 'put', str(tmp_path / 'x.txt'), '/backup', '--skip-identical')
+    assert stats['bytes'] == 5
+    code, records, stats = run(capsys, '--stats', 'put', str(tmp_path / 'x.txt'), '/backup', '--skip-identical')
+
+    assert code == 0
+    assert records[0]['skipped'] is True
+    assert stats['items'] == 1 and stats['bytes'] == 0
+
+
+def test_get_error_is_reported_per_item(default_api, capsys, tmp_path):
+    default_api.add_file('/a/x.txt', b'hello')
+    (tmp_path / 'blocker').write_bytes(b'')
+
+    code, records, _ = run(capsys, 'get', '/a/x.txt', str(tmp_path / 'blocker' / 'x.txt'))
+
+    assert code == 1
+    assert records[0]['status'] is None and 'error' in records[0]
@@ -0,0 +1,125 @@
+import os
+
+import pytest
+
+SEGMENT = 128 * 1024
+
+
+class FakeResponse:
+    def __init__(self, status: int, headers: dict = None):
+        self.status_code = status
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def data(server):
+    data = os.urandom(8 * SEGMENT + 1000)
+    server.add_file('/data/file.bin', data)
+    return data
+
+
+@pytest.fixture
+def streams(disk, monkeypatch):
+    """Record Range headers of body requests and let tests replace responses of the download links"""
+    original = disk._stream
+    sent = []
+
+    def stream(method, uri, headers=None, **kwargs):
+        sent.append((uri, (headers or {}).get('Range')))
+        replace = getattr(stream, 'replace', None)
+        response = replace(len(sent), uri, headers or {}) if replace else None
+        return response or original(method, uri, headers=headers, **kwargs)
+
+    stream.sent = sent
+    monkeypatch.setattr(disk, '_stream', stream)
+    return stream
+
+
+def test_download_resumes_from_part_file(disk, data, streams, tmp_path):
+    dest = tmp_path / 'file.bin'
+    (tmp_path / 'file.bin.part').write_bytes(data[:SEGMENT])
+
+    status, info = disk.path('/data/file.bin').download(str(dest))
+
+    assert status == 206
+    assert dest.read_bytes() == data and info['size'] == len(data)
+    assert streams.sent[-1][1] == f'bytes={SEGMENT}-'
+    assert not (tmp_path / 'file.bin.part').exists()
+
+
+def test_download_without_resume_starts_over(disk, data, streams, tmp_path):
+    (tmp_path / 'file.bin.part').write_bytes(b'garbage')
+
+    status, _ = disk.path('/data/file.bin').download(str(tmp_path / 'file.bin'), resume=False)
+
+    assert status == 200
+    assert (tmp_path / 'file.bin').read_bytes() == data
+    assert streams.sent[-1][1] is None
+
+
+def test_parallel_download(disk, data, streams, tmp_path):
+    status, info = disk.path('/data/file.bin').download_parallel(str(tmp_path), workers=4, segment_size=SEGMENT)
+
+    assert status == 206
+    assert (tmp_path / 'file.bin').read_bytes() == data
+    assert info['path'] == str(tmp_path / 'file.bin')
+    assert len(streams.sent) == 9
+
+
+def test_parallel_download_retries_error_statuses(disk, data, streams, tmp_path):
+    streams.replace = lambda n, uri, headers: FakeResponse(503, {'Retry-After': '0'}) if n % 3 == 0 else None
+
+    status, _ = disk.path('/data/file.bin').download_parallel(str(tmp_path), workers=4, segment_size=SEGMENT)
+
+    assert status == 206
+    assert (tmp_path / 'file.bin').read_bytes() == data
+
+
+def test_parallel_download_gives_up_after_retries(disk, data, streams, tmp_path):
+    streams.replace = lambda n, uri, headers: FakeResponse(503)
+
+    status, info = disk.path('/data/file.bin').download_parallel(str(tmp_path), workers=4, segment_size=SEGMENT,
+                                                                 retries=1)
+
+    assert (status, info) == (503, None)
+    assert not (tmp_path / 'file.bin.part').exists()
+
+
+def test_parallel_download_refreshes_rejected_link(disk, data, streams, tmp_path):
+    rejected = set()
+
+    def replace(n, uri, headers):
+        if not rejected or uri in rejected:
+            rejected.add(uri)
+            return FakeResponse(410)
+        return None
+
+    streams.replace = replace
+
+    status, _ = disk.path('/data/file.bin').download_parallel(str(tmp_path), workers=4, segment_size=SEGMENT)
+
+    assert status == 206
+    assert (tmp_path / 'file.bin').read_bytes() == data
+    assert len(rejected) == 1
+
+
+def test_parallel_download_falls_back_when_range_is_ignored(disk, data, streams, tmp_path):
+    def replace(n, uri, headers):
+        headers.pop('Range', None)
+
+    streams.replace = replace
+
+    status, info = disk.path('/data/file.bin').download_parallel(str(tmp_path), workers=4, segment_size=SEGMENT)
+
+    assert status == 200
+    assert (tmp_path / 'file.bin').read_bytes() == data
+    assert info['size'] == len(data)
@@ -0,0 +1,50 @@
+import pytest
+import requests
+
+from pyyadisk.operation import Operation, OperationPoller
+
+
+class FakeDisk:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def operations(self, operation_id: str):
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def poller(responses, max_failures: int = 3) -> OperationPoller:
+    return OperationPoller(FakeDisk(responses), initial_delay=0.01, max_delay=0.02, jitter=0,
+                           max_failures=max_failures)
+
+
+def test_operation_is_resolved_after_transient_errors():
+    operation = Operation('id')
+    poller([(503, None), (200, {'status': 'in-progress'}), (503, None), (503, None),
+            (200, {'status': 'success'})]).track(operation)
+
+    assert operation.wait(5)
+    assert operation.status == 'success'
+
+
+def test_operation_fails_after_persistent_errors():
+    operation = Operation('id')
+    tracker = poller([(401, None)])
+    tracker.track(operation)
+
+    assert operation.wait(5)
+    assert operation.status == 'failed'
+    assert isinstance(operation.exception(), requests.exceptions.HTTPError)
+    assert tracker.requests == 3
+    with pytest.raises(requests.exceptions.HTTPError):
+        operation.result()
+
+
+def test_operation_fails_with_exception_of_last_check():
+    operation = Operation('id')
+    poller([requests.exceptions.ConnectionError('refused')]).track(operation)
+
+    assert operation.wait(5)
+    assert isinstance(operation.exception(), requests.exceptions.ConnectionError)
@@ -0,0 +1,26 @@
+from pyyadisk import YandexDisk
+from pyyadisk.transport import RequestsTransport
+
+
+class RecordingTransport(RequestsTransport):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sent_headers = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.sent_headers.append(dict(headers or {}))
+        return super().request(method, url, headers=headers, **kwargs)
+
+
+def test_public_resource_without_token(server, disk):
+    server.add_file('/shared/a.txt', b'aaa')
+    server.add_file('/shared/sub/b.txt', b'bb')
+    disk.path('/shared').share()
+    public_key = disk.path('/shared').public_key()
+    transport = RecordingTransport(base_url=server.url)
+    anonymous = YandexDisk(transport=transport)
+
+    names = sorted(item.name for item in anonymous.public(public_key).iter_dir(attrs=('name', )))
+
+    assert names == ['a.txt', 'sub']
+    assert transport.sent_headers and all('Authorization' not in h for h in transport.sent_headers)
@@ -0,0 +1,45 @@
+import time
+
+from pyyadisk import YandexDisk
+from pyyadisk.retry import RetryPolicy, parse_retry_after
+
+
+def test_get_is_retried_after_retry_after_delay(server, transport):
+    disk = YandexDisk(token='test', transport=transport, retry=RetryPolicy(total=2, backoff=0.01, jitter=0))
+    server.add_dir('/data')
+    server.error_rate, server.retry_after = 1.0, '0.2'
+    server.requests = 0
+
+    started = time.monotonic()
+    status, _ = disk.path('/data').get()
+
+    assert status == 503
+    assert server.requests == 3
+    assert time.monotonic() - started >= 0.4
+
+
+def test_get_succeeds_after_transient_error(server, transport):
+    disk = YandexDisk(token='test', transport=transport, retry=RetryPolicy(total=3, backoff=0.01, jitter=0))
+    server.add_dir('/data')
+    server.error_rate = 0.5
+    server._random.seed(1)
+
+    assert all(disk.path('/data').get()[0] == 200 for _ in range(10))
+    assert server.errors > 0
+
+
+def test_put_is_not_retried(server, disk):
+    server.error_rate = 1.0
+    server.requests = 0
+
+    status, _ = disk.path('/data').create()
+
+    assert status == 503
+    assert server.requests == 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('2.5') == 2.5
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
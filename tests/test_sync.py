@@ -0,0 +1,80 @@
+def make_tree(root, files: dict):
+    for relative, data in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def actions(report) -> list:
+    return sorted((r['action'], r['remote']) for r in report['results'])
+
+
+def test_same_size_edit_is_uploaded(server, disk, tmp_path):
+    make_tree(tmp_path, {'a.txt': b'new!', 'b.txt': b'same'})
+    server.add_file('/backup/a.txt', b'old!')
+    server.add_file('/backup/b.txt', b'same')
+
+    report = disk.sync(str(tmp_path), '/backup', dry_run=True)
+
+    assert actions(report) == [('upload', '/backup/a.txt')]
+    assert report['stats']['skipped'] == 1
+
+
+def test_file_without_checksums_on_disk_is_uploaded(server, disk, tmp_path):
+    make_tree(tmp_path, {'a.txt': b'same'})
+    server.add_file('/backup/a.txt', b'same')
+    server.nodes['/backup/a.txt'].md5 = server.nodes['/backup/a.txt'].sha256 = None
+
+    report = disk.sync(str(tmp_path), '/backup', dry_run=True)
+
+    assert actions(report) == [('upload', '/backup/a.txt')]
+    assert report['results'][0]['reason'] == 'changed'
+
+
+def test_sha256_is_compared_when_md5_matches(server, disk, tmp_path):
+    make_tree(tmp_path, {'a.txt': b'same'})
+    server.add_file('/backup/a.txt', b'same')
+    server.nodes['/backup/a.txt'].sha256 = '0' * 64
+
+    report = disk.sync(str(tmp_path), '/backup', dry_run=True)
+
+    assert actions(report) == [('upload', '/backup/a.txt')]
+
+
+def test_delete_removes_only_orphans_inside_remote_dir(server, disk, tmp_path):
+    make_tree(tmp_path, {'keep.txt': b'keep', 'sub/keep.txt': b'keep'})
+    server.add_file('/backup/keep.txt', b'keep')
+    server.add_file('/backup/sub/keep.txt', b'keep')
+    server.add_file('/backup/orphan.txt', b'orphan')
+    server.add_file('/backup/old/orphan.txt', b'orphan')
+    server.add_file('/backupx/a.txt', b'sibling')
+    server.add_file('/other/x', b'outside')
+
+    report = disk.sync(str(tmp_path), '/backup', delete=True)
+
+    assert actions(report) == [('delete', '/backup/old'), ('delete', '/backup/orphan.txt')]
+    assert not report['failed']
+    assert set(server.nodes) >= {'/backup/keep.txt', '/backup/sub/keep.txt', '/backupx/a.txt', '/other/x'}
+    assert not {'/backup/orphan.txt', '/backup/old', '/backup/old/orphan.txt'} & set(server.nodes)
+
+
+def test_delete_accepts_remote_dir_without_leading_slash(server, disk, tmp_path):
+    make_tree(tmp_path, {'keep.txt': b'keep'})
+    server.add_file('/backup/keep.txt', b'keep')
+    server.add_file('/backup/orphan.txt', b'orphan')
+    server.add_file('/backupx/a.txt', b'sibling')
+
+    report = disk.sync(str(tmp_path), 'backup/', delete=True, dry_run=True)
+
+    assert actions(report) == [('delete', '/backup/orphan.txt')]
+    assert report['results'][0]['reason'] == 'orphan'
+
+
+def test_dry_run_does_not_delete(server, disk, tmp_path):
+    server.add_file('/backup/orphan.txt', b'orphan')
+
+    report = disk.sync(str(tmp_path), '/backup', delete=True, dry_run=True)
+
+    assert actions(report) == [('delete', '/backup/orphan.txt')]
+    assert report['results'][0]['status'] is None
+    assert '/backup/orphan.txt' in server.nodes
@@ -0,0 +1,38 @@
+import os
+
+
+def test_download_follows_redirect(server, disk, tmp_path):
+    data = os.urandom(300 * 1024)
+    server.add_file('/data/file.bin', data)
+    status, href = disk.path('/data/file.bin').link()
+    assert status == 200 and '/redirect/' in href
+
+    status, info = disk.path('/data/file.bin').download(str(tmp_path / 'file.bin'))
+
+    assert status == 200
+    assert (tmp_path / 'file.bin').read_bytes() == data
+    assert info['size'] == len(data)
+
+
+def test_parallel_download_follows_redirect(server, disk, tmp_path):
+    data = os.urandom(1024 * 1024)
+    server.add_file('/data/file.bin', data)
+
+    status, _ = disk.path('/data/file.bin').download_parallel(str(tmp_path / 'file.bin'), workers=4,
+                                                              segment_size=128 * 1024)
+
+    assert status == 206
+    assert (tmp_path / 'file.bin').read_bytes() == data
+
+
+def test_download_tree_follows_redirect(server, disk, tmp_path):
+    server.add_file('/shared/a.txt', b'aaa')
+    server.add_file('/shared/sub/b.txt', b'bb')
+    disk.path('/shared').share()
+    public_key = disk.path('/shared').public_key()
+
+    report = disk.public(public_key).download_tree(str(tmp_path), workers=2)
+
+    assert report['failed'] == []
+    assert (tmp_path / 'a.txt').read_bytes() == b'aaa'
+    assert (tmp_path / 'sub' / 'b.txt').read_bytes() == b'bb'
@@ -0,0 +1,49 @@
+import os
+
+
+def make_local_tree(root):
+    (root / 'sub').mkdir()
+    (root / 'a.txt').write_bytes(b'aaa')
+    (root / 'sub' / 'b.txt').write_bytes(b'bb')
+
+
+def test_upload_creates_missing_parents(server, disk, tmp_path):
+    make_local_tree(tmp_path)
+
+    report = disk.upload_tree(str(tmp_path), '/backup/deep/build', workers=2)
+
+    assert report['failed'] == []
+    assert server.nodes['/backup/deep/build/sub/b.txt'].data == b'bb'
+
+
+def test_reupload_into_existing_directories(server, disk, tmp_path):
+    make_local_tree(tmp_path)
+    disk.upload_tree(str(tmp_path), '/backup', workers=2)
+
+    report = disk.upload_tree(str(tmp_path), '/backup', workers=2, overwrite=True)
+
+    assert report['failed'] == []
+    assert report['stats']['items'] == 2
+
+
+def test_unreadable_file_is_reported(server, disk, tmp_path):
+    make_local_tree(tmp_path)
+    os.symlink(str(tmp_path / 'missing'), str(tmp_path / 'broken'))
+
+    report = disk.upload_tree(str(tmp_path), '/backup', workers=2)
+
+    failed = [report['results'][i] for i in report['failed']]
+    assert [r['remote'] for r in failed] == ['/backup/broken']
+    assert failed[0]['status'] is None and 'FileNotFoundError' in failed[0]['error']
+
+
+def test_directory_which_cannot_be_created_is_reported_once(server, disk, tmp_path):
+    make_local_tree(tmp_path)
+    server.add_file('/backup/sub', b'file in place of directory')
+
+    report = disk.upload_tree(str(tmp_path), '/backup', workers=2)
+
+    failed = [report['results'][i] for i in report['failed']]
+    assert [r['remote'] for r in failed] == ['/backup/sub']
+    assert [r['remote'] for r in report['results']] == ['/backup/sub', '/backup/a.txt']
+    assert server.nodes['/backup/sub'].data == b'file in place of directory'
@@ -0,0 +1,27 @@
+import time
+
+
+def test_walk_yields_normalized_dirpaths(server, disk):
+    server.add_file('/a/b/x.txt', b'12345')
+    server.add_file('/a/y.txt', b'12')
+
+    for root in ('a', '/a', 'disk:/a/'):
+        assert sorted(dirpath for dirpath, _, _ in disk.walk(root)) == ['/a', '/a/b']
+    assert disk.du('a')['/a'] == {'size': 7, 'files': 2, 'dirs': 1}
+
+
+def test_closed_walk_does_not_send_queued_listings(server, disk):
+    for i in range(80):
+        server.add_dir(f'/root/d{i}')
+    server.latency = 0.02
+    server.requests = 0
+
+    started = time.monotonic()
+    walk = disk.walk('/root', workers=4)
+    next(walk)
+    walk.close()
+    elapsed = time.monotonic() - started
+    time.sleep(0.2)
+
+    assert elapsed < 0.5
+    assert server.requests <= 1 + 4